@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from concurrent.futures import CancelledError
 from pathlib import Path
 from typing import Sequence
 
@@ -11,15 +12,24 @@ from application.widgets.settings import CodeGeneratorSettngsWidget
 from bytelang.compiler import ByteLangCompiler
 from bytelang.utils import LogFlag
 from figure.abc import Canvas
+from figure.abc import Figure
 from figure.impl.workarea import WorkAreaFigure
 from figure.registry import FigureRegistry
-from gen.enums import PlannerMode
-from gen.movementprofile import MovementProfile
+from figure.scheduler import UpdateScheduler
+from gen.export import BackgroundExporter
+from gen.export import ExportTask
+from gen.pipeline import ExportPipeline
+from gen.pipeline import StageTimer
 from gen.settings import GeneratorSettings
 from gen.writer import CodeWriter
+from loader.image import ImageLoader
 from loader.obj import ObjLoader
+from loader.objimport import ObjImportTask
+from loader.objimport import ObjImporter
+from tools import BackgroundTask
 from ui.application import Application
 from ui.widgets.custom.logger import LoggerWidget
+from ui.widgets.custom.tasks import TaskListWidget
 from ui.widgets.dpg.impl import Button
 from ui.widgets.dpg.impl import FileDialog
 from ui.widgets.dpg.impl import Menu
@@ -38,6 +48,12 @@ class VARTApplication(Application):
             resources_path / "res/obj"
         )
 
+        self._picture_file_dialog = FileDialog(
+            "Укажите изображение для вставки", self.onImageFileSelected,
+            (("png", "PNG"), ("jpg", "JPEG"), ("bmp", "Bitmap")),
+            resources_path / "res/images"
+        )
+
         self._export_file_dialog = FileDialog(
             "Укажите файл для экспорта", lambda paths: self._onWriteBytecode(paths[0]),
             extensions=(("blc", "VART ByteCode"),),
@@ -46,22 +62,17 @@ class VARTApplication(Application):
 
         self._work_area = WorkAreaFigure("Рабочая область")
 
-        self._figure_registry = FigureRegistry(Canvas())
+        self._figure_registry = FigureRegistry(Canvas(scheduler=UpdateScheduler(on_error=self._onFigureUpdateError)))
 
         self._obj_loader = ObjLoader()
+        self._obj_importer = ObjImporter()
+        self._image_loader = ImageLoader()
+        self._tasks = TaskListWidget(self._onTaskDone)
 
-        self._generator_settings = GeneratorSettings(
-            MovementProfile(name="Перемещение", mode=PlannerMode.ACCEL, speed=200, accel=75),
-            MovementProfile(name="Продолжительный отрезок", mode=PlannerMode.ACCEL, speed=150, accel=50),
-            MovementProfile(name="Кривая (Короткий отрезок)", mode=PlannerMode.SPEED, speed=20, accel=0),
-            MovementProfile(name="Малые отрезки", mode=PlannerMode.POSITION, speed=0, accel=0),
-            tool_change_begin_timeout_ms=1000,
-            tool_change_end_timeout_ms=1000,
-            epilogue_stop_duration_ms=1000,
-            epilogue_end_position=(0, 0)
-        )
+        self._generator_settings = GeneratorSettings.makeDefault()
 
         self._bytecode_writer = CodeWriter(self._generator_settings, ByteLangCompiler.simpleSetup(resources_path / "res/bytelang"))
+        self._exporter = BackgroundExporter(ExportPipeline(self._bytecode_writer))
 
     def onObjFileSelected(self, paths: Sequence[Path]) -> None:
         """
@@ -70,27 +81,90 @@ class VARTApplication(Application):
         """
         print(paths)
 
+        for task in self._obj_importer.submit(paths):
+            self._tasks.addTask(task)
+
+    def onImageFileSelected(self, paths: Sequence[Path]) -> None:
+        """Векторизовать выбранные изображения"""
         for path in paths:
-            obj_figures = self._obj_loader.load(path, self._figure_registry.onFigureDelete, self._figure_registry.onFigureClone)
+            try:
+                figures = self._image_loader.load(path, self._figure_registry.onFigureDelete, self._figure_registry.onFigureClone)
+
+            except ValueError as e:
+                self._logger.write(str(e))
+                continue
+
+            for figure in figures:
+                self._figure_registry.add(figure)
+
+    def _onTaskDone(self, task: BackgroundTask) -> None:
+        if isinstance(task, ObjImportTask):
+            self._onObjImported(task)
+
+        elif isinstance(task, ExportTask):
+            self._onExported(task)
+
+    def _onFigureUpdateError(self, figure: Figure, e: Exception) -> None:
+        self._logger.write(f"Не удалось обновить {figure.__class__.__name__}: {e!r}")
+
+    def _onObjImported(self, task: ObjImportTask) -> None:
+        try:
+            meshes = task.getResult()
+
+        except CancelledError:
+            self._logger.write(f"{task.getTitle()}: отменён")
+            return
 
-            for obj in obj_figures:
-                self._figure_registry.add(obj)
+        except Exception as e:
+            self._logger.write(f"{task.getTitle()}: {e}")
+            return
 
-        pass
+        for obj in self._obj_loader.makeFigures(meshes, self._figure_registry.onFigureDelete, self._figure_registry.onFigureClone):
+            self._figure_registry.add(obj)
+
+    def onFrame(self) -> None:
+        self._tasks.refresh()
+
+    def shutdown(self) -> None:
+        self._tasks.cancelAll()
+        self._exporter.shutdown()
+        self._obj_importer.shutdown()
+        self._figure_registry.canvas.scheduler.shutdown()
 
     def _printTrajectories(self) -> None:
         self._logger.write("\n".join(map(str, self._figure_registry.getTrajectories())))
 
+    def _printGeometryCacheStats(self) -> None:
+        self._logger.write(f"Geometry cache : {self._figure_registry.getGeometryCacheStats()}")
+
     def _onWriteBytecode(self, output_path: Path) -> None:
-        with open(output_path, "wb") as bytecode_stream:
+        timer = StageTimer()
+
+        # Траектории читают параметры фигур из интерфейса - собираются в главном потоке
+        with timer.measure("geometry"):
+            self._figure_registry.canvas.scheduler.wait()
             trajectories = self._figure_registry.getTrajectories()
 
-            result = self._bytecode_writer.run(trajectories, bytecode_stream)
+        self._tasks.addTask(self._exporter.submit(trajectories, output_path, self._log_flags, timer))
+
+    def _onExported(self, task: ExportTask) -> None:
+        try:
+            report = task.getResult()
 
-            self._logger.write(result.getMessage())
+        except CancelledError:
+            self._logger.write(f"{task.getTitle()}: отменён")
+            return
+
+        except Exception as e:
+            self._logger.write(f"{task.getTitle()}: {e}")
+            return
+
+        for line in report.lines:
+            self._logger.write(line)
 
     def build(self) -> None:
         self._image_file_dialog.build()
+        self._picture_file_dialog.build()
         self._export_file_dialog.build()
 
         self._buildMenuBar()
@@ -122,6 +196,7 @@ class VARTApplication(Application):
             (
                 Menu("Файл").place()
                 .add(Button("Открыть", self._image_file_dialog.show))
+                .add(Button("Изображение", self._picture_file_dialog.show))
                 .add(Button("Экспорт", self._export_file_dialog.show))
             )
 
@@ -129,6 +204,10 @@ class VARTApplication(Application):
 
             Button("Очистить", self._figure_registry.clear).place()
 
+            dpg.add_separator()
+
+            self._tasks.place()
+
             (
                 Menu("Вставка").place()
                 .add(Button("Полигон", self._figure_registry.addPolygon))
@@ -143,6 +222,7 @@ class VARTApplication(Application):
             (
                 Menu("Dev").place()
                 .add(Button("Вывод траекторий", self._printTrajectories))
+                .add(Button("Статистика кэша геометрии", self._printGeometryCacheStats))
                 .add(Button("show_implot_demo", dpg.show_implot_demo))
                 .add(Button("show_font_manager", dpg.show_font_manager))
                 .add(Button("show_style_editor", dpg.show_style_editor))
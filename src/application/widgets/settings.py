@@ -1,8 +1,11 @@
+from gen.enums import SimplificationMethod
 from gen.movementprofile import MovementProfile
 from gen.settings import GeneratorSettings
 from ui.widgets.abc import ItemID
 from ui.widgets.custom.input2d import InputInt2D
+from ui.widgets.dpg.impl import Checkbox
 from ui.widgets.dpg.impl import CollapsingHeader
+from ui.widgets.dpg.impl import Combo
 from ui.widgets.dpg.impl import InputInt
 from ui.widgets.dpg.impl import SliderInt
 
@@ -44,6 +47,18 @@ class CodeGeneratorSettngsWidget(CollapsingHeader):
     def _updateEpilogueEndPosition(self, x: tuple[int, int]):
         self.settings.epilogue_end_position = x
 
+    def _updateRouteTimeBudget(self, x: int):
+        self.settings.route_time_budget_ms = x
+
+    def _updateSimplificationMethod(self, name: str):
+        self.settings.simplification_method = SimplificationMethod[name]
+
+    def _updateSimplificationTolerance(self, x: int):
+        self.settings.simplification_tolerance = x
+
+    def _updateIncrementalCompile(self, x: bool):
+        self.settings.incremental_compile = x
+
     def placeRaw(self, parent_id: ItemID) -> None:
         super().placeRaw(parent_id)
         self.add(ProfileWidget(self.settings.free_move_profile))
@@ -77,3 +92,27 @@ class CodeGeneratorSettngsWidget(CollapsingHeader):
             value_range=(-2000, 2000), input_width=w, reset_button=True,
             default_value=self.settings.epilogue_end_position
         ))
+        self.add(InputInt(
+            "Время оптимизации маршрута (мс)",
+            self._updateRouteTimeBudget,
+            width=w, step=100, step_fast=500,
+            default_value=self.settings.route_time_budget_ms
+        ))
+        self.add(Combo(
+            "Упрощение траекторий",
+            tuple(method.name for method in SimplificationMethod),
+            self._updateSimplificationMethod,
+            width=w,
+            default_value=self.settings.simplification_method.name
+        ))
+        self.add(InputInt(
+            "Допуск упрощения",
+            self._updateSimplificationTolerance,
+            width=w, value_range=(0, 100),
+            default_value=self.settings.simplification_tolerance
+        ))
+        self.add(Checkbox(
+            self._updateIncrementalCompile,
+            label="Инкрементальная компиляция",
+            default_value=self.settings.incremental_compile
+        ))
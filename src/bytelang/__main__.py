@@ -0,0 +1,62 @@
+"""
+Пакетная компиляция исходников bytelang без графического интерфейса
+Запуск: PYTHONPATH=src python -m bytelang source.bls [source.bls ...] [-o OUTPUT] [-j JOBS]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from bytelang.compiler import ByteLangCompiler
+from bytelang.compiler import CompileJob
+from bytelang.utils import LogFlag
+
+BYTECODE_EXTENSION = "blc"
+
+
+def _parseArgs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m bytelang", description="Пакетная компиляция исходников bytelang")
+    parser.add_argument("sources", nargs="+", type=Path, help="исходники")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="каталог байт-кода (по умолчанию - рядом с исходником)")
+    parser.add_argument("-r", "--resources", type=Path, default=Path("res/bytelang"), help="каталог контента bytelang")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="число процессов (по умолчанию - по числу процессоров)")
+    parser.add_argument("--cache", type=Path, default=None, help="каталог дискового кэша реестров")
+    parser.add_argument("-v", "--verbose", action="store_true", help="выводить размер программы и время компиляции каждого задания")
+    return parser.parse_args()
+
+
+def _main() -> int:
+    args = _parseArgs()
+
+    if args.output is not None:
+        args.output.mkdir(parents=True, exist_ok=True)
+
+    jobs = tuple(
+        CompileJob(source_path=source, output_path=(source.parent if args.output is None else args.output) / f"{source.stem}.{BYTECODE_EXTENSION}")
+        for source in args.sources
+    )
+
+    start = time.perf_counter()
+    compiler = ByteLangCompiler.simpleSetup(args.resources, args.cache)
+    results = compiler.compileMany(jobs, args.jobs, LogFlag.PROGRAM_SIZE | LogFlag.COMPILATION_TIME)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+
+    for job, result in zip(jobs, results):
+        if not result.isOK():
+            failed += 1
+            print(f"FAIL {job.source_path}\n{result.getMessage()}", file=sys.stderr)
+            continue
+
+        print(f"OK   {job.source_path} -> {job.output_path}")
+
+        if args.verbose:
+            print(result.getMessage())
+
+    print(f"{len(jobs) - failed}/{len(jobs)} compiled in {elapsed:.2f} s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main())
@@ -141,6 +141,18 @@ class ProgramData:
     marks: dict[int, str]
 
 
+@dataclass(frozen=True, kw_only=True)
+class Backpatch:
+    """Аргумент, ссылающийся на ещё не объявленную метку"""
+
+    address: int
+    """Адрес аргумента в программе"""
+    primitive: PrimitiveType
+    """Тип записываемого значения"""
+    statement: Statement
+    """Выражение, в котором использована ссылка (для вывода ошибок)"""
+
+
 @dataclass(frozen=True, kw_only=True)
 class CodeInstruction:
     """Инструкция кода"""
@@ -0,0 +1,195 @@
+"""Разбор байт-кода по таблицам окружения"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar
+from typing import Iterable
+
+import numpy as np
+
+from bytelang.content.impl.environments import Environment
+from bytelang.content.impl.environments import EnvironmentInstruction
+from bytelang.content.impl.primitives import PrimitiveType
+from bytelang.content.impl.primitives import PrimitiveWriteType
+from bytelang.core.parsers.abc import Parser
+
+
+@dataclass(frozen=True, kw_only=True)
+class DecodedProgram:
+    """Разобранная программа"""
+
+    environment: Environment
+    """Окружение, по таблицам которого разобрана программа"""
+    start_address: int
+    """Адрес первой инструкции (значение блока начала)"""
+    heap: bytes
+    """Блок переменных"""
+    instructions: np.ndarray
+    """
+    Инструкции - структурированный массив:
+    address - адрес инструкции, opcode - индекс инструкции окружения,
+    arguments - значения аргументов (лишние ячейки - нули; int64, если в окружении нет аргументов с плавающей точкой, иначе float64)
+    """
+
+    def getInstruction(self, opcode: int) -> EnvironmentInstruction:
+        """Инструкция окружения по индексу"""
+        return ByteCodeDecoder.getInstructionTable(self.environment)[opcode]
+
+    def select(self, name: str) -> np.ndarray:
+        """Маска вызовов инструкции"""
+        return self.instructions["opcode"] == self.environment.instructions[name].index
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+
+class ByteCodeDecoder:
+    """
+    Разбор байт-кода: блок начала (указатель кучи), блок переменных и поток инструкций.
+    Границы инструкций находятся одним проходом по таблице шагов, построенной для каждого байта,
+    аргументы извлекаются векторно - для каждой инструкции окружения отдельно
+    """
+
+    __ARGUMENT_SIZE_LIMIT: ClassVar[int] = 64
+    """Предел числа аргументов инструкции (защита от повреждённых таблиц)"""
+
+    def __init__(self, environment: Environment) -> None:
+        self.__env = environment
+        self.__table = self.getInstructionTable(environment)
+        self.__arguments_count = max((len(ins.arguments) for ins in self.__table), default=0)
+
+        if self.__arguments_count > self.__ARGUMENT_SIZE_LIMIT:
+            raise ValueError(f"Слишком много аргументов инструкции: {self.__arguments_count}")
+
+        has_exponent = any(arg.primitive_type.write_type == PrimitiveWriteType.EXPONENT for ins in self.__table for arg in ins.arguments)
+
+        self.dtype = np.dtype([
+            ("address", np.int64),
+            ("opcode", np.int32),
+            ("arguments", np.float64 if has_exponent else np.int64, (self.__arguments_count,)),
+        ])
+        """Тип записи инструкции"""
+
+    @staticmethod
+    def getInstructionTable(environment: Environment) -> tuple[EnvironmentInstruction, ...]:
+        """Инструкции окружения в порядке индексов"""
+        return tuple(sorted(environment.instructions.values(), key=lambda ins: ins.index))
+
+    @staticmethod
+    def getDType(primitive: PrimitiveType) -> np.dtype:
+        """Тип NumPy примитива: стандартный размер в порядке байт платформы, как у упаковщика"""
+        return np.dtype("=" + primitive.packer.format)
+
+    def run(self, bytecode: bytes) -> DecodedProgram:
+        """Разобрать программу"""
+        profile = self.__env.profile
+        data = np.frombuffer(bytecode, dtype=np.uint8)
+
+        if len(data) < profile.pointer_heap.size:
+            raise ValueError("Нет блока начала программы")
+
+        start_address = int(self.__read(data, np.zeros(1, np.int64), profile.pointer_heap)[0])
+
+        if not profile.pointer_heap.size <= start_address <= len(data):
+            raise ValueError(f"Адрес начала программы {start_address} вне программы размером {len(data)}")
+
+        addresses = self.__findInstructions(data, start_address)
+        opcodes = self.__read(data, addresses, profile.instruction_index)
+
+        ret = np.zeros(len(addresses), dtype=self.dtype)
+        ret["address"] = addresses
+        ret["opcode"] = opcodes
+
+        for instruction in self.__table:
+            if not instruction.arguments:
+                continue
+
+            rows = np.flatnonzero(opcodes == instruction.index)
+
+            if len(rows) == 0:
+                continue
+
+            offset = addresses[rows] + profile.instruction_index.size
+
+            for i, argument in enumerate(instruction.arguments):
+                ret["arguments"][rows, i] = self.__read(data, offset, argument.primitive_type)
+                offset = offset + argument.primitive_type.size
+
+        return DecodedProgram(
+            environment=self.__env,
+            start_address=start_address,
+            heap=bytecode[profile.pointer_heap.size:start_address],
+            instructions=ret
+        )
+
+    def __findInstructions(self, data: np.ndarray, start_address: int) -> np.ndarray:
+        index = self.__env.profile.instruction_index
+        code = data[start_address:]
+
+        if len(code) < index.size:
+            if len(code):
+                raise ValueError(f"Усечённая инструкция по адресу {start_address}")
+
+            return np.zeros(0, np.int64)
+
+        # Шаг до следующей инструкции для каждого байта, как если бы с него начиналась инструкция (0 - неизвестный индекс)
+        sizes = np.zeros(max(len(self.__table), 1), dtype=np.int64)
+        sizes[[ins.index for ins in self.__table]] = [ins.size for ins in self.__table]
+
+        opcodes = self.__read(code, np.arange(len(code) - index.size + 1), index)
+        steps = np.where(opcodes < len(sizes), sizes[np.minimum(opcodes, len(sizes) - 1)], 0).tolist()
+
+        ret = list[int]()
+        position = 0
+        last = len(steps)
+
+        while position < last:
+            if (step := steps[position]) == 0:
+                raise ValueError(f"Неизвестная инструкция {int(opcodes[position])} по адресу {start_address + position}")
+
+            ret.append(position)
+            position += step
+
+        if position != len(code):
+            raise ValueError(f"Усечённая инструкция по адресу {start_address + ret[-1] if ret else start_address}")
+
+        return np.array(ret, dtype=np.int64) + start_address
+
+    def __read(self, data: np.ndarray, offsets: np.ndarray, primitive: PrimitiveType) -> np.ndarray:
+        """Прочитать значения примитива по смещениям"""
+        if len(offsets) == 0:
+            return np.zeros(0, np.int64)
+
+        if primitive.size == 1:
+            raw = data[offsets]
+
+        else:
+            raw = data[offsets[:, np.newaxis] + np.arange(primitive.size)]
+
+        return np.ascontiguousarray(raw).view(self.getDType(primitive)).reshape(len(offsets))
+
+
+class Disassembler:
+    """Вывод разобранной программы в виде исходного кода"""
+
+    def run(self, program: DecodedProgram) -> Iterable[str]:
+        table = ByteCodeDecoder.getInstructionTable(program.environment)
+        names = [ins.name for ins in table]
+        counts = [len(ins.arguments) for ins in table]
+        pointers = [tuple(arg.pointing_type is not None for arg in ins.arguments) for ins in table]
+
+        yield f".env {program.environment.name}"
+
+        if program.heap:
+            yield f"{Parser.COMMENT} heap [{len(program.heap)}B]: {program.heap.hex(' ').upper()}"
+
+        addresses = program.instructions["address"].tolist()
+        opcodes = program.instructions["opcode"].tolist()
+        arguments = program.instructions["arguments"].tolist()
+
+        for address, opcode, args in zip(addresses, opcodes, arguments):
+            values = " ".join(
+                f"*{value:g}" if is_pointer else f"{value:g}" if isinstance(value, float) else str(value)
+                for value, is_pointer in zip(args[:counts[opcode]], pointers[opcode])
+            )
+            yield f"{names[opcode]} {values}".rstrip() + f" {Parser.COMMENT} {address:04X}"
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from struct import Struct
+from struct import error
+from typing import BinaryIO
+from typing import ClassVar
+from typing import Optional
+
+from bytelang.content.impl.environments import Environment
+from bytelang.content.impl.environments import EnvironmentInstruction
+from bytelang.core.handlers.errors import BasicErrorHandler
+from bytelang.utils import CountingStream
+
+
+class ByteCodeEmitter:
+    """
+    Запись инструкций окружения напрямую в байт-код, минуя исходный текст.
+    Результат совпадает с компиляцией программы без переменных и меток.
+    Инструкции копятся в буфере фиксированного размера, поэтому память не зависит от длины программы
+    """
+
+    BUFFER_SIZE: ClassVar[int] = 1 << 16
+    """Размер буфера перед записью в поток"""
+
+    def __init__(self, error_handler: BasicErrorHandler, environment: Environment, bytecode_output_stream: BinaryIO, view_limit: int = 0) -> None:
+        """
+        :param view_limit: Сколько байт начала программы (и вызовов инструкций в них) сохранить для представления в журнале (0 - не сохранять)
+        """
+        self.__err = error_handler.getChild(self.__class__.__name__)
+        self.__env = environment
+        self.__out = CountingStream(bytecode_output_stream)
+        self.__buffer = bytearray()
+        self.__packers = dict[str, Optional[tuple[Struct, EnvironmentInstruction]]]()
+        self.__instructions_count = 0
+        self.__view_limit = view_limit
+        self.__view = bytearray()
+        self.__view_calls = list[tuple[int, str]]()
+
+        self.__writeStartBlock()
+
+    def getEnvironment(self) -> Environment:
+        return self.__env
+
+    def getInstructionsCount(self) -> int:
+        return self.__instructions_count
+
+    def getViewBytes(self) -> bytes:
+        """Сохранённое начало программы (не более view_limit байт)"""
+        return bytes(self.__view)
+
+    def getViewCalls(self) -> tuple[tuple[int, str], ...]:
+        """Адреса и вызовы инструкций в сохранённом начале программы"""
+        return tuple(self.__view_calls)
+
+    def call(self, name: str, *arguments: int | float) -> None:
+        """Записать вызов инструкции"""
+        if name not in self.__packers:
+            self.__packers[name] = self.__makePacker(name)
+
+        if (packer := self.__packers[name]) is None:
+            return
+
+        struct, instruction = packer
+
+        if len(arguments) != len(instruction.arguments):
+            self.__err.write(f"{name}: Invalid arg count. Need {len(instruction.arguments)} (got {len(arguments)})")
+            return
+
+        address = self.__out.getBytesWritten() + len(self.__buffer)
+
+        try:
+            self.__buffer += struct.pack(instruction.index, *arguments)
+
+        except error as e:
+            self.__err.write(f"{name} {" ".join(map(str, arguments))}: Не удалось выполнить преобразование: {e}")
+            return
+
+        self.__instructions_count += 1
+
+        if address < self.__view_limit:
+            self.__view_calls.append((address, f"{name} {" ".join(map(str, arguments))}"))
+
+        if len(self.__buffer) >= self.BUFFER_SIZE:
+            self.__flush()
+
+    def finish(self) -> int:
+        """Завершить запись. Возвращает размер программы"""
+        self.__flush()
+
+        profile = self.__env.profile
+
+        if profile.max_program_length is not None and self.__out.getBytesWritten() >= profile.max_program_length:
+            self.__err.write(f"program size ({self.__out.getBytesWritten()}) out of {profile.max_program_length}")
+
+        return self.__out.getBytesWritten()
+
+    def __makePacker(self, name: str) -> Optional[tuple[Struct, EnvironmentInstruction]]:
+        if (instruction := self.__env.instructions.get(name)) is None:
+            self.__err.write(f"unknown instruction: {name}")
+            return
+
+        if any(argument.pointing_type is not None for argument in instruction.arguments):
+            self.__err.write(f"{instruction}: pointer arguments require program variables")
+            return
+
+        # Стандартные размеры без выравнивания в порядке байт платформы - как у отдельных упаковщиков примитивов
+        formats = (self.__env.profile.instruction_index, *(argument.primitive_type for argument in instruction.arguments))
+        return Struct("=" + "".join(primitive.packer.format for primitive in formats)), instruction
+
+    def __writeStartBlock(self) -> None:
+        heap = self.__env.profile.pointer_heap
+
+        try:
+            # Переменных нет: программа начинается сразу за указателем кучи
+            self.__write(heap.write(heap.size))
+
+        except error as e:
+            self.__err.write(f"Область Heap вне допустимого размера: {e}")
+
+    def __flush(self) -> None:
+        self.__write(bytes(self.__buffer))
+        self.__buffer.clear()
+
+    def __write(self, data: bytes) -> None:
+        if len(self.__view) < self.__view_limit:
+            self.__view += data[:self.__view_limit - len(self.__view)]
+
+        self.__out.write(data)
@@ -5,6 +5,7 @@ from typing import Iterable
 from typing import Optional
 
 from bytelang.bytecode.abc import ArgumentValueType
+from bytelang.bytecode.abc import Backpatch
 from bytelang.bytecode.abc import CodeInstruction
 from bytelang.bytecode.abc import Directive
 from bytelang.bytecode.abc import DirectiveArgument
@@ -24,12 +25,18 @@ from bytelang.tools.filters import Filter
 
 
 class CodeGenerator:
-    """Генератор промежуточного кода."""
-
-    def __init__(self, error_handler: BasicErrorHandler, environments: EnvironmentsRegistry, primitives: PrimitivesRegistry) -> None:
+    """
+    Генератор промежуточного кода.
+    В потоковом режиме метки можно использовать до объявления: на месте аргумента остаются нули,
+    адрес дописывается по таблице исправлений после объявления метки.
+    Переменные в этом режиме объявляются до первой метки или инструкции
+    """
+
+    def __init__(self, error_handler: BasicErrorHandler, environments: EnvironmentsRegistry, primitives: PrimitivesRegistry, streaming: bool = False) -> None:
         self.__err = error_handler.getChild(self.__class__.__name__)
         self.__environments = environments
         self.__primitives = primitives
+        self.__streaming = streaming
 
         self.__env: Optional[Environment] = None
         self.__constants = dict[str, UniversalArgument]()
@@ -39,6 +46,10 @@ class CodeGenerator:
         self.__mark_offset_isolated: int = 0
         self.__variable_offset: Optional[int] = None
 
+        self.__layout_fixed = False
+        self.__backpatches = dict[str, list[Backpatch]]()
+        self.__patches = list[tuple[int, bytes]]()
+
         __DIRECTIVE_ARG_ANY = DirectiveArgument("constant value or identifier", ArgumentValueType.ANY)
 
         self.__DIRECTIVES: dict[str, Directive] = {
@@ -90,8 +101,12 @@ class CodeGenerator:
 
         self.__constants[name] = value
 
-    def __writeArgumentFromPrimitive(self, statement: Statement, argument: UniversalArgument, primitive: PrimitiveType) -> Optional[bytes]:
+    def __writeArgumentFromPrimitive(self, statement: Statement, argument: UniversalArgument, primitive: PrimitiveType, address: Optional[int] = None) -> Optional[bytes]:
         if argument.identifier:
+            if self.__streaming and address is not None and argument.identifier not in self.__constants:
+                self.__backpatches.setdefault(argument.identifier, []).append(Backpatch(address=address, primitive=primitive, statement=statement))
+                return bytes(primitive.size)
+
             self.__checkNameExist(statement, argument.identifier)
 
             if self.__err.isFailed():
@@ -107,7 +122,7 @@ class CodeGenerator:
         except Exception as e:
             self.__err.writeStatement(statement, f"Не удалось выполнить преобразование: {e}")
 
-    def __writeArgumentFromInstructionArg(self, statement: Statement, i: int, u_arg: UniversalArgument, i_arg: EnvironmentInstructionArgument) -> Optional[bytes]:
+    def __writeArgumentFromInstructionArg(self, statement: Statement, i: int, u_arg: UniversalArgument, i_arg: EnvironmentInstructionArgument, address: int) -> Optional[bytes]:
         if i_arg.pointing_type:
             if (var := self.__variables.get(u_arg.identifier)) is None:
                 self.__err.writeStatement(statement, f"Аргумент ({i}) Обращение по указателю ({i_arg}) с помощью сырого значения недопустимо")
@@ -117,7 +132,7 @@ class CodeGenerator:
                 self.__err.writeStatement(statement, f"Аргумент ({i}): Размер переменной {var} меньше размера указателя примитивного типа аргумента {i_arg}. Передача значения будет с ошибками")
                 return
 
-        return self.__writeArgumentFromPrimitive(statement, u_arg, i_arg.primitive_type)
+        return self.__writeArgumentFromPrimitive(statement, u_arg, i_arg.primitive_type, address)
 
     def __directiveSetEnvironment(self, statement: Statement) -> None:
         if self.__env is not None:
@@ -156,6 +171,9 @@ class CodeGenerator:
         if self.__variable_offset is None:
             self.__err.writeStatement(statement, "variable offset index undefined. Must select env")
 
+        if self.__layout_fixed:
+            self.__err.writeStatement(statement, "В потоковом режиме переменные объявляются до первой метки или инструкции")
+
         arg_value = self.__writeArgumentFromPrimitive(statement, init_value, primitive)
 
         if self.__err.isFailed():
@@ -198,10 +216,16 @@ class CodeGenerator:
             self.__err.writeStatement(statement, "Невозможно создать метку пока не выбрано окружение")
             return
 
+        self.__layout_fixed = self.__streaming
+
         mark_offset = self.__getMarkOffset()
         self.__marks_address[mark_offset] = statement.head
         self.__addConstant(statement, statement.head, UniversalArgument.fromInteger(mark_offset))
 
+        for backpatch in self.__backpatches.pop(statement.head, ()):
+            if (data := self.__writeArgumentFromPrimitive(backpatch.statement, UniversalArgument.fromInteger(mark_offset), backpatch.primitive)) is not None:
+                self.__patches.append((backpatch.address, data))
+
     def __processInstruction(self, statement: Statement) -> Optional[CodeInstruction]:
         self.__err.begin()
 
@@ -220,18 +244,58 @@ class CodeGenerator:
             return
 
         self.__err.begin()
+        self.__layout_fixed = self.__streaming
 
-        code_ins_args = tuple(self.__writeArgumentFromInstructionArg(statement, i + 1, s_arg, i_arg) for i, (i_arg, s_arg) in enumerate(zip(instruction.arguments, statement.arguments)))
+        address = self.__getMarkOffset()
+        argument_address = address + self.__env.profile.instruction_index.size
+        code_ins_args = list[Optional[bytes]]()
+
+        for i, (i_arg, s_arg) in enumerate(zip(instruction.arguments, statement.arguments)):
+            code_ins_args.append(self.__writeArgumentFromInstructionArg(statement, i + 1, s_arg, i_arg, argument_address))
+            argument_address += i_arg.primitive_type.size
 
         if self.__err.isFailed():
             return
 
-        ret = CodeInstruction(instruction=instruction, arguments=code_ins_args, address=self.__getMarkOffset())
+        ret = CodeInstruction(instruction=instruction, arguments=tuple(code_ins_args), address=address)
         self.__mark_offset_isolated += instruction.size
         return ret
 
     def run(self, statements: Iterable[Statement]) -> tuple[tuple[CodeInstruction, ...], Optional[ProgramData]]:
-        return tuple(Filter.notNone(self.__METHOD_BY_TYPE[s.type](s) for s in statements)), self.getProgramData()
+        return tuple(Filter.notNone(self.process(s) for s in statements)), self.getProgramData()
+
+    def process(self, statement: Statement) -> Optional[CodeInstruction]:
+        """Обработать одно выражение. Возвращает инструкцию, если выражение её порождает"""
+        return self.__METHOD_BY_TYPE[statement.type](statement)
+
+    def getEnvironment(self) -> Optional[Environment]:
+        return self.__env
+
+    def getAddress(self) -> int:
+        """Адрес следующей инструкции"""
+        return self.__getMarkOffset()
+
+    def advance(self, size: int) -> None:
+        """Сдвинуть адрес на размер уже закодированных инструкций"""
+        self.__layout_fixed = self.__streaming
+        self.__mark_offset_isolated += size
+
+    def writeArgument(self, statement: Statement, index: int, argument: UniversalArgument, instruction_argument: EnvironmentInstructionArgument, address: int) -> Optional[bytes]:
+        """Закодировать аргумент инструкции, расположенный по адресу address"""
+        self.__err.begin()
+        return self.__writeArgumentFromInstructionArg(statement, index, argument, instruction_argument, address)
+
+    def popPatches(self) -> list[tuple[int, bytes]]:
+        """Забрать исправления (адрес, значение), готовые после объявления меток"""
+        ret = self.__patches
+        self.__patches = list[tuple[int, bytes]]()
+        return ret
+
+    def checkBackpatches(self) -> None:
+        """Сообщить о ссылках на метки, которые так и не были объявлены"""
+        for identifier, backpatches in self.__backpatches.items():
+            for backpatch in backpatches:
+                self.__err.writeStatement(backpatch.statement, f"Идентификатор {identifier} не определён")
 
     # noinspection PyTypeChecker
     def getProgramData(self) -> Optional[ProgramData]:
@@ -0,0 +1,290 @@
+"""Инкрементальная компиляция: повторно кодируются только изменённые фрагменты исходного кода"""
+from __future__ import annotations
+
+import io
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import ClassVar
+from typing import Iterable
+from typing import Optional
+from typing import TextIO
+
+from bytelang.bytecode.abc import Statement
+from bytelang.bytecode.abc import StatementType
+from bytelang.bytecode.abc import UniversalArgument
+from bytelang.bytecode.impl.gen import CodeGenerator
+from bytelang.bytecode.impl.stream import StreamingByteCodeWriter
+from bytelang.content.impl.environments import EnvironmentInstructionArgument
+from bytelang.core.handlers.errors import BasicErrorHandler
+from bytelang.core.parsers.impl.statement import StatementParser
+
+
+@dataclass(frozen=True, kw_only=True)
+class SourceChunk:
+    """Фрагмент исходного кода"""
+
+    lines: list[str]
+    """Строки фрагмента"""
+    first_line: int
+    """Номер первой строки в исходном коде"""
+    digest: bytes
+    """Хеш текста фрагмента"""
+
+    def getText(self) -> str:
+        return "".join(self.lines)
+
+
+class SourceChunker:
+    """
+    Разбиение исходного кода на фрагменты по заметкам траекторий.
+    Заметка начала открывает новый фрагмент, заметка конца завершает текущий
+    """
+
+    MARKER: ClassVar[str] = "Trajectory :"
+    """Признак строки-заметки траектории (быстрая проверка перед шаблоном)"""
+
+    __BOUNDARY: ClassVar[re.Pattern] = re.compile(r"\s*#\s*Note:\s*Trajectory :.*\s(Begin|End)\s*")
+
+    def run(self, source: TextIO) -> Iterable[SourceChunk]:
+        lines = list[str]()
+        first_line = 1
+
+        for index, line in enumerate(source, 1):
+            if self.MARKER in line and (match := self.__BOUNDARY.fullmatch(line)) is not None:
+                if match[1] == "Begin":
+                    if lines:
+                        yield self.__makeChunk(lines, first_line)
+
+                    lines, first_line = [line], index
+                    continue
+
+                lines.append(line)
+                yield self.__makeChunk(lines, first_line)
+                lines, first_line = [], index + 1
+                continue
+
+            lines.append(line)
+
+        if lines:
+            yield self.__makeChunk(lines, first_line)
+
+    @staticmethod
+    def __makeChunk(lines: list[str], first_line: int) -> SourceChunk:
+        return SourceChunk(lines=lines, first_line=first_line, digest=blake2b("".join(lines).encode(), digest_size=16).digest())
+
+
+@dataclass(frozen=True, kw_only=True)
+class Relocation:
+    """Аргумент инструкции, значение которого зависит от остальной программы (идентификатор или указатель)"""
+
+    offset: int
+    """Смещение аргумента от начала блока"""
+    index: int
+    """Номер аргумента в инструкции"""
+    argument: UniversalArgument
+    """Значение аргумента в исходном коде"""
+    instruction_argument: EnvironmentInstructionArgument
+    """Аргумент инструкции окружения"""
+    statement: Statement
+    """Выражение вызова инструкции"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class CodeBlock:
+    """Подряд идущие закодированные инструкции"""
+
+    code: bytes
+    """Байт-код, на месте перемещаемых аргументов - нули"""
+    relocations: tuple[Relocation, ...]
+    """Перемещаемые аргументы"""
+    instructions_count: int
+    """Число инструкций"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class EncodedChunk:
+    """Закодированный фрагмент: блоки кода вперемешку с директивами и метками в исходном порядке"""
+
+    items: tuple[CodeBlock | Statement, ...]
+    """Блоки кода и выражения директив и меток"""
+
+
+@dataclass
+class ChunkCacheStats:
+    """Счётчики обращений к кэшу фрагментов"""
+
+    hits: int = 0
+    """Фрагмент взят из кэша"""
+
+    misses: int = 0
+    """Фрагмент закодирован заново"""
+
+    def __str__(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total * 100 if total else 0
+        return f"hits: {self.hits} misses: {self.misses} ({ratio:.1f}% hits)"
+
+
+class ChunkCache:
+    """
+    LRU кэш закодированных фрагментов.
+    Ключ - имя окружения на начало фрагмента и хеш его текста
+    """
+
+    def __init__(self, capacity: int = 1 << 16) -> None:
+        self.__capacity = capacity
+        self.__entries = OrderedDict[tuple[Optional[str], bytes], EncodedChunk]()
+        self.stats = ChunkCacheStats()
+
+    def get(self, key: tuple[Optional[str], bytes]) -> Optional[EncodedChunk]:
+        """Получить фрагмент по ключу"""
+        if (ret := self.__entries.get(key)) is None:
+            self.stats.misses += 1
+            return
+
+        self.__entries.move_to_end(key)
+        self.stats.hits += 1
+        return ret
+
+    def put(self, key: tuple[Optional[str], bytes], chunk: EncodedChunk) -> None:
+        """Сохранить фрагмент"""
+        self.__entries[key] = chunk
+
+        if len(self.__entries) > self.__capacity:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Сбросить кэш"""
+        self.__entries.clear()
+
+
+class ChunkLinker:
+    """
+    Компоновка фрагментов в программу.
+    Директивы и метки каждый раз проходят через генератор - он назначает адреса меток и дописывает ссылки вперёд,
+    блоки кода копируются, перемещаемые аргументы кодируются заново по текущему адресу блока
+    """
+
+    def __init__(self, error_handler: BasicErrorHandler, generator: CodeGenerator, writer: StreamingByteCodeWriter) -> None:
+        self.__err = error_handler.getChild(self.__class__.__name__)
+        self.__generator = generator
+        self.__writer = writer
+        self.instructions_count = 0
+        self.patches_count = 0
+
+    def getKey(self, chunk: SourceChunk) -> tuple[Optional[str], bytes]:
+        """Ключ кэша фрагмента в текущем состоянии компоновки"""
+        env = self.__generator.getEnvironment()
+        return None if env is None else env.name, chunk.digest
+
+    def link(self, chunk: EncodedChunk) -> None:
+        """Добавить закодированный фрагмент"""
+        for item in chunk.items:
+            if isinstance(item, CodeBlock):
+                self.__linkBlock(item)
+            else:
+                self.__linkStatement(item)
+
+            if not self.__err.isSuccess():
+                return
+
+    def encode(self, chunk: SourceChunk) -> Optional[EncodedChunk]:
+        """Закодировать и добавить фрагмент. None - фрагмент с ошибками"""
+        items = list[CodeBlock | Statement]()
+        code = bytearray()
+        relocations = list[Relocation]()
+        instructions_count = 0
+
+        def flush() -> None:
+            nonlocal code, relocations, instructions_count
+
+            if instructions_count == 0:
+                return
+
+            block = CodeBlock(code=bytes(code), relocations=tuple(relocations), instructions_count=instructions_count)
+            items.append(block)
+            self.__linkBlock(block)
+
+            code, relocations, instructions_count = bytearray(), list[Relocation](), 0
+
+        for statement in StatementParser(self.__err).run(io.StringIO(chunk.getText())):
+            if statement.type is not StatementType.INSTRUCTION_CALL:
+                flush()
+                items.append(statement)
+                self.__linkStatement(statement)
+
+            elif self.__encodeInstruction(statement, code, relocations):
+                instructions_count += 1
+
+            if not self.__err.isSuccess():
+                self.__err.write(f"Фрагмент со строки {chunk.first_line}: номера строк указаны от начала фрагмента")
+                return
+
+        flush()
+
+        if not self.__err.isSuccess():
+            return
+
+        return EncodedChunk(items=tuple(items))
+
+    def __encodeInstruction(self, statement: Statement, code: bytearray, relocations: list[Relocation]) -> bool:
+        if (env := self.__generator.getEnvironment()) is None:
+            self.__err.writeStatement(statement, "no env (need) select env")
+            return False
+
+        if (instruction := env.instructions.get(statement.head)) is None:
+            self.__err.writeStatement(statement, f"unknown instruction: {statement.head}")
+            return False
+
+        if len(instruction.arguments) != len(statement.arguments):
+            self.__err.writeStatement(statement, f"Invalid arg count. Need {len(instruction.arguments)} (got {len(statement.arguments)})")
+            return False
+
+        code += env.profile.instruction_index.write(instruction.index)
+
+        for i, (i_arg, s_arg) in enumerate(zip(instruction.arguments, statement.arguments)):
+            if s_arg.identifier is not None or i_arg.pointing_type is not None:
+                relocations.append(Relocation(offset=len(code), index=i + 1, argument=s_arg, instruction_argument=i_arg, statement=statement))
+                code += bytes(i_arg.primitive_type.size)
+                continue
+
+            if (data := self.__generator.writeArgument(statement, i + 1, s_arg, i_arg, 0)) is None:
+                return False
+
+            code += data
+
+        return True
+
+    def __linkStatement(self, statement: Statement) -> None:
+        self.__generator.process(statement)
+        self.__applyPatches()
+
+    def __linkBlock(self, block: CodeBlock) -> None:
+        if not self.__writer.isStarted():
+            if (program_data := self.__generator.getProgramData()) is None:
+                return
+
+            self.__writer.begin(program_data)
+
+        address = self.__generator.getAddress()
+        code = block.code
+
+        if block.relocations:
+            code = bytearray(code)
+
+            for r in block.relocations:
+                if (data := self.__generator.writeArgument(r.statement, r.index, r.argument, r.instruction_argument, address + r.offset)) is None:
+                    return
+
+                code[r.offset:r.offset + len(data)] = data
+
+        self.__writer.writeCode(code)
+        self.__generator.advance(len(code))
+        self.instructions_count += block.instructions_count
+
+    def __applyPatches(self) -> None:
+        for address, data in self.__generator.popPatches():
+            self.__writer.patch(address, data)
+            self.patches_count += 1
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from struct import error
+from typing import BinaryIO
+from typing import ClassVar
+from typing import Optional
+
+from bytelang.bytecode.abc import CodeInstruction
+from bytelang.bytecode.abc import ProgramData
+from bytelang.bytecode.abc import Statement
+from bytelang.content.impl.primitives import PrimitiveType
+from bytelang.core.handlers.errors import BasicErrorHandler
+from bytelang.utils import CountingStream
+
+
+class StreamingByteCodeWriter:
+    """
+    Запись байт-кода по одной инструкции.
+    Инструкции копятся в буфере фиксированного размера, исправления адресов меток
+    попадают в буфер, если он ещё не записан, иначе - в поток через перемещение
+    """
+
+    BUFFER_SIZE: ClassVar[int] = 1 << 16
+    """Размер буфера перед записью в поток"""
+
+    def __init__(self, error_handler: BasicErrorHandler, bytecode_output_stream: BinaryIO, view_limit: int = 0) -> None:
+        """
+        :param view_limit: Сколько байт начала программы (и инструкций в них) сохранить для представления в журнале (0 - не сохранять)
+        """
+        self.__err = error_handler.getChild(self.__class__.__name__)
+        self.__stream = bytecode_output_stream
+        self.__out = CountingStream(bytecode_output_stream)
+        self.__buffer = bytearray()
+        self.__instruction_index: Optional[PrimitiveType] = None
+        self.__max_program_length: Optional[int] = None
+        self.__origin = bytecode_output_stream.tell() if bytecode_output_stream.seekable() else None
+        self.__view_limit = view_limit
+        self.__view = bytearray()
+        self.__view_calls = list[tuple[int, str]]()
+
+    def getViewBytes(self) -> bytes:
+        """Сохранённое начало программы (не более view_limit байт)"""
+        return bytes(self.__view)
+
+    def getViewCalls(self) -> tuple[tuple[int, str], ...]:
+        """Адреса и инструкции в сохранённом начале программы (закодированные блоки writeCode не учитываются)"""
+        return tuple(self.__view_calls)
+
+    def isStarted(self) -> bool:
+        return self.__instruction_index is not None
+
+    def begin(self, program_data: ProgramData) -> None:
+        """Записать блок начала программы и переменные. Вызывается до первой инструкции"""
+        profile = program_data.environment.profile
+        self.__instruction_index = profile.instruction_index
+        self.__max_program_length = profile.max_program_length
+
+        try:
+            self.__buffer += profile.pointer_heap.write(program_data.start_address)
+
+        except error as e:
+            self.__err.write(f"Область Heap вне допустимого размера: {e}")
+
+        for variable in program_data.variables:
+            self.__buffer += variable.value
+
+    def write(self, instruction: CodeInstruction, statement: Optional[Statement] = None) -> None:
+        """
+        Записать инструкцию
+        :param statement: Выражение вызова - в представлении вместо инструкции (аргументы-ссылки вперёд в инструкции ещё не дописаны)
+        """
+        if instruction.address < self.__view_limit:
+            self.__view_calls.append((instruction.address, str(instruction) if statement is None else statement.line.strip()))
+
+        self.writeCode(instruction.write(self.__instruction_index))
+
+    def writeCode(self, code: bytes) -> None:
+        """Записать закодированные инструкции"""
+        self.__buffer += code
+
+        if len(self.__buffer) >= self.BUFFER_SIZE:
+            self.__flush()
+
+    def patch(self, address: int, data: bytes) -> None:
+        """Заменить ранее записанные байты по адресу программы"""
+        flushed = self.__out.getBytesWritten()
+
+        if address >= flushed:
+            self.__buffer[address - flushed:address - flushed + len(data)] = data
+            return
+
+        if address < len(self.__view):
+            end = min(address + len(data), len(self.__view))
+            self.__view[address:end] = data[:end - address]
+
+        if self.__origin is None:
+            self.__err.write(f"Поток вывода не поддерживает перемещение: невозможно дописать адрес метки в {address}")
+            return
+
+        self.__stream.seek(self.__origin + address)
+        self.__stream.write(data)
+        self.__stream.seek(self.__origin + flushed)
+
+    def finish(self) -> int:
+        """Завершить запись. Возвращает размер программы"""
+        self.__flush()
+
+        if self.__max_program_length is not None and self.__out.getBytesWritten() >= self.__max_program_length:
+            self.__err.write(f"program size ({self.__out.getBytesWritten()}) out of {self.__max_program_length}")
+
+        return self.__out.getBytesWritten()
+
+    def __flush(self) -> None:
+        if len(self.__view) < self.__view_limit:
+            self.__view += self.__buffer[:self.__view_limit - len(self.__view)]
+
+        self.__out.write(bytes(self.__buffer))
+        self.__buffer.clear()
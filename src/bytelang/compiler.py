@@ -1,12 +1,25 @@
 from __future__ import annotations
 
 import time
+from dataclasses import dataclass
+from dataclasses import replace
 from pathlib import Path
 from typing import BinaryIO
+from typing import Callable
+from typing import Optional
+from typing import Sequence
 from typing import TextIO
 
+from bytelang.bytecode.impl.decoder import ByteCodeDecoder
+from bytelang.bytecode.impl.decoder import DecodedProgram
+from bytelang.bytecode.impl.emitter import ByteCodeEmitter
 from bytelang.bytecode.impl.gen import CodeGenerator
+from bytelang.bytecode.impl.incremental import ChunkCache
+from bytelang.bytecode.impl.incremental import ChunkLinker
+from bytelang.bytecode.impl.incremental import SourceChunker
+from bytelang.bytecode.impl.stream import StreamingByteCodeWriter
 from bytelang.bytecode.impl.writter import ByteCodeWriter
+from bytelang.content.cache import ContentCache
 from bytelang.content.impl.environments import EnvironmentsRegistry
 from bytelang.content.impl.packages import PackageRegistry
 from bytelang.content.impl.primitives import PrimitivesRegistry
@@ -15,31 +28,64 @@ from bytelang.constants import PACKAGE_EXTENSION
 from bytelang.core.handlers.errors import ErrorHandler
 from bytelang.core.parsers.impl.statement import StatementParser
 from bytelang.core.results.compile.abc import CompileResult
+from bytelang.core.results.compile.impl import CompileResultEmitted
 from bytelang.core.results.compile.impl import CompileResultError
+from bytelang.core.results.compile.impl import CompileResultIncremental
 from bytelang.core.results.compile.impl import CompileResultOK
 from bytelang.utils import LogFlag
 from bytelang.tools.filetool import AnyPath
+from bytelang.tools.workers import getWorkerState
+from bytelang.tools.workers import makeWorkerPool
+
+
+@dataclass(frozen=True, kw_only=True)
+class CompileJob:
+    """Задание пакетной компиляции"""
+
+    source_path: Path
+    """Исходный код"""
+    output_path: Path
+    """Файл байт-кода"""
 
 
 class ByteLangCompiler:
     """API byteLang"""
 
     @classmethod
-    def simpleSetup(cls, bytelang_path: AnyPath) -> ByteLangCompiler:
+    def simpleSetup(cls, bytelang_path: AnyPath, cache_folder: Optional[AnyPath] = None) -> ByteLangCompiler:
         """
         Получить простую конфигурацию bytelang
         :param bytelang_path:
+        :param cache_folder: Каталог дискового кэша реестров. None - разбирать файлы контента при каждом вызове
         :return: Рабочую конфигурацию ByteLang
         """
         bytelang_path = Path(bytelang_path)
+        cache = None if cache_folder is None else ContentCache(Path(cache_folder), bytelang_path)
+
+        if cache is not None and (registries := cache.load()) is not None:
+            return ByteLangCompiler(*registries)
 
         primitives_registry = PrimitivesRegistry(bytelang_path / "std.json")
         profile_registry = ProfileRegistry(bytelang_path / "profiles", "json", primitives_registry)
         package_registry = PackageRegistry(bytelang_path / "packages", PACKAGE_EXTENSION, primitives_registry)
         environments_registry = EnvironmentsRegistry(bytelang_path / "env", "json", profile_registry, package_registry)
 
+        if cache is not None:
+            cls.__saveCache(cache, primitives_registry, environments_registry)
+
         return ByteLangCompiler(primitives_registry, environments_registry)
 
+    @staticmethod
+    def __saveCache(cache: ContentCache, primitives_registry: PrimitivesRegistry, environments_registry: EnvironmentsRegistry) -> None:
+        try:
+            environments_registry.loadAll()
+
+        except Exception:
+            # Ошибка в файлах контента будет выведена при компиляции, как и без кэша
+            return
+
+        cache.save(primitives_registry, environments_registry)
+
     def __init__(self, primitives_registry: PrimitivesRegistry, environment_registry: EnvironmentsRegistry) -> None:
         self.__primitives_registry = primitives_registry
         self.__environment_registry = environment_registry
@@ -77,3 +123,204 @@ class ByteLangCompiler:
         compilation_time_seconds = time.time() - start_time
 
         return CompileResultOK(source_input_stream, bytecode_output_stream, log_flags, statements, instructions, program_data, program_size, compilation_time_seconds)
+
+    def compileStream(self, source_input_stream: TextIO, bytecode_output_stream: BinaryIO, log_flags: LogFlag = LogFlag.ALL) -> CompileResult:
+        """
+        Скомпилировать исходный код потоково: выражения разбираются, генерируются и записываются по одному,
+        поэтому память не зависит от длины исходного кода.
+        Метки можно использовать до объявления, переменные объявляются до первой метки или инструкции.
+        Компиляция прекращается на первой ошибке
+        :param source_input_stream: Источник исходного кода
+        :param bytecode_output_stream: Выход байт-кода (для ссылок на метки вперёд дальше буфера - с поддержкой seek)
+        :param log_flags: Уровень отображения сообщения компиляции
+        :return: Результат компиляции
+        """
+        start_time = time.time()
+
+        errors_handler = ErrorHandler()
+        error_result = CompileResultError(source_input_stream, bytecode_output_stream, errors_handler)
+
+        generator = CodeGenerator(errors_handler, self.__environment_registry, self.__primitives_registry, streaming=True)
+        writer = StreamingByteCodeWriter(errors_handler, bytecode_output_stream, self.__getViewLimit(log_flags))
+        instructions_count = 0
+        patches_count = 0
+
+        for statement in StatementParser(errors_handler).run(source_input_stream):
+            instruction = generator.process(statement)
+
+            if not errors_handler.isSuccess():
+                return error_result
+
+            if instruction is not None:
+                if not writer.isStarted():
+                    writer.begin(generator.getProgramData())
+
+                writer.write(instruction, statement)
+                instructions_count += 1
+
+            for address, data in generator.popPatches():
+                writer.patch(address, data)
+                patches_count += 1
+
+        generator.checkBackpatches()
+
+        if (program_data := generator.getProgramData()) is None or not errors_handler.isSuccess():
+            return error_result
+
+        if not writer.isStarted():
+            writer.begin(program_data)
+
+        program_size = writer.finish()
+
+        if not errors_handler.isSuccess():
+            return error_result
+
+        compilation_time_seconds = time.time() - start_time
+
+        return CompileResultEmitted(
+            source_input_stream, bytecode_output_stream, log_flags, program_data.environment, instructions_count, program_size, compilation_time_seconds, patches_count,
+            bytecode=writer.getViewBytes(), calls=writer.getViewCalls()
+        )
+
+    def compileIncremental(self, source_input_stream: TextIO, bytecode_output_stream: BinaryIO, cache: ChunkCache, log_flags: LogFlag = LogFlag.ALL) -> CompileResult:
+        """
+        Скомпилировать исходный код, повторно используя закодированные фрагменты из кэша.
+        Исходный код делится на фрагменты по заметкам траекторий, заново разбираются только изменённые фрагменты,
+        адреса меток назначаются при компоновке. Ограничения - как у потоковой компиляции
+        :param source_input_stream: Источник исходного кода
+        :param bytecode_output_stream: Выход байт-кода
+        :param cache: Кэш фрагментов, общий для повторных компиляций
+        :param log_flags: Уровень отображения сообщения компиляции
+        :return: Результат компиляции
+        """
+        start_time = time.time()
+
+        errors_handler = ErrorHandler()
+        error_result = CompileResultError(source_input_stream, bytecode_output_stream, errors_handler)
+
+        generator = CodeGenerator(errors_handler, self.__environment_registry, self.__primitives_registry, streaming=True)
+        writer = StreamingByteCodeWriter(errors_handler, bytecode_output_stream, self.__getViewLimit(log_flags))
+        linker = ChunkLinker(errors_handler, generator, writer)
+        chunks_total = 0
+        chunks_compiled = 0
+
+        for chunk in SourceChunker().run(source_input_stream):
+            chunks_total += 1
+            key = linker.getKey(chunk)
+
+            if (encoded := cache.get(key)) is not None:
+                linker.link(encoded)
+
+            elif (encoded := linker.encode(chunk)) is not None:
+                cache.put(key, encoded)
+                chunks_compiled += 1
+
+            if not errors_handler.isSuccess():
+                return error_result
+
+        generator.checkBackpatches()
+
+        if (program_data := generator.getProgramData()) is None or not errors_handler.isSuccess():
+            return error_result
+
+        if not writer.isStarted():
+            writer.begin(program_data)
+
+        program_size = writer.finish()
+
+        if not errors_handler.isSuccess():
+            return error_result
+
+        compilation_time_seconds = time.time() - start_time
+
+        return CompileResultIncremental(
+            source_input_stream, bytecode_output_stream, log_flags, program_data.environment,
+            linker.instructions_count, program_size, compilation_time_seconds, linker.patches_count,
+            bytecode=writer.getViewBytes(), calls=writer.getViewCalls(), chunks_total=chunks_total, chunks_compiled=chunks_compiled
+        )
+
+    def preload(self) -> None:
+        """Загрузить все окружения заранее - перед передачей компилятора в другие процессы"""
+        try:
+            self.__environment_registry.loadAll()
+
+        except Exception:
+            # Ошибка окружения будет выведена при компиляции, как и без предзагрузки
+            pass
+
+    def compileMany(self, jobs: Sequence[CompileJob], max_workers: Optional[int] = None, log_flags: LogFlag = LogFlag.ALL) -> list[CompileResult]:
+        """
+        Скомпилировать независимые исходники в пуле процессов.
+        Каждый процесс получает копию компилятора с уже загруженными окружениями.
+        Исходники компилируются потоково (compileStream), потоки в результатах не сохраняются
+        :param jobs: Задания
+        :param max_workers: Число процессов. None - по числу процессоров
+        :param log_flags: Уровень отображения сообщения компиляции
+        :return: Результаты в порядке заданий
+        """
+        self.preload()
+
+        with makeWorkerPool(self, max_workers) as executor:
+            return list(executor.map(_compileJob, jobs, (log_flags,) * len(jobs)))
+
+    def emit(self, environment_name: str, generate: Callable[[ByteCodeEmitter], None], bytecode_output_stream: BinaryIO, log_flags: LogFlag = LogFlag.ALL) -> CompileResult:
+        """
+        Записать байт-код напрямую, без исходного текста
+        :param environment_name: Окружение, инструкции которого вызывает генератор
+        :param generate: Генератор программы - вызывает инструкции через эмиттер
+        :param bytecode_output_stream: Выход байт-кода
+        :param log_flags: Уровень отображения сообщения компиляции
+        :return: Результат компиляции
+        """
+        start_time = time.time()
+
+        errors_handler = ErrorHandler()
+        error_result = CompileResultError(None, bytecode_output_stream, errors_handler)
+
+        try:
+            environment = self.__environment_registry.get(environment_name)
+
+        except Exception as e:
+            errors_handler.write(f"Не удалось загрузить окружение {environment_name}\n{e}")
+            return error_result
+
+        emitter = ByteCodeEmitter(errors_handler, environment, bytecode_output_stream, self.__getViewLimit(log_flags))
+        generate(emitter)
+        program_size = emitter.finish()
+
+        if not errors_handler.isSuccess():
+            return error_result
+
+        compilation_time_seconds = time.time() - start_time
+
+        return CompileResultEmitted(
+            None, bytecode_output_stream, log_flags, environment, emitter.getInstructionsCount(), program_size, compilation_time_seconds, bytecode=emitter.getViewBytes(), calls=emitter.getViewCalls()
+        )
+
+    @staticmethod
+    def __getViewLimit(log_flags: LogFlag) -> int:
+        """Сколько байт начала программы сохранить в результате для представления в журнале"""
+        return CompileResultEmitted.BYTECODE_VIEW_LIMIT if LogFlag(log_flags) & (LogFlag.BYTECODE | LogFlag.STATEMENTS) else 0
+
+    def decode(self, environment_name: str, bytecode: bytes) -> DecodedProgram:
+        """
+        Разобрать байт-код
+        :param environment_name: Окружение, для которого скомпилирована программа (в байт-коде оно не записано)
+        :param bytecode: Байт-код
+        :return: Разобранная программа. ValueError - байт-код не соответствует окружению
+        """
+        return ByteCodeDecoder(self.__environment_registry.get(environment_name)).run(bytecode)
+
+
+def _compileJob(job: CompileJob, log_flags: LogFlag) -> CompileResult:
+    try:
+        with open(job.source_path) as source, open(job.output_path, "wb") as output:
+            result = getWorkerState(ByteLangCompiler).compileStream(source, output, log_flags)
+
+    except OSError as e:
+        errors_handler = ErrorHandler()
+        errors_handler.write(f"{job.source_path}: {e}")
+        result = CompileResultError(None, None, errors_handler)
+
+    # Закрытые файлы не передаются между процессами
+    return replace(result, source_stream=None, bytecode_stream=None)
@@ -92,6 +92,11 @@ class CatalogRegistry[T](Registry[str, T]):
 
         return ret
 
+    def loadAll(self) -> None:
+        """Загрузить весь контент каталога"""
+        for path in sorted(self.__TARGET_FOLDER.glob(f"*.{self.__FILE_EXT}")):
+            self.get(path.stem)
+
     @abstractmethod
     def _load(self, path: Path, name: str) -> T:
         """
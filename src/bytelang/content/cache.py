@@ -0,0 +1,136 @@
+"""Дисковый кэш реестров контента bytelang"""
+from __future__ import annotations
+
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from dataclasses import replace
+from hashlib import blake2b
+from pathlib import Path
+from typing import ClassVar
+from typing import Optional
+
+from bytelang.content.impl.environments import EnvironmentsRegistry
+from bytelang.content.impl.primitives import PrimitivesRegistry
+
+_SourceStat = tuple[str, int, int]
+
+
+@dataclass(frozen=True, kw_only=True)
+class ContentSnapshot:
+    """Сохранённое состояние реестров"""
+
+    version: int
+    """Версия формата снимка"""
+    root: str
+    """Каталог контента bytelang"""
+    sources: tuple[_SourceStat, ...]
+    """Путь, время изменения и размер каждого исходного файла и каталога"""
+    digest: bytes
+    """Хеш содержимого исходных файлов"""
+    primitives: PrimitivesRegistry
+    """Реестр примитивных типов"""
+    environments: EnvironmentsRegistry
+    """Реестр окружений со всеми загруженными окружениями, профилями и пакетами"""
+
+
+class ContentCache:
+    """
+    Снимок разобранных реестров на диске (pickle).
+    Снимок действителен, пока не изменились файлы контента и модули реестров:
+    сначала сравниваются время изменения и размер записанных файлов и каталогов
+    (добавление файла меняет время изменения каталога), при расхождении - хеш содержимого.
+    Кэш читается как доверенный - каталог кэша не должен быть доступен на запись посторонним
+    """
+
+    VERSION: ClassVar[int] = 1
+    """Версия формата снимка"""
+
+    MODULES_FOLDER: ClassVar[Path] = Path(__file__).parent
+    """Модули реестров: их изменение также делает снимок недействительным"""
+
+    def __init__(self, cache_folder: Path, bytelang_path: Path) -> None:
+        self.__root = os.path.abspath(bytelang_path)
+        self.__bytelang_path = bytelang_path
+        self.__path = cache_folder / f"content-{blake2b(self.__root.encode(), digest_size=8).hexdigest()}.pickle"
+
+    def load(self) -> Optional[tuple[PrimitivesRegistry, EnvironmentsRegistry]]:
+        """Загрузить реестры. None - снимка нет или он устарел"""
+        try:
+            with open(self.__path, "rb") as f:
+                snapshot = pickle.load(f)
+
+        except Exception:
+            return
+
+        if not isinstance(snapshot, ContentSnapshot) or snapshot.version != self.VERSION or snapshot.root != self.__root:
+            return
+
+        if not self.__isActual(snapshot.sources):
+            sources = self.__getSources()
+
+            if self.__digest(sources) != snapshot.digest:
+                return
+
+            # Файлы затронуты, но не изменены
+            self.__write(replace(snapshot, sources=self.__stat(sources)))
+
+        return snapshot.primitives, snapshot.environments
+
+    def save(self, primitives: PrimitivesRegistry, environments: EnvironmentsRegistry) -> None:
+        """Сохранить реестры. Окружения должны быть загружены заранее"""
+        sources = self.__getSources()
+
+        self.__write(ContentSnapshot(
+            version=self.VERSION,
+            root=self.__root,
+            sources=self.__stat(sources),
+            digest=self.__digest(sources),
+            primitives=primitives,
+            environments=environments
+        ))
+
+    def __write(self, snapshot: ContentSnapshot) -> None:
+        # Запись во временный файл и замена - параллельные процессы не увидят снимок частично
+        temp: Optional[Path] = None
+
+        try:
+            self.__path.parent.mkdir(parents=True, exist_ok=True)
+
+            with tempfile.NamedTemporaryFile("wb", dir=self.__path.parent, suffix=".tmp", delete=False) as f:
+                temp = Path(f.name)
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp, self.__path)
+
+        except (OSError, pickle.PicklingError):
+            if temp is not None:
+                temp.unlink(missing_ok=True)
+
+    def __getSources(self) -> list[Path]:
+        return sorted((self.__bytelang_path, *self.__bytelang_path.rglob("*"), self.MODULES_FOLDER, *self.MODULES_FOLDER.rglob("*.py")))
+
+    @staticmethod
+    def __isActual(sources: tuple[_SourceStat, ...]) -> bool:
+        try:
+            return all((s := os.stat(path)).st_mtime_ns == mtime and s.st_size == size for path, mtime, size in sources)
+
+        except OSError:
+            return False
+
+    @staticmethod
+    def __stat(sources: list[Path]) -> tuple[_SourceStat, ...]:
+        return tuple((str(path), (s := os.stat(path)).st_mtime_ns, s.st_size) for path in sources)
+
+    @staticmethod
+    def __digest(sources: list[Path]) -> bytes:
+        h = blake2b(digest_size=16)
+
+        for path in sources:
+            h.update(str(path).encode())
+
+            if path.is_file():
+                h.update(path.read_bytes())
+
+        return h.digest()
@@ -81,6 +81,7 @@ class PackageParser(Parser[PackageInstruction]):
 
     def begin(self, package_name: str) -> None:
         self.__package_name = package_name
+        self.__used_names.clear()
 
     def _parseLine(self, index: int, line: str) -> Optional[PackageInstruction]:
         name, *arg_types = line.split()
@@ -122,3 +123,7 @@ class PackageRegistry(CatalogRegistry[Package]):
 
         with open(filepath) as f:
             return Package(parent=str(filepath), name=name, instructions=tuple(self.__parser.run(f)))
+
+    def __getstate__(self) -> dict:
+        # Окружения хранят уже разрешённые инструкции: пакеты при сериализации не сохраняются и загружаются заново по запросу
+        return self.__dict__ | {"_data": dict[str, Package]()}
@@ -50,6 +50,13 @@ class PrimitiveType(Content):
     def write(self, v: int | float) -> bytes:
         return self.packer.pack(v)
 
+    def __getstate__(self) -> dict:
+        # Упаковщик не сериализуется - сохраняется его формат
+        return self.__dict__ | {"packer": self.packer.format}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state | {"packer": Struct(state["packer"])})
+
     def __repr__(self) -> str:
         return f"[{self.write_type} {self.size * 8}-bit] {self.__str__()}"
 
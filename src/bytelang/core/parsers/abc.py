@@ -22,7 +22,7 @@ class Parser[T](ABC):
         )
 
     def __cleanup(self, line: str) -> str:
-        return line.split(self.COMMENT)[0].strip()
+        return line.partition(self.COMMENT)[0].strip()
 
     @abstractmethod
     def _parseLine(self, index: int, line: str) -> Optional[T]:
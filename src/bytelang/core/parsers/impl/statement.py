@@ -1,8 +1,6 @@
 from __future__ import annotations
-from __future__ import annotations
 
 import re
-from dataclasses import dataclass
 from typing import Callable
 from typing import ClassVar
 from typing import Optional
@@ -10,43 +8,62 @@ from typing import Optional
 from bytelang.bytecode.abc import Regex
 from bytelang.bytecode.abc import Statement
 from bytelang.bytecode.abc import StatementType
-
 from bytelang.bytecode.abc import UniversalArgument
 from bytelang.core.handlers.errors import BasicErrorHandler
 from bytelang.core.parsers.abc import Parser
 
 
-@dataclass(frozen=True)
-class Matcher:
-    __pattern: str
-    __handler: Callable[[str], UniversalArgument]
-
-    def process(self, lexeme: str) -> Optional[UniversalArgument]:
-        if re.match(self.__pattern, lexeme):
-            return self.__handler(lexeme)
+def _unanchored(pattern: str) -> str:
+    """Шаблон лексемы без якорей начала и конца строки - для объединения в общий шаблон"""
+    return pattern.replace("^", "").replace("$", "")
 
 
 class StatementParser(Parser[Statement]):
-    __MATCHERS: ClassVar[tuple[Matcher, ...]] = (
-        Matcher(Regex.INTEGER, lambda s: UniversalArgument.fromInteger(int(s, 10))),
-        Matcher(Regex.BIN_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 2))),
-        Matcher(Regex.OCT_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 8))),
-        Matcher(Regex.HEX_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 16))),
-        Matcher(Regex.EXPONENT, lambda s: UniversalArgument.fromExponent(float(s))),
-        Matcher(Regex.CHAR, lambda s: UniversalArgument.fromExponent(ord(s[1]))),
-        Matcher(Regex.IDENTIFIER, lambda s: UniversalArgument.fromName(s)),
-    )
+    """
+    Разбор выражений.
+    Лексемы классифицируются одним скомпилированным шаблоном: альтернативы проверяются
+    в порядке приоритета, имя сработавшей группы определяет тип лексемы.
+    Разобранные лексемы запоминаются - в сгенерированных программах они часто повторяются
+    """
+
+    LEXEME_CACHE_SIZE: ClassVar[int] = 1 << 16
+    """Предельное число запомненных лексем (при переполнении таблица очищается)"""
+
+    __ARGUMENT_CONVERTERS: ClassVar[dict[str, tuple[str, Callable[[str], UniversalArgument]]]] = {
+        "INTEGER": (Regex.INTEGER, lambda s: UniversalArgument.fromInteger(int(s, 10))),
+        "BIN_VALUE": (Regex.BIN_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 2))),
+        "OCT_VALUE": (Regex.OCT_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 8))),
+        "HEX_VALUE": (Regex.HEX_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 16))),
+        "EXPONENT": (Regex.EXPONENT, lambda s: UniversalArgument.fromExponent(float(s))),
+        "CHAR": (Regex.CHAR, lambda s: UniversalArgument.fromExponent(ord(s[1]))),
+        "IDENTIFIER": (Regex.IDENTIFIER, lambda s: UniversalArgument.fromName(s)),
+    }
+
+    __ARGUMENT: ClassVar[re.Pattern] = re.compile("|".join(
+        f"(?P<{name}>{_unanchored(pattern)})"
+        for name, (pattern, _) in __ARGUMENT_CONVERTERS.items()
+    ))
+
+    __STATEMENT_TYPE: ClassVar[re.Pattern] = re.compile("|".join(
+        f"(?P<{statement_type.name}>{statement_type.value})"
+        for statement_type in StatementType
+    ))
+
+    __NAME: ClassVar[re.Pattern] = re.compile(Regex.NAME)
 
     def __init__(self, error_handler: BasicErrorHandler):
         self.__err = error_handler.getChild(self.__class__.__name__)
+        self.__arguments = dict[str, UniversalArgument]()
+        self.__heads = dict[str, tuple[StatementType, str]]()
 
     def _parseLine(self, index: int, line: str) -> Optional[Statement]:
         first, *lexemes = line.split()
 
         self.__err.begin()
 
-        args = tuple(self.__matchStatementArg(lexeme, i, index, line) for i, lexeme in enumerate(lexemes))
-        _type, head = self.__matchStatementType(first, index, line)
+        arguments = self.__arguments
+        args = tuple(arguments.get(lexeme) or self.__matchStatementArg(lexeme, i, index, line) for i, lexeme in enumerate(lexemes))
+        _type, head = self.__heads.get(first) or self.__matchStatementType(first, index, line)
 
         if self.__err.isFailed():
             return
@@ -54,17 +71,22 @@ class StatementParser(Parser[Statement]):
         return Statement(type=_type, line=line, index=index, head=head, arguments=args)
 
     def __matchStatementType(self, lexeme: str, index: int, line_source: str) -> tuple[StatementType, str] | tuple[None, None]:
-        for statement_type in StatementType:
-            if m := re.fullmatch(statement_type.value, lexeme):
-                w = re.search(Regex.NAME, m.string)
-                return statement_type, w.string[w.start():w.end()]
+        if m := self.__STATEMENT_TYPE.fullmatch(lexeme):
+            return self.__remember(self.__heads, lexeme, (StatementType[m.lastgroup], self.__NAME.search(lexeme).group()))
 
         self.__err.writeLineAt(line_source, index, f"Не удалось определить тип выражения: '{lexeme}'")
         return None, None
 
     def __matchStatementArg(self, lexeme: str, i: int, line_index: int, line_source: str) -> Optional[UniversalArgument]:
-        for matcher in self.__MATCHERS:
-            if ret := matcher.process(lexeme):
-                return ret
+        if m := self.__ARGUMENT.fullmatch(lexeme):
+            _, converter = self.__ARGUMENT_CONVERTERS[m.lastgroup]
+            return self.__remember(self.__arguments, lexeme, converter(lexeme))
 
         self.__err.writeLineAt(line_source, line_index, f"Запись Аргумента ({i}) '{lexeme}' не распознана")
+
+    def __remember[T](self, cache: dict[str, T], lexeme: str, value: T) -> T:
+        if len(cache) >= self.LEXEME_CACHE_SIZE:
+            cache.clear()
+
+        cache[lexeme] = value
+        return value
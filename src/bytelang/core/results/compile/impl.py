@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import ClassVar
 
 from bytelang.bytecode.abc import CodeInstruction
 from bytelang.bytecode.abc import ProgramData
 from bytelang.bytecode.abc import Statement
+from bytelang.content.impl.environments import Environment
 from bytelang.core.handlers.errors import ErrorHandler
 from bytelang.core.parsers.abc import Parser
 from bytelang.core.results.compile.abc import CompileResult
+from bytelang.tools.hexview import HexView
 from bytelang.tools.reprtool import ReprTool
 from bytelang.tools.string import StringBuilder
 from bytelang.utils import LogFlag
@@ -23,9 +26,42 @@ class CompileResultOK(CompileResult):
     program_size: int
     compilation_time_seconds: float
 
+    BYTECODE_VIEW_LIMIT: ClassVar[int] = 4096
+    """Предел байт в представлении байт-кода"""
+
     def isOK(self) -> bool:
         return True
 
+    def getByteCodeView(self) -> HexView:
+        """Постраничное представление начала байт-кода (не более BYTECODE_VIEW_LIMIT байт) с комментариями"""
+        limit = self.BYTECODE_VIEW_LIMIT
+        profile = self.program_data.environment.profile
+        head = bytearray(profile.pointer_heap.write(self.program_data.start_address))
+        comments = dict[int, list[object]]()
+
+        def add(address: int, comment: object) -> None:
+            if address < limit:
+                comments.setdefault(address, list()).append(comment)
+
+        add(0, "program start address define")
+
+        for var in self.program_data.variables:
+            head += var.value
+            add(var.address, var)
+
+        for address, mark in self.program_data.marks.items():
+            add(address, f"{mark}:")
+
+        # Инструкции идут по возрастанию адресов - кодируются только попадающие в представление
+        for ins in self.instructions:
+            if ins.address >= limit:
+                break
+
+            head += ins.write(profile.instruction_index)
+            add(ins.address, ins)
+
+        return HexView(bytes(head[:limit]), comments, Parser.COMMENT, self.program_size)
+
     def getMessage(self) -> str:
         sb = StringBuilder()
         env = self.program_data.environment
@@ -59,33 +95,97 @@ class CompileResultOK(CompileResult):
 
         return sb.toString()
 
-    @staticmethod
-    def __writeComment(sb: StringBuilder, message: object) -> None:
-        sb.append(f"\n{Parser.COMMENT}  {message}")
-
     def __writeByteCode(self, sb: StringBuilder) -> None:
-        ins_by_addr = {ins.address: ins for ins in self.instructions}
-        var_by_addr = {var.address: var for var in self.program_data.variables}
+        sb.append(ReprTool.title(f"bytecode view : {getattr(self.bytecode_stream, 'name', '')}"))
+        sb.append(self.getByteCodeView().render(self.BYTECODE_VIEW_LIMIT))
 
-        sb.append(ReprTool.title(f"bytecode view : {self.bytecode_stream.name}"))
-        self.bytecode_stream.close()
 
-        with open(self.bytecode_stream.name, "rb") as bytecode_view:
-            bytecode_view_read = bytecode_view.read()
-            for address, byte in enumerate(bytecode_view_read):
-                if address == 0:
-                    self.__writeComment(sb, "program start address define")
+@dataclass(frozen=True, repr=False)
+class CompileResultEmitted(CompileResult):
+    """
+    Результат записи байт-кода без хранения промежуточного кода (прямая запись или потоковая компиляция).
+    Выражения и байт-код доступны только для сохранённого начала программы, переменных и констант при прямой записи нет
+    """
 
-                if (var := var_by_addr.get(address)) is not None:
-                    self.__writeComment(sb, var)
+    flags: LogFlag
+
+    environment: Environment
+    instructions_count: int
+    program_size: int
+    compilation_time_seconds: float
+    backpatches_count: int = 0
+    bytecode: bytes = b""
+    """Начало записанного байт-кода (не более BYTECODE_VIEW_LIMIT байт, только с флагами BYTECODE или STATEMENTS)"""
+    calls: tuple[tuple[int, str], ...] = ()
+    """Адреса и вызовы инструкций в сохранённом начале байт-кода"""
 
-                if (mark := self.program_data.marks.get(address)) is not None:
-                    self.__writeComment(sb, f"{mark}:")
+    BYTECODE_VIEW_LIMIT: ClassVar[int] = CompileResultOK.BYTECODE_VIEW_LIMIT
+    """Предел байт сохраняемого начала байт-кода"""
 
-                if (ins := ins_by_addr.get(address)) is not None:
-                    self.__writeComment(sb, ins)
+    def isOK(self) -> bool:
+        return True
+
+    def getByteCodeView(self) -> HexView:
+        """Постраничное представление сохранённого начала байт-кода"""
+        comments = dict[int, list[object]]({0: ["program start address define"]})
+
+        for address, call in self.calls:
+            comments.setdefault(address, list()).append(call)
+
+        return HexView(self.bytecode, comments, Parser.COMMENT, self.program_size)
+
+    def getMessage(self) -> str:
+        sb = StringBuilder()
+        env = self.environment
+
+        if LogFlag.ENVIRONMENT_INSTRUCTIONS in self.flags:
+            sb.append(ReprTool.headed(f"instructions : {env.name}", env.instructions.values()))
+
+        if LogFlag.PROFILE in self.flags:
+            sb.append(ReprTool.title(f"profile : {env.profile.name}")).append(ReprTool.strDict(env.profile.__dict__, _repr=True))
 
-                sb.append(f"{address:04X}: {byte:02X}")
+        if LogFlag.STATEMENTS in self.flags:
+            sb.append(ReprTool.headed(f"statements : first {len(self.calls)} of {self.instructions_count}", (f"{address:04X}  {call}" for address, call in self.calls)))
+
+        if LogFlag.CONSTANTS in self.flags:
+            sb.append(ReprTool.title("constants : none"))
+
+        if LogFlag.VARIABLES in self.flags:
+            sb.append(ReprTool.title("variables : none"))
+
+        if LogFlag.CODE_INSTRUCTIONS in self.flags:
+            sb.append(ReprTool.title(f"Instructions : {self.instructions_count}"))
+            sb.append(ReprTool.title(f"Backpatches : {self.backpatches_count}"))
+
+        if LogFlag.BYTECODE in self.flags:
+            # Поток при экспорте - временный файл, имя которого не совпадает с итоговым
+            sb.append(ReprTool.title("bytecode view"))
+            sb.append(self.getByteCodeView().render(self.BYTECODE_VIEW_LIMIT))
+
+        if LogFlag.PROGRAM_SIZE in self.flags:
+            sb.append(ReprTool.title(f"Program Size : {self.program_size} Bytes"))
+
+        if LogFlag.COMPILATION_TIME in self.flags:
+            sb.append(ReprTool.title(f"Compilation Time : {self.compilation_time_seconds:.02} seconds"))
+
+        return sb.toString()
+
+
+@dataclass(frozen=True, repr=False)
+class CompileResultIncremental(CompileResultEmitted):
+    """Результат инкрементальной компиляции"""
+
+    chunks_total: int = 0
+    chunks_compiled: int = 0
+
+    def getMessage(self) -> str:
+        sb = StringBuilder()
+        sb.write(super().getMessage())
+
+        if LogFlag.CODE_INSTRUCTIONS in self.flags:
+            sb.append(ReprTool.title(f"Chunks : {self.chunks_compiled} compiled / {self.chunks_total} total"))
+
+        return sb.toString()
 
 
 @dataclass(frozen=True, repr=False)
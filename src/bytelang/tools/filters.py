@@ -8,4 +8,4 @@ class Filter:
 
     @staticmethod
     def notNone[T](i: Iterable[Optional[T]]) -> Iterable[T]:
-        return filter(None.__ne__, i)
+        return (x for x in i if x is not None)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import ClassVar
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+
+
+class HexView:
+    """
+    Шестнадцатеричное представление байт-кода по строкам.
+    Строки формируются лениво, по запросу страницы или диапазона
+    """
+
+    ROW_SIZE: ClassVar[int] = 16
+    """Байт в строке"""
+
+    PAGE_ROWS: ClassVar[int] = 64
+    """Строк байт на странице"""
+
+    def __init__(self, data: bytes, comments: Mapping[int, Sequence[object]] = None, comment_prefix: str = "#", size: Optional[int] = None) -> None:
+        """
+        :param data: Байт-код
+        :param comments: Комментарии по адресам - выводятся перед строкой, содержащей адрес (в строку приводятся при выводе)
+        :param comment_prefix: Начало комментария
+        :param size: Полный размер байт-кода, если data - только его начало. None - размер data
+        """
+        self.__data = data
+        self.__size = len(data) if size is None else size
+        self.__comments = dict() if comments is None else comments
+        self.__comment_addresses = sorted(self.__comments.keys())
+        self.__comment_prefix = comment_prefix
+
+    def getSize(self) -> int:
+        """Размер байт-кода"""
+        return self.__size
+
+    def getRowsCount(self) -> int:
+        """Количество строк байт (доступных для вывода)"""
+        return -(-len(self.__data) // self.ROW_SIZE)
+
+    def getPagesCount(self) -> int:
+        """Количество страниц"""
+        return -(-self.getRowsCount() // self.PAGE_ROWS)
+
+    def getPage(self, index: int) -> str:
+        """Страница представления"""
+        if not 0 <= index < max(self.getPagesCount(), 1):
+            raise IndexError(index)
+
+        return "\n".join(self.iterLines(index * self.PAGE_ROWS, (index + 1) * self.PAGE_ROWS))
+
+    def iterLines(self, begin_row: int = 0, end_row: Optional[int] = None) -> Iterator[str]:
+        """Строки представления диапазона строк байт вместе с комментариями"""
+        rows_count = self.getRowsCount()
+        end_row = rows_count if end_row is None else min(end_row, rows_count)
+
+        begin = begin_row * self.ROW_SIZE
+        comment_index = bisect_left(self.__comment_addresses, begin)
+
+        for address in range(begin, end_row * self.ROW_SIZE, self.ROW_SIZE):
+            row_end = address + self.ROW_SIZE
+
+            while comment_index < len(self.__comment_addresses) and self.__comment_addresses[comment_index] < row_end:
+                comment_address = self.__comment_addresses[comment_index]
+
+                for comment in self.__comments[comment_address]:
+                    yield f"{self.__comment_prefix} {comment_address:04X}  {comment}"
+
+                comment_index += 1
+
+            yield f"{address:04X}: {self.__data[address:row_end].hex(' ').upper()}"
+
+    def render(self, max_bytes: int) -> str:
+        """Начало представления размером не более max_bytes байт кода"""
+        rows = -(-min(max_bytes, len(self.__data)) // self.ROW_SIZE)
+        lines = list(self.iterLines(0, rows))
+        rest = self.__size - rows * self.ROW_SIZE
+
+        if rest > 0:
+            pages_total = -(-self.__size // (self.ROW_SIZE * self.PAGE_ROWS))
+            lines.append(f"{self.__comment_prefix} ... {rest} bytes more ({pages_total} pages total)")
+
+        return "\n".join(lines)
@@ -0,0 +1,30 @@
+"""Пул процессов с общим объектом, переданным каждому процессу при запуске"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_worker_state: object = None
+"""Объект процесса пула"""
+
+
+def makeWorkerPool(state: object, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Создать пул процессов, каждый из которых получает копию state
+    :param state: Объект, доступный заданиям через getWorkerState (передаётся через pickle один раз на процесс)
+    :param max_workers: Число процессов. None - по числу процессоров
+    """
+    return ProcessPoolExecutor(max_workers, initializer=_initWorker, initargs=(state,))
+
+
+def getWorkerState[T](state_type: type[T]) -> T:
+    """Объект процесса пула (вызывается из задания)"""
+    if not isinstance(_worker_state, state_type):
+        raise ValueError(f"Процесс пула не получил {state_type.__name__}")
+
+    return _worker_state
+
+
+def _initWorker(state: object) -> None:
+    global _worker_state
+    _worker_state = state
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 from abc import ABC
 from abc import abstractmethod
+from typing import Callable
+from typing import ClassVar
+from typing import Optional
 
+import numpy as np
 from dearpygui import dearpygui as dpg
 
+from figure.lod import LineDecimator
+from figure.scheduler import UpdateScheduler
 from gen.vertex import Vec2i
+from gen.vertex import VertexGenerator
 from gen.vertex import Vertices
 from ui.widgets.abc import ItemID
 from ui.widgets.dpg.impl import Axis
@@ -18,16 +25,14 @@ class Figure(LineSeries, ABC):
 
     def __init__(self, vertices: Vertices, label: str, size: Vec2i = (0, 0)) -> None:
         super().__init__(label)
-        x, y = vertices
-        self._source_vertices_x = tuple(x)
-        self._source_vertices_y = tuple(y)
+        self._source_vertices_x, self._source_vertices_y = VertexGenerator.asArrays(vertices)
         self.__size = size
+        self.__canvas: Optional[Canvas] = None
+        self.__transformed_vertices: Optional[Vertices] = None
 
     def setVertices(self, new_vertices: Vertices) -> None:
         """Задать значения вершин"""
-        x, y = new_vertices
-        self._source_vertices_x = tuple(x)
-        self._source_vertices_y = tuple(y)
+        self._source_vertices_x, self._source_vertices_y = VertexGenerator.asArrays(new_vertices)
 
     @abstractmethod
     def getTransformedVertices(self) -> Vertices:
@@ -46,20 +51,107 @@ class Figure(LineSeries, ABC):
         self.__size = size
 
     def update(self) -> None:
-        """Обновить показания на холсте"""
-        self.setValue(self.getTransformedVertices())
+        """Обновить показания на холсте (на холсте - в ближайшем кадре)"""
+        if self.__canvas is None:
+            self.updateNow()
+            return
+
+        self.__canvas.scheduler.markDirty(self)
+
+    def updateNow(self) -> None:
+        """Пересчитать и показать фигуру немедленно"""
+        self.applyUpdate(self.prepareUpdate()())
+
+    def prepareUpdate(self) -> Callable[[], Vertices]:
+        """
+        Снять параметры фигуры (в главном потоке) и вернуть пересчёт вершин.
+        Пересчёт тяжёлой фигуры выполняется в фоновом потоке - он не должен обращаться к виджетам
+        """
+        vertices = self.getTransformedVertices()
+        return lambda: vertices
+
+    def isHeavy(self) -> bool:
+        """Пересчитывать фигуру в фоновом потоке"""
+        return False
+
+    def applyUpdate(self, transformed_vertices: Vertices) -> None:
+        """Показать пересчитанные вершины"""
+        self.__transformed_vertices = transformed_vertices
+        self.updateLevelOfDetail()
+
+    def updateLevelOfDetail(self) -> None:
+        """Заново прорезать отображаемые вершины под текущий масштаб холста (без пересчёта трансформации)"""
+        if self.__transformed_vertices is None:
+            return
+
+        if self.__canvas is None:
+            self.setValue(self.__transformed_vertices)
+            return
+
+        self.setValue(self.__canvas.decimate(*self.__transformed_vertices))
+
+    def setCanvas(self, canvas: Canvas) -> None:
+        """Закрепить фигуру за холстом (до attachIntoCanvas)"""
+        self.__canvas = canvas
 
 
 class Canvas(Plot):
 
-    def __init__(self) -> None:
+    DEFAULT_UNITS_PER_PIXEL: ClassVar[float] = 0.0
+    """Масштаб до первой отрисовки холста (без прореживания)"""
+
+    def __init__(self, decimator: LineDecimator = None, scheduler: UpdateScheduler = None) -> None:
         super().__init__()
         self.axis = Axis(dpg.mvXAxis)
+        self.scheduler = UpdateScheduler() if scheduler is None else scheduler
+        """Планировщик обновлений фигур холста"""
+        self._decimator = LineDecimator() if decimator is None else decimator
+        self._units_per_pixel = self.DEFAULT_UNITS_PER_PIXEL
+        self._figures = list[Figure]()
 
     def placeRaw(self, parent_id: ItemID) -> None:
         super().placeRaw(parent_id)
         self.add(self.axis)
 
+        with dpg.item_handler_registry() as handlers:
+            dpg.add_item_visible_handler(callback=lambda: self._onFrame())
+
+        dpg.bind_item_handler_registry(self.getItemID(), handlers)
+
     def addFigure(self, figure: Figure) -> None:
         """Добавить фигуру"""
+        self._figures.append(figure)
+        figure.setCanvas(self)
         figure.attachIntoCanvas(self)
+
+    def decimate(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Прорезать вершины под масштаб последнего кадра"""
+        return self._decimator.run(np.asarray(x), np.asarray(y), self._units_per_pixel)
+
+    def getUnitsPerPixel(self) -> float:
+        """Единиц холста в пикселе экрана (0 - холст ещё не отрисован)"""
+        width, _ = dpg.get_item_rect_size(self.getItemID())
+        x_min, x_max = dpg.get_axis_limits(self.axis.getItemID())
+
+        if width <= 0 or x_max <= x_min:
+            return self.DEFAULT_UNITS_PER_PIXEL
+
+        return (x_max - x_min) / width
+
+    def setUnitsPerPixel(self, units_per_pixel: float) -> None:
+        """Установить масштаб и заново прорезать фигуры"""
+        self._units_per_pixel = units_per_pixel
+        self._figures = [f for f in self._figures if dpg.does_item_exist(f.getItemID())]
+
+        for figure in self._figures:
+            figure.updateLevelOfDetail()
+
+    def _onFrame(self) -> None:
+        self.scheduler.flush()
+        units_per_pixel = self.getUnitsPerPixel()
+        ratio = self._decimator.settings.zoom_refresh_ratio
+
+        if self._units_per_pixel / ratio <= units_per_pixel <= self._units_per_pixel * ratio:
+            return
+
+        self.setUnitsPerPixel(units_per_pixel)
@@ -0,0 +1,74 @@
+"""Кэш исходной геометрии фигур"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+from typing import Hashable
+
+from gen.vertex import VertexArrays
+from gen.vertex import VertexGenerator
+from gen.vertex import Vertices
+
+
+@dataclass
+class GeometryCacheStats:
+    """Счётчики обращений к кэшу"""
+
+    hits: int = 0
+    """Геометрия взята из кэша"""
+
+    misses: int = 0
+    """Геометрия сгенерирована заново"""
+
+    def __add__(self, other: GeometryCacheStats) -> GeometryCacheStats:
+        return GeometryCacheStats(self.hits + other.hits, self.misses + other.misses)
+
+    def __str__(self) -> str:
+        total = self.hits + self.misses
+        ratio = self.hits / total * 100 if total else 0
+        return f"hits: {self.hits} misses: {self.misses} ({ratio:.1f}% hits)"
+
+
+class GeometryCache:
+    """
+    LRU кэш вершин, ключом служат параметры, влияющие на геометрию.
+    Возвращаемые массивы доступны только для чтения.
+    Кэш доступен из фонового потока пересчёта: генерация выполняется вне блокировки
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.__capacity = capacity
+        self.__entries = OrderedDict[Hashable, VertexArrays]()
+        self.__lock = Lock()
+        self.stats = GeometryCacheStats()
+
+    def get(self, key: Hashable, generate: Callable[[], Vertices]) -> VertexArrays:
+        """Получить геометрию по ключу, при промахе сгенерировать"""
+        with self.__lock:
+            if (ret := self.__entries.get(key)) is not None:
+                self.__entries.move_to_end(key)
+                self.stats.hits += 1
+                return ret
+
+            self.stats.misses += 1
+
+        ret = VertexGenerator.asArrays(generate())
+
+        for array in ret:
+            array.flags.writeable = False
+
+        with self.__lock:
+            self.__entries[key] = ret
+
+            if len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+
+        return ret
+
+    def clear(self) -> None:
+        """Сбросить кэш"""
+        with self.__lock:
+            self.__entries.clear()
@@ -2,7 +2,11 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from typing import Callable
+from typing import ClassVar
+from typing import Hashable
 
+from figure.cache import GeometryCache
+from figure.cache import GeometryCacheStats
 from figure.impl.transformable import TransformableFigure
 from gen.vertex import VertexGenerator
 from gen.vertex import Vertices
@@ -12,10 +16,14 @@ from ui.widgets.dpg.impl import InputInt
 
 
 class GenerativeFigure[T: "GenerativeFigure"](TransformableFigure[T]):
+    GEOMETRY_CACHE_SIZE: ClassVar[int] = 8
+    """Сколько вариантов геометрии хранить в кэше фигуры"""
 
     def __init__(self, label: str, on_delete: Callable[[TransformableFigure], None], on_clone: Callable[[TransformableFigure], None]) -> None:
         super().__init__((tuple(), tuple()), label, on_delete, on_clone)
 
+        self._geometry_cache = GeometryCache(self.GEOMETRY_CACHE_SIZE)
+
         self._resolution_input = InputInt(
             "Разрешение",
             value_range=VertexGenerator.RESOLUTION_RANGE.asTuple(),
@@ -41,14 +49,32 @@ class GenerativeFigure[T: "GenerativeFigure"](TransformableFigure[T]):
         """Установить разрешение"""
         self._resolution_input.setValue(new_resolution)
 
+    def getGeometryCacheStats(self) -> GeometryCacheStats:
+        """Получить счётчики кэша геометрии"""
+        return self._geometry_cache.stats
+
     @abstractmethod
     def _generateVertices(self) -> Vertices:
         """Сгенерировать фигуру"""
 
+    def _makeGenerator(self) -> Callable[[], Vertices]:
+        """Генератор с параметрами, снятыми с виджетов сейчас (для пересчёта в фоновом потоке)"""
+        return self._generateVertices
+
+    def _getGeometryKey(self) -> Hashable:
+        """Параметры, от которых зависит геометрия фигуры (до масштаба, поворота и перемещения)"""
+        return self.getResolution(),
+
     def getTransformedVertices(self) -> Vertices:
-        self.setVertices(self._generateVertices())
+        self.setVertices(self._geometry_cache.get(self._getGeometryKey(), self._generateVertices))
         return super().getTransformedVertices()
 
+    def prepareUpdate(self) -> Callable[[], Vertices]:
+        key = self._getGeometryKey()
+        generate = self._makeGenerator()
+        transform = self.getTransform()
+        return lambda: transform.apply(self._geometry_cache.get(key, generate))
+
 
 class RectFigure(GenerativeFigure["RectFigure"]):
 
@@ -85,6 +111,9 @@ class CircleFigure(GenerativeFigure):
     def _generateVertices(self) -> Vertices:
         return VertexGenerator.circle(self.getAngle(), self.getResolution())
 
+    def _getGeometryKey(self) -> Hashable:
+        return *super()._getGeometryKey(), self.getAngle()
+
     def transformClone(self, clone: CircleFigure) -> TransformableFigure:
         clone.setAngle(self.getAngle())
         return super().transformClone(clone)
@@ -118,6 +147,9 @@ class SpiralFigure(GenerativeFigure):
     def _generateVertices(self) -> Vertices:
         return VertexGenerator.spiral(self.getResolution(), self._repeats_count.getValue())
 
+    def _getGeometryKey(self) -> Hashable:
+        return *super()._getGeometryKey(), self.getRepeatsCount()
+
     def placeRaw(self, parent_id: ItemID) -> None:
         super().placeRaw(parent_id)
         self._header.add(self._repeats_count)
@@ -140,6 +172,9 @@ class PolygonFigure(GenerativeFigure):
     def _generateVertices(self) -> Vertices:
         return VertexGenerator.nGon(self.getVertexCount(), self.getResolution())
 
+    def _getGeometryKey(self) -> Hashable:
+        return *super()._getGeometryKey(), self.getVertexCount()
+
     def getVertexCount(self) -> int:
         """Получить количество вершин полигона"""
         return self._vertex_count.getValue()
@@ -161,6 +196,9 @@ class LineFigure(GenerativeFigure):
     def _generateVertices(self) -> Vertices:
         return VertexGenerator.lineSimple()
 
+    def _getGeometryKey(self) -> Hashable:
+        return ()
+
 # class TestDFX(GenerativeFigure):
 #     pass
 # __V: ClassVar = (
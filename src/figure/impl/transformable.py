@@ -2,19 +2,22 @@
 
 from __future__ import annotations
 
-import math
 from abc import abstractmethod
 from typing import Callable
 from typing import ClassVar
 from typing import Iterable
 from typing import Optional
+from typing import Sequence
+
+import numpy as np
 
 from figure.abc import Canvas
 from figure.abc import Figure
+from figure.transform import FigureTransform
 from gen.trajectory import Trajectory
 from gen.vertex import Vec2f
 from gen.vertex import Vec2i
-from gen.vertex import VertexGenerator
+from gen.vertex import VertexArrays
 from gen.vertex import Vertices
 from ui.color import Color
 from ui.widgets.abc import ItemID
@@ -33,6 +36,9 @@ class TransformableFigure[T: "TransformableFigure"](Figure):
     INPUT_WIDTH: ClassVar[int] = 200
     DEFAULT_SIZE: ClassVar[Vec2i] = (100, 100)
 
+    HEAVY_VERTEX_COUNT: ClassVar[int] = 50_000
+    """Начиная с этого числа вершин фигура пересчитывается в фоновом потоке"""
+
     COLORS: ClassVar[int, Color] = {
         0: Color(0xFF, 0, 0, 0x80),
         1: Color(0xFF, 0x80, 0x20),
@@ -91,10 +97,6 @@ class TransformableFigure[T: "TransformableFigure"](Figure):
             value_range=(-10000, 10000)
         )
 
-        self.__sin_angle: float = 0
-        self.__cos_angle: float = 0
-        self.__calcRotation(0)
-
     def _getToolColor(self) -> Color:
         return self.COLORS.get(self._tool_id_input.getValue(), 0)
 
@@ -109,11 +111,6 @@ class TransformableFigure[T: "TransformableFigure"](Figure):
     def _setColor(self, color: Color, has_points: bool) -> None:
         self.setTheme(LineSeriesTheme.getInstance().get(color, has_dots=has_points))
 
-    def __calcRotation(self, angle_degrees: float) -> None:
-        angle_radians = math.radians(angle_degrees)
-        self.__sin_angle = math.sin(angle_radians)
-        self.__cos_angle = math.cos(angle_radians)
-
     def getPosition(self) -> Vec2f:
         """Получить текущую позицию"""
         return self._position_point.getValue()
@@ -136,47 +133,40 @@ class TransformableFigure[T: "TransformableFigure"](Figure):
             return
 
         x, y = self.getTransformedVertices()
+        return self._makeTrajectory(self._name, x, y)
+
+    def toTrajectories(self) -> Sequence[Trajectory]:
+        """Конвертировать фигуру в траектории (фигура может состоять из нескольких штрихов)"""
+        trajectory = self.toTrajectory()
+        return () if trajectory is None else (trajectory,)
+
+    def _makeTrajectory(self, name: str, x: np.ndarray, y: np.ndarray) -> Trajectory:
         return Trajectory(
-            name=self._name,
+            name=name,
             x_positions=x,
             y_positions=y,
             tool=self._tool_id_input.getValue(),
             planner_mode=self._planner_mode_input.getValue()
         )
 
-    def _getTransformedVertices(self, in_v: tuple[Iterable[float], Iterable[float]]):
-        transformed_x = list[int]()
-        transformed_y = list[int]()
-
-        size_x, size_y = self.getSize()
-        position_x, position_y = self.getPosition()
-
-        sin_angle = self.__sin_angle
-        cos_angle = self.__cos_angle
-
-        for x, y in zip(*in_v):
-            x *= size_x
-            y *= size_y
-
-            new_x = int(cos_angle * x - sin_angle * y + position_x)
-            new_y = int(sin_angle * x + cos_angle * y + position_y)
-
-            if len(transformed_x) > 0 and (new_x == transformed_x[-1]) and (new_y == transformed_y[-1]):
-                continue
-
-            transformed_x.append(new_x)
-            transformed_y.append(new_y)
+    def getTransform(self) -> FigureTransform:
+        """Получить текущую трансформацию фигуры"""
+        return FigureTransform(size=self.getSize(), position=self.getPosition(), rotation=self.getRotation(), inflate=self.getInflate())
 
-        return transformed_x, transformed_y
+    def getTransformedVertices(self) -> tuple[np.ndarray, np.ndarray]:
+        return self._applyTransform((self._source_vertices_x, self._source_vertices_y))
 
-    def getTransformedVertices(self) -> tuple[Iterable[int], Iterable[int]]:
-        v = self._source_vertices_x, self._source_vertices_y
+    def prepareUpdate(self) -> Callable[[], tuple[np.ndarray, np.ndarray]]:
+        transform = self.getTransform()
+        source = self._source_vertices_x, self._source_vertices_y
+        return lambda: transform.apply(source)
 
-        inflate = self.getInflate()
-        if inflate != 0:
-            v = VertexGenerator.inflate(v, inflate)
+    def isHeavy(self) -> bool:
+        return len(self._source_vertices_x) >= self.HEAVY_VERTEX_COUNT
 
-        return self._getTransformedVertices(v)
+    def _applyTransform(self, v: VertexArrays) -> tuple[np.ndarray, np.ndarray]:
+        """Вздуть и трансформировать вершины в координаты холста"""
+        return self.getTransform().apply(v)
 
     def getInflate(self) -> float:
         return self._inflate_input.getValue()
@@ -278,14 +268,12 @@ class TransformableFigure[T: "TransformableFigure"](Figure):
         self._input_scale.setValue(size)
         self.update()
 
-    def __onRotationInputChanged(self, new_angle: int) -> None:
-        self.__calcRotation(new_angle)
+    def __onRotationInputChanged(self, _: int) -> None:
         self.update()
 
     def setRotation(self, angle_degrees: int) -> None:
         """Установить поворот"""
         self._rotation_input.setValue(angle_degrees)
-        self.__calcRotation(angle_degrees)
         self.update()
 
     def __onSetControlsVisibleChanged(self, is_visible: bool) -> None:
@@ -0,0 +1,68 @@
+"""Уровень детализации отображаемых ломаных"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, kw_only=True)
+class LevelOfDetail:
+    """Настройки прореживания вершин при отображении"""
+
+    tolerance_px: float = 0.75
+    """Допустимое отклонение от исходной ломаной на экране (пиксели)"""
+    min_vertices: int = 2048
+    """Ломаные с меньшим числом вершин отображаются без прореживания"""
+    zoom_refresh_ratio: float = 1.5
+    """Во сколько раз должен измениться масштаб холста, чтобы фигуры были прорежены заново"""
+
+
+class LineDecimator:
+    """
+    Прореживание ломаной для отображения при заданном масштабе.
+    Ломаные здесь двумерные (x не монотонен), поэтому вместо min/max по столбцам пикселей
+    используется сетка с шагом в допуск: из серии подряд идущих вершин в одной ячейке остаётся первая,
+    возвраты в ячейку, пройденную двумя вершинами ранее, через соседнюю ячейку отбрасываются.
+    Отклонение от исходной ломаной - не более двух ячеек
+    Экспорт использует исходные вершины - прореживание влияет только на изображение
+    """
+
+    def __init__(self, settings: LevelOfDetail = LevelOfDetail()) -> None:
+        self.settings = settings
+
+    def run(self, x: np.ndarray, y: np.ndarray, units_per_pixel: float) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Прорезать ломаную
+        :param x: Координаты X
+        :param y: Координаты Y
+        :param units_per_pixel: Единиц холста в пикселе экрана. 0 - масштаб неизвестен (без прореживания)
+        :return: Прореженные координаты (первая и последняя вершины сохраняются)
+        """
+        if len(x) < self.settings.min_vertices or units_per_pixel <= 0:
+            return x, y
+
+        inverse_cell = np.float32(1 / (units_per_pixel * self.settings.tolerance_px))
+
+        # float32 достаточно: номер ячейки нужен только для сравнения с соседом
+        cell_x = np.multiply(x, inverse_cell, dtype=np.float32)
+        cell_y = np.multiply(y, inverse_cell, dtype=np.float32)
+        np.floor(cell_x, out=cell_x)
+        np.floor(cell_y, out=cell_y)
+
+        changed = (cell_x[1:] != cell_x[:-1]) | (cell_y[1:] != cell_y[:-1])
+        returned = (cell_x[2:] == cell_x[:-2]) & (cell_y[2:] == cell_y[:-2])
+        # Возврат отбрасывается, только если промежуточная ячейка соседняя - иначе пропал бы выброс
+        returned &= np.abs(cell_x[1:-1] - cell_x[:-2]) <= 1
+        returned &= np.abs(cell_y[1:-1] - cell_y[:-2]) <= 1
+
+        keep = np.empty(len(x), dtype=np.bool_)
+        keep[0] = keep[-1] = True
+        # Колебание между соседними ячейками (A-B-A) на экране не видно - вершина возврата не сохраняется
+        np.logical_and(changed[1:], ~returned, out=keep[2:])
+        keep[1] = changed[0]
+        keep[-1] = True
+
+        # Индексы вместо булевой маски: выборка по неравномерной маске заметно медленнее
+        index = np.flatnonzero(keep)
+        return x.take(index), y.take(index)
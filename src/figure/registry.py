@@ -4,7 +4,9 @@ from typing import Iterable
 from typing import Sequence
 
 from figure.abc import Canvas
+from figure.cache import GeometryCacheStats
 from figure.impl.generative import CircleFigure
+from figure.impl.generative import GenerativeFigure
 from figure.impl.generative import LineFigure
 from figure.impl.generative import PolygonFigure
 from figure.impl.generative import RectFigure
@@ -69,6 +71,13 @@ class FigureRegistry:
         """Получить все фигуры"""
         return list(self._figures.values())
 
+    def getGeometryCacheStats(self) -> GeometryCacheStats:
+        """Получить суммарные счётчики кэша геометрии фигур"""
+        return sum(
+            (figure.getGeometryCacheStats() for figure in self.getFigures() if isinstance(figure, GenerativeFigure)),
+            GeometryCacheStats()
+        )
+
     def getTrajectories(self) -> Iterable[Trajectory]:
         """Получить все траектории"""
-        return list(filter(None.__ne__, (figure.toTrajectory() for figure in self.getFigures())))
+        return [trajectory for figure in self.getFigures() for trajectory in figure.toTrajectories()]
@@ -0,0 +1,101 @@
+"""Отложенное обновление фигур на холсте"""
+from __future__ import annotations
+
+import traceback
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+from typing import Callable
+
+from dearpygui import dearpygui as dpg
+
+from gen.vertex import Vertices
+
+if TYPE_CHECKING:
+    from figure.abc import Figure
+
+
+class UpdateScheduler:
+    """
+    Планировщик обновлений: изменения параметров только помечают фигуру, пересчёт выполняется раз за кадр.
+    Тяжёлые фигуры пересчитываются в фоновом потоке, результат подставляется в первом кадре после готовности.
+    Пока фигура считается, новые изменения копятся - следующий пересчёт возьмёт последние параметры.
+    Ошибка пересчёта не прерывает кадр: фигура сохраняет прежнюю геометрию, ошибка передаётся обработчику
+    """
+
+    def __init__(self, max_workers: int = 1, on_error: Callable[[Figure, Exception], None] = None) -> None:
+        """
+        :param max_workers: Число фоновых потоков
+        :param on_error: Обработчик ошибки пересчёта фигуры. None - вывод в stderr
+        """
+        self._on_error = _printError if on_error is None else on_error
+        self._dirty: dict[Figure, None] = dict()
+        self._pending: dict[Figure, Future[Vertices]] = dict()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="figure-update")
+
+    def markDirty(self, figure: Figure) -> None:
+        """Пометить фигуру для пересчёта в ближайшем кадре"""
+        self._dirty[figure] = None
+
+    def isIdle(self) -> bool:
+        """Нет помеченных и считающихся фигур"""
+        return not self._dirty and not self._pending
+
+    def flush(self) -> None:
+        """Подставить готовые результаты и пересчитать помеченные фигуры (вызывается раз за кадр)"""
+        for figure, future in tuple(self._pending.items()):
+            if future.done():
+                del self._pending[figure]
+
+                if self._isAlive(figure):
+                    self._apply(figure, future.result)
+
+        dirty, self._dirty = self._dirty, dict()
+
+        for figure in dirty:
+            if not self._isAlive(figure):
+                continue
+
+            if figure in self._pending:
+                self._dirty[figure] = None
+                continue
+
+            try:
+                compute: Callable[[], Vertices] = figure.prepareUpdate()
+
+            except Exception as e:
+                self._on_error(figure, e)
+                continue
+
+            if figure.isHeavy():
+                self._pending[figure] = self._executor.submit(compute)
+
+            else:
+                self._apply(figure, compute)
+
+    def wait(self) -> None:
+        """Дождаться всех пересчётов (для пакетной обработки без отрисовки)"""
+        while not self.isIdle():
+            for future in tuple(self._pending.values()):
+                future.exception()
+
+            self.flush()
+
+    def shutdown(self) -> None:
+        """Остановить фоновый поток"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _apply(self, figure: Figure, compute: Callable[[], Vertices]) -> None:
+        try:
+            figure.applyUpdate(compute())
+
+        except Exception as e:
+            self._on_error(figure, e)
+
+    @staticmethod
+    def _isAlive(figure: Figure) -> bool:
+        return figure.getItemID() is not None and dpg.does_item_exist(figure.getItemID())
+
+
+def _printError(figure: Figure, e: Exception) -> None:
+    traceback.print_exception(e)
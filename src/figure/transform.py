@@ -0,0 +1,67 @@
+"""Трансформация фигуры в координаты холста"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import ClassVar
+
+import numpy as np
+
+from gen.vertex import Vec2f
+from gen.vertex import Vec2i
+from gen.vertex import VertexArrays
+from gen.vertex import VertexGenerator
+
+
+@dataclass(frozen=True, kw_only=True)
+class FigureTransform:
+    """Вздутие, масштаб, поворот и перенос вершин фигуры"""
+
+    COORDINATE_DTYPE: ClassVar[type] = np.int32
+    """Тип координат трансформированных вершин (int16 холст DearPyGui не принимает)"""
+
+    size: Vec2i = (100, 100)
+    """Масштаб"""
+    position: Vec2f = (0, 0)
+    """Позиция"""
+    rotation: float = 0
+    """Поворот в градусах"""
+    inflate: float = 0
+    """Вздутие"""
+
+    def getMatrix(self) -> np.ndarray:
+        """Аффинная матрица 2x3: масштаб, затем поворот и перенос"""
+        size_x, size_y = self.size
+        position_x, position_y = self.position
+
+        angle_radians = math.radians(self.rotation)
+        sin_angle = math.sin(angle_radians)
+        cos_angle = math.cos(angle_radians)
+
+        return np.array((
+            (cos_angle * size_x, -sin_angle * size_y, position_x),
+            (sin_angle * size_x, cos_angle * size_y, position_y),
+        ))
+
+    def apply(self, v: VertexArrays) -> tuple[np.ndarray, np.ndarray]:
+        """Вздуть и трансформировать вершины в целочисленные координаты, повторяющиеся подряд вершины отбрасываются"""
+        if self.inflate != 0:
+            v = VertexGenerator.inflate(v, self.inflate)
+
+        x, y = v
+
+        if len(x) == 0:
+            return np.empty(0, self.COORDINATE_DTYPE), np.empty(0, self.COORDINATE_DTYPE)
+
+        matrix = self.getMatrix()
+        transformed = matrix[:, :2] @ np.stack((x, y)) + matrix[:, 2:]
+
+        # int() прежней реализации отбрасывал дробную часть - astype делает то же самое
+        transformed_x, transformed_y = transformed.astype(self.COORDINATE_DTYPE)
+
+        keep = np.empty(len(transformed_x), dtype=np.bool_)
+        keep[0] = True
+        keep[1:] = (np.diff(transformed_x) != 0) | (np.diff(transformed_y) != 0)
+
+        return transformed_x[keep], transformed_y[keep]
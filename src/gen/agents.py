@@ -1,24 +1,28 @@
+from abc import ABC
+from abc import abstractmethod
 from dataclasses import dataclass
 from math import hypot
+from typing import Callable
+from typing import ClassVar
 from typing import Optional
 from typing import TextIO
 
+from bytelang.bytecode.impl.emitter import ByteCodeEmitter
 from gen.enums import MarkerTool
 from gen.enums import PlannerMode
 from gen.movementprofile import MovementProfile
 from gen.settings import GeneratorSettings
 
 
-@dataclass(frozen=True)
-class LowLevelAgent:
+class LowLevelAgent(ABC):
     """Низкоуровневый агент"""
 
-    _stream: TextIO
-    """Используемый поток для вывода"""
+    ENVIRONMENT: ClassVar[str] = "vart_esp32"
+    """Окружение bytelang, инструкции которого вызывает агент"""
 
     def prelude(self) -> None:
         """Записать прелюдию"""
-        self._write(".env vart_esp32")
+        self._write(f".env {self.ENVIRONMENT}")
 
     def comment(self, message: str) -> None:
         """Добавить информативный коментарий"""
@@ -30,40 +34,73 @@ class LowLevelAgent:
 
     def quit(self) -> None:
         """завершить работу"""
-        self._write("quit")
+        self._call("quit")
 
     def delay_ms(self, ms: int) -> None:
         """Временная задержка"""
-        self._write(f"delay_ms {ms}")
+        self._call("delay_ms", ms)
 
     def set_speed(self, speed: int) -> None:
         """Установить скорость перемещения"""
-        self._write(f"set_speed {speed}")
+        self._call("set_speed", speed)
 
     def set_accel(self, accel: int) -> None:
         """Установить ускорение"""
-        self._write(f"set_accel {accel}")
+        self._call("set_accel", accel)
 
     def set_planner_mode(self, mode: PlannerMode) -> None:
         """Установить режим планировщика"""
-        self._write(f"set_planner_mode {int(mode)}")
+        self._call("set_planner_mode", int(mode))
 
     def set_position(self, x: int, y: int) -> None:
         """Установить (Переместиться) позицию"""
-        self._write(f"set_position {x} {y}")
+        self._call("set_position", x, y)
 
     def set_progress(self, progress: int) -> None:
         """Установить значение прогресса"""
-        self._write(f"set_progress {progress}")
+        self._call("set_progress", progress)
 
     def set_active_tool(self, tool: MarkerTool) -> None:
         """Установить активный инструмент"""
-        self._write(f"set_active_tool {int(tool)}")
+        self._call("set_active_tool", int(tool))
+
+    @abstractmethod
+    def _call(self, instruction: str, *arguments: int) -> None:
+        """Вызов инструкции окружения"""
+
+    @abstractmethod
+    def _write(self, ins: str) -> None:
+        """Строка исходного текста без инструкции (директива, комментарий)"""
+
+
+@dataclass(frozen=True)
+class SourceAgent(LowLevelAgent):
+    """Агент, записывающий исходный текст bytelang"""
+
+    _stream: TextIO
+    """Используемый поток для вывода"""
+
+    def _call(self, instruction: str, *arguments: int) -> None:
+        self._write(" ".join((instruction, *map(str, arguments))))
 
     def _write(self, ins: str) -> None:
         self._stream.write(f"{ins}\n")
 
 
+@dataclass(frozen=True)
+class ByteCodeAgent(LowLevelAgent):
+    """Агент, записывающий байт-код напрямую. Комментарии и заметки пропускаются"""
+
+    _emitter: ByteCodeEmitter
+    """Эмиттер инструкций окружения"""
+
+    def _call(self, instruction: str, *arguments: int) -> None:
+        self._emitter.call(instruction, *arguments)
+
+    def _write(self, ins: str) -> None:
+        pass
+
+
 @dataclass
 class MacroAgent:
     """Макро Агент"""
@@ -77,6 +114,12 @@ class MacroAgent:
     _steps_total: int
     """Общее число шагов"""
 
+    _on_progress: Optional[Callable[[int], None]] = None
+    """Вызывается при изменении прогресса печати (%), исключение прерывает генерацию"""
+
+    _progress_per_trajectory: bool = False
+    """Прогресс печати записывается только между траекториями (updateProgress) - текст траектории не зависит от её места в программе"""
+
     _current_step: int = 0
     """Номер текущего шага"""
 
@@ -130,12 +173,20 @@ class MacroAgent:
         self._current_step += 1
         self._agent.set_position(x, y)
 
+        if not self._progress_per_trajectory:
+            self.updateProgress()
+
+    def updateProgress(self) -> None:
+        """Записать прогресс печати, если он изменился"""
         current_progress = self._current_step * 100 // self._steps_total
         if current_progress != self._last_progress:
             self._last_progress = current_progress
             self._agent.note(f"Progress: {current_progress}")
             self._agent.set_progress(current_progress)
 
+            if self._on_progress is not None:
+                self._on_progress(current_progress)
+
     def epilogue(self) -> None:
         """Сгенерировать эпилог"""
         self._agent.comment("Epilogue - Begin")
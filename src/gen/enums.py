@@ -26,3 +26,19 @@ class PlannerMode(IntEnum):
 
     ACCEL = 0x02
     """2 порядок (Со скоростью и ускорением)"""
+
+
+class SimplificationMethod(IntEnum):
+    """Метод упрощения траекторий"""
+
+    NONE = 0x00
+    """Без упрощения"""
+
+    COLLINEAR = 0x01
+    """Удаление вершин на прямой"""
+
+    RAMER_DOUGLAS_PEUCKER = 0x02
+    """Рамер-Дуглас-Пекер (по отклонению)"""
+
+    VISVALINGAM_WHYATT = 0x03
+    """Висвалингам-Уайатт (по площади)"""
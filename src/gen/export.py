@@ -0,0 +1,107 @@
+"""
+Фоновый экспорт: упрощение, оптимизация маршрута и запись байт-кода выполняются в рабочем потоке.
+Траектории собираются заранее в главном потоке - они читают параметры фигур из интерфейса
+"""
+from __future__ import annotations
+
+from concurrent.futures import CancelledError
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Event
+from typing import Callable
+from typing import Sequence
+
+from bytelang.utils import LogFlag
+from gen.pipeline import ExportPipeline
+from gen.pipeline import ExportResult
+from gen.pipeline import StageTimer
+from gen.trajectory import Trajectory
+from tools import BackgroundTask
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExportReport:
+    """Отчёт фонового экспорта"""
+
+    result: ExportResult
+    """Результат экспорта"""
+    lines: Sequence[str]
+    """Строки журнала (форматируются в рабочем потоке)"""
+
+
+class ExportTask(BackgroundTask):
+    """Экспорт в файл"""
+
+    def __init__(self, output_path: Path, executor: Executor, run: Callable[[ExportTask], ExportReport]) -> None:
+        self.output_path = output_path
+        """Файл байт-кода"""
+        self._cancel_event = Event()
+        self._percent = 0
+        self._future = executor.submit(run, self)
+
+    def getTitle(self) -> str:
+        return f"Экспорт {self.output_path.name}"
+
+    def getProgress(self) -> float:
+        return 1.0 if self._future.done() else self._percent / 100
+
+    def isDone(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        if not self._future.cancel():
+            self._cancel_event.set()
+
+    def getResult(self) -> ExportReport:
+        """
+        Отчёт экспорта
+        :return: Отчёт. CancelledError - экспорт отменён (файл не изменён), OSError - ошибка записи
+        """
+        return self._future.result()
+
+    def onProgress(self, percent: int) -> None:
+        """Прогресс записи (%) из рабочего потока, при запрошенной отмене - CancelledError"""
+        self.check()
+        self._percent = percent
+
+    def check(self) -> None:
+        """Прервать выполнение, если запрошена отмена"""
+        if self._cancel_event.is_set():
+            raise CancelledError(f"{self.getTitle()} отменён")
+
+
+class BackgroundExporter:
+    """Очередь экспорта в рабочем потоке"""
+
+    def __init__(self, pipeline: ExportPipeline) -> None:
+        self._pipeline = pipeline
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="export")
+
+    def submit(self, trajectories: Sequence[Trajectory], output_path: Path, log_flag: LogFlag = LogFlag.ALL, timer: StageTimer = None) -> ExportTask:
+        """
+        Запустить экспорт
+        :param trajectories: Подготовленные траектории
+        :param output_path: Файл байт-кода
+        :param log_flag: Уровень отображения сообщения компиляции
+        :param timer: Замер времени с уже выполненными этапами (сбор траекторий)
+        """
+        timer = StageTimer() if timer is None else timer
+        return ExportTask(output_path, self._executor, lambda task: self._run(task, trajectories, log_flag, timer))
+
+    def shutdown(self) -> None:
+        """Отменить ожидающие задачи (выполняющуюся прерывает ExportTask.cancel)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, task: ExportTask, trajectories: Sequence[Trajectory], log_flag: LogFlag, timer: StageTimer) -> ExportReport:
+        result = self._pipeline.runToFile(trajectories, task.output_path, log_flag, timer, task.onProgress, task.check)
+
+        lines = (
+            str(result.simplification),
+            str(result.route),
+            result.compile_result.getMessage(),
+            str(timer),
+        )
+
+        return ExportReport(result=result, lines=lines)
@@ -0,0 +1,179 @@
+"""Экспорт траекторий: упрощение, оптимизация маршрута и запись байт-кода"""
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from dataclasses import replace
+from pathlib import Path
+from typing import BinaryIO
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Sequence
+
+from bytelang.core.handlers.errors import ErrorHandler
+from bytelang.core.results.compile.abc import CompileResult
+from bytelang.core.results.compile.impl import CompileResultError
+from bytelang.tools.workers import getWorkerState
+from bytelang.tools.workers import makeWorkerPool
+from bytelang.utils import LogFlag
+from gen.route import RouteOptimizer
+from gen.route import RouteResult
+from gen.simplify import SimplificationResult
+from gen.simplify import SimplificationStage
+from gen.simplify import makeSimplifiers
+from gen.trajectory import Trajectory
+from gen.writer import CodeWriter
+
+
+class StageTimer:
+    """Замер времени этапов"""
+
+    def __init__(self) -> None:
+        self.stages = dict[str, float]()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Замерить время этапа"""
+        start = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.stages[name] = self.stages.get(name, 0) + time.perf_counter() - start
+
+    def total(self) -> float:
+        """Суммарное время этапов"""
+        return sum(self.stages.values())
+
+    def __str__(self) -> str:
+        stages = " ".join(f"{name}: {elapsed * 1000:.1f} ms" for name, elapsed in self.stages.items())
+        return f"Stages : {stages} total: {self.total() * 1000:.1f} ms"
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExportResult:
+    """Результат экспорта"""
+
+    simplification: SimplificationResult
+    """Результат упрощения"""
+    route: RouteResult
+    """Результат оптимизации маршрута"""
+    compile_result: CompileResult
+    """Результат записи байт-кода"""
+    timer: StageTimer
+    """Время этапов"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class ExportJob:
+    """Задание пакетного экспорта"""
+
+    trajectories: Sequence[Trajectory]
+    """Подготовленные траектории"""
+    output_path: Path
+    """Файл байт-кода"""
+
+
+class ExportPipeline:
+    """Подготовка траекторий по настройкам генератора и запись байт-кода"""
+
+    def __init__(self, writer: CodeWriter) -> None:
+        self._writer = writer
+
+    def run(self, trajectories: Sequence[Trajectory], bytecode_stream: BinaryIO, log_flag: LogFlag = LogFlag.ALL, timer: Optional[StageTimer] = None, on_progress: Callable[[int], None] = None, check: Callable[[], None] = None) -> ExportResult:
+        """
+        Экспортировать траектории
+        :param trajectories: Траектории в порядке добавления фигур
+        :param bytecode_stream: Поток байт-кода
+        :param log_flag: Уровень отображения сообщения компиляции
+        :param timer: Замер времени, в который добавляются этапы экспорта
+        :param on_progress: Прогресс записи байт-кода (%), исключение прерывает экспорт
+        :param check: Проверка отмены между этапами и внутри упрощения и оптимизации маршрута, исключение прерывает экспорт
+        """
+        settings = self._writer.getSettings()
+        timer = StageTimer() if timer is None else timer
+        check = _noCheck if check is None else check
+
+        check()
+
+        with timer.measure("simplify"):
+            simplification = SimplificationStage(makeSimplifiers(settings.simplification_method, settings.simplification_tolerance)).run(trajectories, check)
+
+        check()
+
+        with timer.measure("route"):
+            route = RouteOptimizer(settings.route_time_budget_ms / 1000).run(simplification.trajectories, settings.epilogue_end_position, check)
+
+        check()
+
+        with timer.measure("bytecode"):
+            write = self._writer.runIncremental if settings.incremental_compile else self._writer.run
+            compile_result = write(route.trajectories, bytecode_stream, log_flag, on_progress)
+
+        return ExportResult(simplification=simplification, route=route, compile_result=compile_result, timer=timer)
+
+    def runMany(self, jobs: Sequence[ExportJob], max_workers: Optional[int] = None, log_flag: LogFlag = LogFlag.ALL) -> list[CompileResult]:
+        """
+        Экспортировать независимые наборы траекторий в файлы в пуле процессов.
+        Каждое задание проходит те же этапы, что и runToFile
+        :param jobs: Задания
+        :param max_workers: Число процессов. None - по числу процессоров
+        :param log_flag: Уровень отображения сообщения компиляции
+        :return: Результаты записи байт-кода в порядке заданий
+        """
+        self._writer.preload()
+
+        with makeWorkerPool(self, max_workers) as executor:
+            return list(executor.map(_runJob, jobs, (log_flag,) * len(jobs)))
+
+    def runToFile(self, trajectories: Sequence[Trajectory], output_path: Path, log_flag: LogFlag = LogFlag.ALL, timer: Optional[StageTimer] = None, on_progress: Callable[[int], None] = None, check: Callable[[], None] = None) -> ExportResult:
+        """
+        Экспортировать траектории в файл.
+        Байт-код пишется напрямую во временный файл рядом с целевым, который заменяет целевой
+        только при успешной записи - ошибка или отмена не оставляют частичный файл
+        :return: Результат экспорта. OSError - ошибка записи файла
+        """
+        timer = StageTimer() if timer is None else timer
+        temp_path = output_path.with_name(f"{output_path.name}.tmp")
+
+        try:
+            with open(temp_path, "wb") as bytecode_stream:
+                result = self.run(trajectories, bytecode_stream, log_flag, timer, on_progress, check)
+
+                if result.compile_result.isOK():
+                    with timer.measure("write"):
+                        bytecode_stream.flush()
+                        os.fsync(bytecode_stream.fileno())
+
+            if not result.compile_result.isOK():
+                temp_path.unlink(missing_ok=True)
+                return result
+
+            os.replace(temp_path, output_path)
+
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        return result
+
+
+def _runJob(job: ExportJob, log_flag: LogFlag) -> CompileResult:
+    try:
+        result = getWorkerState(ExportPipeline).runToFile(job.trajectories, job.output_path, log_flag).compile_result
+
+    except OSError as e:
+        errors_handler = ErrorHandler()
+        errors_handler.write(f"{job.output_path}: {e}")
+        result = CompileResultError(None, None, errors_handler)
+
+    # Закрытые файлы не передаются между процессами
+    return replace(result, source_stream=None, bytecode_stream=None)
+
+
+def _noCheck() -> None:
+    pass
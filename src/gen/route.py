@@ -0,0 +1,285 @@
+"""Оптимизация порядка обхода траекторий"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from math import hypot
+from typing import Callable
+from typing import ClassVar
+from typing import Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from gen.spatial import NearestUnvisitedIndex
+from gen.trajectory import Trajectory
+from gen.vertex import Vec2i
+
+
+@dataclass(frozen=True, kw_only=True)
+class RouteResult:
+    """Результат оптимизации маршрута"""
+
+    trajectories: Sequence[Trajectory]
+    """Траектории в новом порядке"""
+    travel_before: float
+    """Длина холостых перемещений до оптимизации"""
+    travel_after: float
+    """Длина холостых перемещений после оптимизации"""
+    reversed_count: int
+    """Число траекторий, пройденных в обратном направлении"""
+    rotated_count: int
+    """Число замкнутых контуров с изменённой начальной точкой"""
+    elapsed_s: float
+    """Время оптимизации"""
+
+    def __str__(self) -> str:
+        saved = (1 - self.travel_after / self.travel_before) * 100 if self.travel_before else 0
+        return (
+            f"Route : travel {self.travel_before:.0f} -> {self.travel_after:.0f} ({saved:.1f}% saved) "
+            f"reversed: {self.reversed_count} rotated: {self.rotated_count} "
+            f"time: {self.elapsed_s * 1000:.1f} ms"
+        )
+
+
+@dataclass(frozen=True, kw_only=True)
+class _EntryPoints:
+    """Точки входа всех траекторий, собранные одним проходом"""
+
+    points: np.ndarray
+    """Координаты точек входа (N, 2)"""
+    exits: np.ndarray
+    """Координаты выхода траектории при входе через точку (N, 2)"""
+    owners: np.ndarray
+    """Номер траектории точки"""
+    entries: np.ndarray
+    """Вершина входа (-1 - вход с конца открытой траектории)"""
+    offsets: np.ndarray
+    """Начало точек каждой траектории (первая точка - вход без разворота и поворота)"""
+    first: np.ndarray
+    """Первые вершины траекторий (M, 2)"""
+    last: np.ndarray
+    """Последние вершины траекторий (M, 2)"""
+
+
+class RouteOptimizer:
+    """
+    Минимизация холостых перемещений между траекториями.
+    Начальный порядок строится жадно (ближайший доступный вход, для замкнутых контуров - любая вершина),
+    затем улучшается 2-opt: разворот участка маршрута вместе с направлением траекторий.
+    Кандидаты 2-opt - ближайшие по KD-дереву концы траекторий.
+    Бюджет времени отсчитывается от вызова run и проверяется в обоих этапах поиска.
+    Его могут превысить только непрерываемые шаги: построение KD-дерева точек входа (O(n log n))
+    и сборка траекторий результата (разворот и поворот выбранных, O(n))
+    """
+
+    NEIGHBOURS: ClassVar[int] = 8
+    """Число кандидатов 2-opt для каждой позиции"""
+
+    DEADLINE_CHECK_PERIOD: ClassVar[int] = 64
+    """Период проверки бюджета времени и отмены (в позициях маршрута)"""
+
+    MIN_GAIN: ClassVar[float] = 1e-9
+    """Минимальное сокращение пути, при котором разворот применяется"""
+
+    def __init__(self, time_budget_s: float = 0.5) -> None:
+        """
+        :param time_budget_s: Бюджет времени на оптимизацию. 0 - траектории возвращаются в исходном порядке без изменений
+        """
+        self.time_budget_s = time_budget_s
+
+    @staticmethod
+    def travelDistance(trajectories: Sequence[Trajectory], origin: Vec2i) -> float:
+        """Длина холостых перемещений: из начала к первой траектории, между траекториями и обратно"""
+        if len(trajectories) == 0:
+            return 0.0
+
+        starts = np.array([(t.x_positions[0], t.y_positions[0]) for t in trajectories], dtype=np.float64)
+        ends = np.array([(t.x_positions[-1], t.y_positions[-1]) for t in trajectories], dtype=np.float64)
+        return _travel(starts, ends, origin)
+
+    def run(self, trajectories: Sequence[Trajectory], origin: Vec2i, check: Callable[[], None] = None) -> RouteResult:
+        """
+        Упорядочить траектории
+        :param check: Вызывается периодически, исключение прерывает оптимизацию (отмена)
+        """
+        check = _noCheck if check is None else check
+        begin = time.perf_counter()
+        deadline = begin + self.time_budget_s
+
+        trajectories = tuple(trajectories)
+
+        if self.time_budget_s <= 0 or len(trajectories) == 0:
+            travel = self.travelDistance(trajectories, origin)
+            return RouteResult(trajectories=trajectories, travel_before=travel, travel_after=travel, reversed_count=0, rotated_count=0, elapsed_s=time.perf_counter() - begin)
+
+        points = self._gatherEntryPoints(trajectories)
+        travel_before = _travel(points.first, points.last, origin)
+
+        chosen = self._nearestNeighbour(points, origin, deadline, check)
+        entries = points.points[chosen].tolist()
+        exits = points.exits[chosen].tolist()
+        order, flipped = self._twoOpt(entries, exits, origin, deadline, check)
+        travel_after = _travel(np.array(entries), np.array(exits), origin)
+
+        if travel_after >= travel_before:
+            return RouteResult(trajectories=trajectories, travel_before=travel_before, travel_after=travel_before, reversed_count=0, rotated_count=0, elapsed_s=time.perf_counter() - begin)
+
+        ret = list[Trajectory]()
+
+        for found, flip in zip(chosen[order].tolist(), flipped):
+            t = trajectories[points.owners[found]]
+            entry = int(points.entries[found])
+
+            if entry > 0:
+                t = t.rotated(entry)
+
+            if (entry == -1) != flip:
+                t = t.reversed()
+
+            ret.append(t)
+
+        return RouteResult(
+            trajectories=tuple(ret),
+            travel_before=travel_before,
+            travel_after=travel_after,
+            reversed_count=int(np.count_nonzero(flipped)),
+            rotated_count=int(np.count_nonzero(points.entries[chosen] > 0)),
+            elapsed_s=time.perf_counter() - begin
+        )
+
+    @staticmethod
+    def _gatherEntryPoints(trajectories: Sequence[Trajectory]) -> _EntryPoints:
+        """
+        Точки входа: у открытой траектории - концы, у замкнутого контура - все вершины, кроме повторяющей первую.
+        Вершины всех траекторий объединяются в один массив, дальше - без цикла по траекториям
+        """
+        xs = [np.asarray(t.x_positions) for t in trajectories]
+        ys = [np.asarray(t.y_positions) for t in trajectories]
+        lengths = np.fromiter(map(len, xs), dtype=np.int64, count=len(xs))
+        xy = np.stack((np.concatenate(xs), np.concatenate(ys)), axis=1).astype(np.float64)
+
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        first = xy[starts]
+        last = xy[ends - 1]
+        closed = (lengths > 2) & (first == last).all(axis=1)
+
+        owners = np.repeat(np.arange(len(lengths)), lengths)
+        local = np.arange(len(xy)) - starts[owners]
+        is_last = local == lengths[owners] - 1
+        is_closed = closed[owners]
+
+        vertex = np.flatnonzero(np.where(is_closed, ~is_last, (local == 0) | is_last))
+        owners = owners[vertex]
+        local = local[vertex]
+        is_closed = is_closed[vertex]
+        from_end = ~is_closed & is_last[vertex] & (local > 0)
+
+        # Выход открытой траектории - противоположный конец, замкнутого контура - вершина входа
+        exit_vertex = np.where(is_closed, vertex, np.where(from_end, starts[owners], ends[owners] - 1))
+
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=len(lengths)), out=offsets[1:])
+
+        return _EntryPoints(points=xy[vertex], exits=xy[exit_vertex], owners=owners, entries=np.where(from_end, -1, local), offsets=offsets, first=first, last=last)
+
+    def _nearestNeighbour(self, points: _EntryPoints, origin: Vec2i, deadline: float, check: Callable[[], None]) -> np.ndarray:
+        """
+        Жадный порядок: следующей выбирается траектория с ближайшей точкой входа.
+        :return: Выбранные точки входа по порядку обхода
+        """
+        offsets = points.offsets
+        index = NearestUnvisitedIndex(points.points)
+
+        ret = list[int]()
+        visited = np.zeros(len(offsets) - 1, dtype=np.bool_)
+        position = np.asarray(origin, dtype=np.float64)
+
+        while (found := index.nearest(position)) is not None:
+            i = int(points.owners[found])
+
+            visited[i] = True
+            index.visitMany(np.arange(offsets[i], offsets[i + 1]))
+
+            ret.append(found)
+            position = points.exits[found]
+
+            if len(ret) % self.DEADLINE_CHECK_PERIOD == 0:
+                check()
+
+            # Бюджет исчерпан - оставшиеся траектории в исходном порядке и направлении
+            if time.perf_counter() > deadline:
+                ret.extend(offsets[np.flatnonzero(~visited)].tolist())
+                break
+
+        return np.array(ret, dtype=np.int64)
+
+    def _twoOpt(self, entries: list[list[float]], exits: list[list[float]], origin: Vec2i, deadline: float, check: Callable[[], None]) -> tuple[list[int], list[bool]]:
+        """
+        Улучшение 2-opt для пути с закреплёнными концами в origin.
+        Разворот участка [i, j] меняет порядок траекторий и направление каждой из них
+        :param entries: Точки входа траекторий по порядку - обновляются на месте
+        :param exits: Точки выхода траекторий по порядку - обновляются на месте
+        :return: Порядок траекторий и признак разворота каждой позиции
+        """
+        count = len(entries)
+        order = list(range(count))
+        flipped = [False] * count
+
+        if count == 0:
+            return order, flipped
+
+        depot = float(origin[0]), float(origin[1])
+
+        def distance(a: Sequence[float], b: Sequence[float]) -> float:
+            return hypot(a[0] - b[0], a[1] - b[1])
+
+        k = min(self.NEIGHBOURS, count)
+        improved = True
+
+        while improved and time.perf_counter() < deadline:
+            improved = False
+
+            # Кандидаты на позицию j для каждого i: выходы, ближайшие к выходу перед i (на начало прохода)
+            _, neighbours = cKDTree(np.array(exits)).query([depot] + exits[:-1], k=k)
+            neighbours = np.sort(neighbours.reshape(count, k), axis=1).tolist()
+
+            for i in range(count):
+                if i % self.DEADLINE_CHECK_PERIOD == 0:
+                    check()
+
+                    if time.perf_counter() > deadline:
+                        break
+
+                previous_exit = exits[i - 1] if i > 0 else depot
+
+                for j in neighbours[i]:
+                    if j < i:
+                        continue
+
+                    next_entry = entries[j + 1] if j + 1 < count else depot
+
+                    gain = (
+                            distance(previous_exit, entries[i]) + distance(exits[j], next_entry)
+                            - distance(previous_exit, exits[j]) - distance(entries[i], next_entry)
+                    )
+
+                    if gain > self.MIN_GAIN:
+                        segment = slice(i, j + 1)
+                        entries[segment], exits[segment] = exits[segment][::-1], entries[segment][::-1]
+                        order[segment] = order[segment][::-1]
+                        flipped[segment] = [not f for f in flipped[segment][::-1]]
+                        improved = True
+                        break
+
+        return order, flipped
+
+
+def _noCheck() -> None:
+    pass
+
+
+def _travel(entries: np.ndarray, exits: np.ndarray, origin: Vec2i) -> float:
+    """Длина холостых перемещений по точкам входа и выхода траекторий в порядке обхода"""
+    return float(np.linalg.norm(np.vstack((entries, origin)) - np.vstack((origin, exits)), axis=1).sum())
@@ -1,5 +1,9 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 
+from gen.enums import PlannerMode
+from gen.enums import SimplificationMethod
 from gen.movementprofile import MovementProfile
 
 
@@ -31,6 +35,32 @@ class GeneratorSettings:
     epilogue_end_position: tuple[int, int]
     """Позиция после окончания печати"""
 
+    route_time_budget_ms: int = 500
+    """Время на оптимизацию порядка траекторий (0 - без оптимизации: порядок и направление добавления фигур)"""
+
+    simplification_method: SimplificationMethod = SimplificationMethod.NONE
+    """Метод упрощения траекторий"""
+
+    simplification_tolerance: int = 1
+    """Допуск упрощения траекторий (единицы станка)"""
+
+    incremental_compile: bool = False
+    """Запись через исходный текст с инкрементальной компиляцией: при повторном экспорте кодируются только изменённые траектории"""
+
+    @classmethod
+    def makeDefault(cls) -> GeneratorSettings:
+        """Настройки по умолчанию"""
+        return cls(
+            MovementProfile(name="Перемещение", mode=PlannerMode.ACCEL, speed=200, accel=75),
+            MovementProfile(name="Продолжительный отрезок", mode=PlannerMode.ACCEL, speed=150, accel=50),
+            MovementProfile(name="Кривая (Короткий отрезок)", mode=PlannerMode.SPEED, speed=20, accel=0),
+            MovementProfile(name="Малые отрезки", mode=PlannerMode.POSITION, speed=0, accel=0),
+            tool_change_begin_timeout_ms=1000,
+            tool_change_end_timeout_ms=1000,
+            epilogue_stop_duration_ms=1000,
+            epilogue_end_position=(0, 0)
+        )
+
     def getProfileByIndex(self, index: int) -> MovementProfile:
         return (
             self.micro_curve_profile,
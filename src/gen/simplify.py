@@ -0,0 +1,239 @@
+"""Упрощение ломаных траекторий перед генерацией кода"""
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from dataclasses import replace
+from typing import Callable
+from typing import ClassVar
+from typing import Sequence
+
+import numpy as np
+
+from gen.enums import SimplificationMethod
+from gen.trajectory import Trajectory
+
+
+class Simplifier(ABC):
+    """Алгоритм упрощения ломаной"""
+
+    def apply(self, points: np.ndarray) -> np.ndarray:
+        """
+        Упростить ломаную
+        :param points: Вершины (N, 2)
+        :return: Маска сохраняемых вершин (N,). Первая и последняя вершины сохраняются всегда
+        """
+        if len(points) < 3:
+            return np.ones(len(points), dtype=np.bool_)
+
+        return self._keepMask(np.asarray(points, dtype=np.float64))
+
+    @abstractmethod
+    def _keepMask(self, points: np.ndarray) -> np.ndarray:
+        pass
+
+    @staticmethod
+    def _cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+
+
+class CollinearSimplifier(Simplifier):
+    """Удаление промежуточных вершин, лежащих на прямой между соседями (без разворота направления)"""
+
+    def _keepMask(self, points: np.ndarray) -> np.ndarray:
+        incoming = points[1:-1] - points[:-2]
+        outgoing = points[2:] - points[1:-1]
+
+        inner = (self._cross(incoming, outgoing) != 0) | ((incoming * outgoing).sum(axis=1) <= 0)
+        return np.concatenate(((True,), inner, (True,)))
+
+
+class RamerDouglasPeuckerSimplifier(Simplifier):
+    """
+    Алгоритм Рамера-Дугласа-Пекера.
+    Все отрезки одного уровня рекурсии обрабатываются одним набором операций над массивами
+    """
+
+    def __init__(self, tolerance: float) -> None:
+        self.tolerance = tolerance
+        """Допустимое отклонение от исходной ломаной"""
+
+    def _keepMask(self, points: np.ndarray) -> np.ndarray:
+        keep = np.zeros(len(points), dtype=np.bool_)
+        keep[[0, -1]] = True
+
+        x = np.ascontiguousarray(points[:, 0])
+        y = np.ascontiguousarray(points[:, 1])
+        tolerance2 = self.tolerance * self.tolerance
+
+        starts = np.array((0,))
+        ends = np.array((len(points) - 1,))
+
+        while len(starts):
+            inner = ends - starts - 1
+            active = inner > 0
+            starts, ends, inner = starts[active], ends[active], inner[active]
+
+            if len(starts) == 0:
+                break
+
+            offsets = np.cumsum(inner) - inner
+            index = np.repeat(starts + 1 - offsets, inner) + np.arange(inner.sum())
+
+            distance2 = self._segmentDistance2(x[index], y[index], x[starts], y[starts], x[ends], y[ends], inner)
+            farthest = np.maximum.reduceat(distance2, offsets)
+
+            # Первая вершина с наибольшим отклонением в каждом отрезке
+            candidates = np.flatnonzero(distance2 == np.repeat(farthest, inner))
+            segment = np.searchsorted(offsets, candidates, side="right") - 1
+            first = np.ones(len(candidates), dtype=np.bool_)
+            first[1:] = segment[1:] != segment[:-1]
+            split = index[candidates[first]]
+
+            divide = farthest > tolerance2
+            keep[split[divide]] = True
+
+            starts, ends = (
+                np.concatenate((starts[divide], split[divide])),
+                np.concatenate((split[divide], ends[divide])),
+            )
+
+        return keep
+
+    @staticmethod
+    def _segmentDistance2(px: np.ndarray, py: np.ndarray, ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Квадрат расстояния от точек до отрезков [a, b], отрезок i относится к counts[i] точкам подряд"""
+        abx = bx - ax
+        aby = by - ay
+        length2 = abx * abx + aby * aby
+        inverse = np.divide(1.0, length2, out=np.zeros_like(length2), where=length2 > 0)
+
+        dx = px - np.repeat(ax, counts)
+        dy = py - np.repeat(ay, counts)
+        abx = np.repeat(abx, counts)
+        aby = np.repeat(aby, counts)
+
+        t = (dx * abx + dy * aby) * np.repeat(inverse, counts)
+        np.clip(t, 0, 1, out=t)
+
+        dx -= t * abx
+        dy -= t * aby
+        return dx * dx + dy * dy
+
+
+class VisvalingamWhyattSimplifier(Simplifier):
+    """
+    Алгоритм Висвалингам-Уайатта.
+    Вместо удаления по одной вершине за шаг каждый проход удаляет все несмежные вершины
+    с локально наименьшей эффективной площадью ниже порога
+    """
+
+    def __init__(self, tolerance: float) -> None:
+        self.tolerance = tolerance
+        """Допуск: площадь треугольника из вершины и её соседей сравнивается с tolerance²"""
+
+    def _keepMask(self, points: np.ndarray) -> np.ndarray:
+        alive = np.arange(len(points))
+        threshold = self.tolerance * self.tolerance
+
+        while len(alive) > 2:
+            p = points[alive]
+            area = np.empty(len(alive))
+            area[[0, -1]] = np.inf
+            area[1:-1] = np.abs(self._cross(p[:-2] - p[1:-1], p[2:] - p[1:-1])) / 2
+
+            left = np.roll(area, 1)
+            right = np.roll(area, -1)
+            remove = (area < threshold) & (area <= left) & (area <= right)
+
+            if not remove.any():
+                break
+
+            # В серии соседних равных минимумов удаляется каждая вторая вершина
+            run_start = remove & ~np.roll(remove, 1)
+            start_position = np.maximum.accumulate(np.where(run_start, np.arange(len(alive)), 0))
+            remove &= (np.arange(len(alive)) - start_position) % 2 == 0
+
+            alive = alive[~remove]
+
+        keep = np.zeros(len(points), dtype=np.bool_)
+        keep[alive] = True
+        return keep
+
+
+def makeSimplifiers(method: SimplificationMethod, tolerance: float) -> Sequence[Simplifier]:
+    """Цепочка упрощения для выбранного метода"""
+    match method:
+        case SimplificationMethod.NONE:
+            return ()
+
+        case SimplificationMethod.COLLINEAR:
+            return CollinearSimplifier(),
+
+        case SimplificationMethod.RAMER_DOUGLAS_PEUCKER:
+            return CollinearSimplifier(), RamerDouglasPeuckerSimplifier(tolerance)
+
+        case SimplificationMethod.VISVALINGAM_WHYATT:
+            return CollinearSimplifier(), VisvalingamWhyattSimplifier(tolerance)
+
+    raise ValueError(f"Unknown simplification method: {method}")
+
+
+@dataclass(frozen=True, kw_only=True)
+class SimplificationResult:
+    """Результат упрощения траекторий"""
+
+    trajectories: Sequence[Trajectory]
+    """Упрощённые траектории"""
+    vertices_before: int
+    """Вершин до упрощения"""
+    vertices_after: int
+    """Вершин после упрощения"""
+
+    def verticesRemoved(self) -> int:
+        """Удалено вершин"""
+        return self.vertices_before - self.vertices_after
+
+    def bytesRemoved(self) -> int:
+        """Сокращение размера программы"""
+        return self.verticesRemoved() * SimplificationStage.STEP_SIZE
+
+    def __str__(self) -> str:
+        return f"Simplification : vertices {self.vertices_before} -> {self.vertices_after} (-{self.verticesRemoved()}, -{self.bytesRemoved()} bytes)"
+
+
+class SimplificationStage:
+    """Упрощение траекторий цепочкой алгоритмов"""
+
+    STEP_SIZE: ClassVar[int] = 5
+    """Размер инструкции set_position в байтах (индекс инструкции u8, координаты i16 i16)"""
+
+    def __init__(self, simplifiers: Sequence[Simplifier]) -> None:
+        self.simplifiers = simplifiers
+
+    def run(self, trajectories: Sequence[Trajectory], check: Callable[[], None] = None) -> SimplificationResult:
+        """
+        Упростить траектории
+        :param check: Вызывается перед каждой траекторией, исключение прерывает упрощение (отмена)
+        """
+        ret = list[Trajectory]()
+        vertices_before = 0
+        vertices_after = 0
+
+        for trajectory in trajectories:
+            if check is not None:
+                check()
+
+            x = np.asarray(trajectory.x_positions)
+            y = np.asarray(trajectory.y_positions)
+            vertices_before += len(x)
+
+            for simplifier in self.simplifiers:
+                keep = simplifier.apply(np.stack((x, y), axis=1))
+                x, y = x[keep], y[keep]
+
+            vertices_after += len(x)
+            ret.append(replace(trajectory, x_positions=x, y_positions=y))
+
+        return SimplificationResult(trajectories=ret, vertices_before=vertices_before, vertices_after=vertices_after)
@@ -0,0 +1,153 @@
+"""Оценка времени печати по байт-коду"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar
+from typing import Sequence
+
+import numpy as np
+
+from bytelang.bytecode.impl.decoder import DecodedProgram
+from gen.enums import MarkerTool
+from gen.enums import PlannerMode
+from gen.vertex import Vec2i
+
+
+@dataclass(frozen=True, kw_only=True)
+class MachineModel:
+    """
+    Кинематическая модель плоттера.
+    Скорость и ускорение программы переводятся в единицы станка множителями - их нужно откалибровать по замеру на станке
+    """
+
+    speed_scale: float = 10.0
+    """Единиц станка в секунду на единицу set_speed"""
+    accel_scale: float = 10.0
+    """Единиц станка в секунду за секунду на единицу set_accel"""
+    position_speed: float = 2000.0
+    """Скорость отработки позиции в режиме POSITION (единиц станка в секунду)"""
+    start_position: Vec2i = (0, 0)
+    """Позиция перед началом программы"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class SimulationResult:
+    """Результат моделирования"""
+
+    duration_s: float
+    """Оценка времени выполнения программы"""
+    motion_s: float
+    """Время перемещений"""
+    delay_s: float
+    """Время пауз"""
+    draw_distance: float
+    """Путь с опущенным инструментом"""
+    travel_distance: float
+    """Холостой путь"""
+    moves: int
+    """Число перемещений"""
+    end_position: Vec2i
+    """Позиция после выполнения программы"""
+    warnings: Sequence[str]
+    """Найденные ошибки программы"""
+
+    def __str__(self) -> str:
+        minutes, seconds = divmod(self.duration_s, 60)
+        warnings = "".join(f"\n  warning: {w}" for w in self.warnings)
+        return (
+            f"Simulation : {int(minutes)} min {seconds:.1f} s (motion {self.motion_s:.1f} s, delay {self.delay_s:.1f} s) "
+            f"moves: {self.moves} draw: {self.draw_distance:.0f} travel: {self.travel_distance:.0f}{warnings}"
+        )
+
+
+class KinematicSimulator:
+    """
+    Векторная оценка времени печати.
+    Состояние планировщика (скорость, ускорение, режим, инструмент) для каждой инструкции - последнее заданное до неё значение.
+    Каждое перемещение начинается и заканчивается остановкой: в режиме ACCEL - трапециевидный профиль скорости,
+    в режиме SPEED - постоянная скорость, в режиме POSITION - скорость отработки позиции модели
+    """
+
+    ENVIRONMENT_INSTRUCTIONS: ClassVar[tuple[str, ...]] = (
+        "quit", "delay_ms", "set_speed", "set_accel", "set_planner_mode", "set_position", "set_active_tool"
+    )
+    """Инструкции окружения, используемые моделью"""
+
+    def __init__(self, model: MachineModel = MachineModel()) -> None:
+        self.model = model
+
+    def run(self, program: DecodedProgram) -> SimulationResult:
+        """Оценить время выполнения программы"""
+        if missing := [name for name in self.ENVIRONMENT_INSTRUCTIONS if name not in program.environment.instructions]:
+            raise ValueError(f"Окружение {program.environment.name} не содержит инструкций: {', '.join(missing)}")
+
+        arguments = program.instructions["arguments"]
+        warnings = list[str]()
+
+        moves = np.flatnonzero(program.select("set_position"))
+        x = np.concatenate(((self.model.start_position[0],), arguments[moves, 0])).astype(np.float64)
+        y = np.concatenate(((self.model.start_position[1],), arguments[moves, 1])).astype(np.float64)
+        distance = np.hypot(np.diff(x), np.diff(y))
+
+        speed = self._getState(program, "set_speed", moves) * self.model.speed_scale
+        accel = self._getState(program, "set_accel", moves) * self.model.accel_scale
+        mode = self._getState(program, "set_planner_mode", moves, PlannerMode.POSITION)
+        tool = self._getState(program, "set_active_tool", moves, MarkerTool.NONE)
+
+        duration = np.zeros(len(moves))
+        moving = distance > 0
+
+        position = moving & (mode == PlannerMode.POSITION)
+        duration[position] = distance[position] / self.model.position_speed
+
+        stalled = moving & (mode != PlannerMode.POSITION) & (speed <= 0)
+
+        if stalled.any():
+            warnings.append(f"перемещений с нулевой скоростью: {int(stalled.sum())}")
+
+        constant = moving & ~stalled & ((mode == PlannerMode.SPEED) | ((mode == PlannerMode.ACCEL) & (accel <= 0)))
+        duration[constant] = distance[constant] / speed[constant]
+
+        trapezoid = moving & ~stalled & (mode == PlannerMode.ACCEL) & (accel > 0)
+        d, v, a = distance[trapezoid], speed[trapezoid], accel[trapezoid]
+        # Короткий отрезок не успевает разогнаться до заданной скорости - треугольный профиль
+        duration[trapezoid] = np.where(d >= v * v / a, d / v + v / a, 2 * np.sqrt(d / a))
+
+        delay_s = float(arguments[program.select("delay_ms"), 0].sum()) / 1000
+        motion_s = float(duration.sum())
+        drawing = tool != MarkerTool.NONE
+
+        self._validate(program, warnings)
+
+        return SimulationResult(
+            duration_s=motion_s + delay_s,
+            motion_s=motion_s,
+            delay_s=delay_s,
+            draw_distance=float(distance[drawing].sum()),
+            travel_distance=float(distance[~drawing].sum()),
+            moves=len(moves),
+            end_position=(int(x[-1]), int(y[-1])),
+            warnings=tuple(warnings)
+        )
+
+    @staticmethod
+    def _getState(program: DecodedProgram, name: str, rows: np.ndarray, default: int = 0) -> np.ndarray:
+        """Значение первого аргумента последнего вызова инструкции перед каждой из строк"""
+        calls = program.select(name)
+        last = np.maximum.accumulate(np.where(calls, np.arange(len(calls)), -1))[rows]
+        return np.where(last >= 0, program.instructions["arguments"][np.maximum(last, 0), 0], default)
+
+    @staticmethod
+    def _validate(program: DecodedProgram, warnings: list[str]) -> None:
+        quits = np.flatnonzero(program.select("quit"))
+
+        if len(quits) == 0:
+            warnings.append("нет инструкции quit")
+
+        elif quits[0] != len(program) - 1:
+            warnings.append(f"инструкций после quit: {len(program) - 1 - int(quits[0])}")
+
+        progress = program.instructions["arguments"][program.select("set_progress"), 0] if "set_progress" in program.environment.instructions else ()
+
+        if len(progress) and (np.any(np.diff(progress) < 0) or progress.max() > 100):
+            warnings.append("прогресс убывает или превышает 100")
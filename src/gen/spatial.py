@@ -0,0 +1,116 @@
+"""Пространственный поиск ближайших точек"""
+from __future__ import annotations
+
+from typing import ClassVar
+from typing import Optional
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+class NearestUnvisitedIndex:
+    """
+    Поиск ближайшей непосещённой точки.
+    KD-дерево строится по оставшимся точкам, посещённые только отмечаются.
+    Запрос в тупике (вокруг одни посещённые) просматривает их все, поэтому дерево перестраивается,
+    когда посещённых в нём больше половины или когда расширенные запросы (больше START_K соседей) с прошлого
+    перестроения просмотрели посещённых больше, чем точек в дереве - лишняя работа запросов не превышает стоимости перестроения.
+    В худшем случае запрос стоит амортизированно O(sqrt(n) log n), на плотных сетках - O(log n)
+    """
+
+    START_K: ClassVar[int] = 8
+    """Начальное число соседей в запросе"""
+
+    TIE_EPSILON: ClassVar[float] = 1e-9
+    """Относительный допуск, в пределах которого расстояния проверяются точно"""
+
+    def __init__(self, points: np.ndarray) -> None:
+        self.__points = np.asarray(points, dtype=np.float64)
+        self.__visited = np.zeros(len(self.__points), dtype=np.bool_)
+        self.__remaining = len(self.__points)
+
+        self.__tree: Optional[cKDTree] = None
+        self.__tree_ids = np.empty(0, dtype=np.int64)
+        self.__tree_visited = 0
+        self.__tree_wasted = 0
+        self.__rebuild()
+
+    def remaining(self) -> int:
+        """Число непосещённых точек"""
+        return self.__remaining
+
+    def visit(self, index: int) -> None:
+        """Отметить точку посещённой"""
+        if self.__visited[index]:
+            return
+
+        self.__visited[index] = True
+        self.__remaining -= 1
+        self.__tree_visited += 1
+
+        if self.__tree_visited * 2 > len(self.__tree_ids):
+            self.__rebuild()
+
+    def visitMany(self, indices: np.ndarray) -> None:
+        """Отметить посещёнными несколько точек"""
+        indices = np.asarray(indices)
+        fresh = np.unique(indices[~self.__visited[indices]])
+
+        if len(fresh) == 0:
+            return
+
+        self.__visited[fresh] = True
+        self.__remaining -= len(fresh)
+        self.__tree_visited += len(fresh)
+
+        if self.__tree_visited * 2 > len(self.__tree_ids):
+            self.__rebuild()
+
+    def nearest(self, point: np.ndarray) -> Optional[int]:
+        """
+        Ближайшая непосещённая точка.
+        Результат совпадает с полным перебором: расстояние - np.linalg.norm, при равенстве - меньший индекс
+        """
+        if self.__remaining == 0:
+            return None
+
+        size = len(self.__tree_ids)
+        k = min(self.START_K, size)
+
+        while True:
+            distances, found = self.__tree.query(point, k=k)
+            distances = np.atleast_1d(distances)
+            found = self.__tree_ids[np.atleast_1d(found)]
+
+            unvisited = ~self.__visited[found]
+
+            if k > self.START_K:
+                self.__tree_wasted += len(found) - int(np.count_nonzero(unvisited))
+
+            # Непосещённая точка найдена и все равные ей по расстоянию попали в выборку
+            if unvisited.any():
+                radius = distances[unvisited.argmax()] * (1 + self.TIE_EPSILON)
+
+                if k == size or distances[-1] > radius:
+                    break
+
+            k = min(k * 2, size)
+
+        candidates = found[unvisited & (distances <= radius)]
+
+        if self.__tree_wasted > size:
+            self.__rebuild()
+
+        if len(candidates) == 1:
+            return int(candidates[0])
+
+        candidates = np.sort(candidates)
+        return int(candidates[np.argmin(np.linalg.norm(self.__points[candidates] - point, axis=1))])
+
+    def __rebuild(self) -> None:
+        self.__tree_ids = np.flatnonzero(~self.__visited)
+        self.__tree_visited = 0
+        self.__tree_wasted = 0
+
+        if len(self.__tree_ids):
+            self.__tree = cKDTree(self.__points[self.__tree_ids])
@@ -1,6 +1,11 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
+from dataclasses import replace
 from typing import Iterable
 
+import numpy as np
+
 from gen.agents import MacroAgent
 from gen.enums import MarkerTool
 from gen.settings import GeneratorSettings
@@ -29,6 +34,22 @@ class Trajectory:
         """Количество вершин"""
         return len(tuple(self.x_positions))
 
+    def isClosed(self) -> bool:
+        """Траектория - замкнутый контур (последняя вершина совпадает с первой)"""
+        x = np.asarray(self.x_positions)
+        y = np.asarray(self.y_positions)
+        return len(x) > 2 and x[0] == x[-1] and y[0] == y[-1]
+
+    def reversed(self) -> Trajectory:
+        """Траектория, пройденная в обратном направлении"""
+        return replace(self, x_positions=np.asarray(self.x_positions)[::-1], y_positions=np.asarray(self.y_positions)[::-1])
+
+    def rotated(self, start: int) -> Trajectory:
+        """Замкнутый контур, начинающийся с вершины start"""
+        x = np.asarray(self.x_positions)
+        y = np.asarray(self.y_positions)
+        return replace(self, x_positions=np.concatenate((x[start:-1], x[:start + 1])), y_positions=np.concatenate((y[start:-1], y[:start + 1])))
+
     def run(self, agent: MacroAgent, settings: GeneratorSettings):
         """Использовать агента для преодоления траектории"""
 
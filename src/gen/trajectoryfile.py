@@ -0,0 +1,224 @@
+"""
+Двоичный формат траекторий (little-endian):
+заголовок, таблица траекторий, выровненный массив вершин int16 (x, y) и имена траекторий в UTF-8.
+Файл читается через np.memmap: таблица и вершины - представления отображённого файла без копирования
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import BinaryIO
+from typing import ClassVar
+from typing import Iterator
+from typing import Sequence
+
+import numpy as np
+
+from gen.enums import MarkerTool
+from gen.trajectory import Trajectory
+
+
+class TrajectoryFormat:
+    """Описание формата"""
+
+    EXTENSION: ClassVar[str] = "vtr"
+    """Расширение файла"""
+
+    MAGIC: ClassVar[bytes] = b"VTRJ"
+    """Сигнатура"""
+
+    VERSION: ClassVar[int] = 1
+    """Версия формата"""
+
+    ALIGNMENT: ClassVar[int] = 16
+    """Выравнивание массива вершин"""
+
+    HEADER: ClassVar[np.dtype] = np.dtype([
+        ("magic", "S4"),
+        ("version", "<u2"),
+        ("header_size", "<u2"),
+        ("trajectory_count", "<u4"),
+        ("reserved", "<u4"),
+        ("vertex_count", "<u8"),
+        ("vertices_offset", "<u8"),
+        ("names_size", "<u8"),
+    ])
+    """Заголовок"""
+
+    TABLE: ClassVar[np.dtype] = np.dtype([
+        ("tool", "u1"),
+        ("planner_mode", "u1"),
+        ("reserved", "<u2"),
+        ("count", "<u4"),
+        ("offset", "<u8"),
+        ("name_offset", "<u8"),
+        ("name_size", "<u4"),
+        ("reserved_1", "<u4"),
+    ])
+    """Запись таблицы: offset и count в вершинах, имя - срез блока имён"""
+
+    VERTEX: ClassVar[np.dtype] = np.dtype("<i2")
+    """Тип координаты"""
+
+    VERTEX_RANGE: ClassVar[tuple[int, int]] = np.iinfo(np.int16).min, np.iinfo(np.int16).max
+    """Допустимый диапазон координат"""
+
+    @classmethod
+    def getVerticesOffset(cls, trajectory_count: int) -> int:
+        """Смещение массива вершин от начала файла"""
+        end = cls.HEADER.itemsize + trajectory_count * cls.TABLE.itemsize
+        return -(-end // cls.ALIGNMENT) * cls.ALIGNMENT
+
+
+class TrajectoryWriter:
+    """Запись траекторий в двоичный формат"""
+
+    def write(self, trajectories: Sequence[Trajectory], stream: BinaryIO) -> int:
+        """
+        Записать траектории
+        :return: Размер записанных данных в байтах
+        """
+        table = np.zeros(len(trajectories), dtype=TrajectoryFormat.TABLE)
+        names = [t.name.encode() for t in trajectories]
+
+        counts = np.fromiter((len(t.x_positions) for t in trajectories), dtype=np.int64, count=len(trajectories))
+        offsets = np.zeros(len(trajectories), dtype=np.int64)
+        np.cumsum(counts[:-1], out=offsets[1:])
+
+        name_sizes = np.fromiter(map(len, names), dtype=np.int64, count=len(names))
+        name_offsets = np.zeros(len(names), dtype=np.int64)
+        np.cumsum(name_sizes[:-1], out=name_offsets[1:])
+
+        table["tool"] = [t.tool for t in trajectories]
+        table["planner_mode"] = [t.planner_mode for t in trajectories]
+        table["count"] = counts
+        table["offset"] = offsets
+        table["name_offset"] = name_offsets
+        table["name_size"] = name_sizes
+
+        vertices = self.__packVertices(trajectories)
+        vertices_offset = TrajectoryFormat.getVerticesOffset(len(trajectories))
+        names_data = b"".join(names)
+
+        header = np.zeros(1, dtype=TrajectoryFormat.HEADER)
+        header["magic"] = TrajectoryFormat.MAGIC
+        header["version"] = TrajectoryFormat.VERSION
+        header["header_size"] = TrajectoryFormat.HEADER.itemsize
+        header["trajectory_count"] = len(trajectories)
+        header["vertex_count"] = len(vertices)
+        header["vertices_offset"] = vertices_offset
+        header["names_size"] = len(names_data)
+
+        stream.write(header.tobytes())
+        stream.write(table.tobytes())
+        stream.write(bytes(vertices_offset - TrajectoryFormat.HEADER.itemsize - table.nbytes))
+        stream.write(vertices.tobytes())
+        stream.write(names_data)
+
+        return vertices_offset + vertices.nbytes + len(names_data)
+
+    def save(self, trajectories: Sequence[Trajectory], path: Path) -> int:
+        """Записать траектории в файл"""
+        with open(path, "wb") as f:
+            return self.write(trajectories, f)
+
+    @staticmethod
+    def __packVertices(trajectories: Sequence[Trajectory]) -> np.ndarray:
+        if not trajectories:
+            return np.empty((0, 2), dtype=TrajectoryFormat.VERTEX)
+
+        x = np.concatenate([np.asarray(t.x_positions, dtype=np.int64) for t in trajectories])
+        y = np.concatenate([np.asarray(t.y_positions, dtype=np.int64) for t in trajectories])
+
+        if len(x) != len(y):
+            raise ValueError(f"Число координат X и Y не совпадает: {len(x)} != {len(y)}")
+
+        low, high = TrajectoryFormat.VERTEX_RANGE
+
+        if len(x) and (min(x.min(), y.min()) < low or max(x.max(), y.max()) > high):
+            raise ValueError(f"Координаты вне диапазона int16 {low}..{high}")
+
+        return np.stack((x, y), axis=1).astype(TrajectoryFormat.VERTEX)
+
+
+class TrajectoryFile(Sequence[Trajectory]):
+    """
+    Траектории из двоичного файла.
+    Координаты траекторий - представления массива вершин (int16), файл остаётся отображённым, пока они используются
+    """
+
+    def __init__(self, data: np.ndarray) -> None:
+        """
+        :param data: Содержимое файла - массив uint8 (np.memmap или np.frombuffer)
+        """
+        if len(data) < TrajectoryFormat.HEADER.itemsize:
+            raise ValueError("Файл траекторий: нет заголовка")
+
+        header = data[:TrajectoryFormat.HEADER.itemsize].view(TrajectoryFormat.HEADER)[0]
+
+        if header["magic"] != TrajectoryFormat.MAGIC:
+            raise ValueError(f"Файл траекторий: неверная сигнатура {bytes(header['magic'])!r}")
+
+        if header["version"] != TrajectoryFormat.VERSION:
+            raise ValueError(f"Файл траекторий: неподдерживаемая версия {header['version']} (ожидается {TrajectoryFormat.VERSION})")
+
+        trajectory_count = int(header["trajectory_count"])
+        vertex_count = int(header["vertex_count"])
+        vertices_offset = int(header["vertices_offset"])
+        table_offset = int(header["header_size"])
+        names_offset = vertices_offset + vertex_count * 2 * TrajectoryFormat.VERTEX.itemsize
+        names_end = names_offset + int(header["names_size"])
+
+        if table_offset + trajectory_count * TrajectoryFormat.TABLE.itemsize > vertices_offset or names_end > len(data):
+            raise ValueError("Файл траекторий: данные повреждены или усечены")
+
+        self.table = data[table_offset:table_offset + trajectory_count * TrajectoryFormat.TABLE.itemsize].view(TrajectoryFormat.TABLE)
+        """Таблица траекторий"""
+        self.vertices = data[vertices_offset:names_offset].view(TrajectoryFormat.VERTEX).reshape(-1, 2)
+        """Вершины (N, 2) int16"""
+        self.__names = data[names_offset:names_end]
+
+        if trajectory_count and int((self.table["offset"] + self.table["count"]).max()) > vertex_count:
+            raise ValueError("Файл траекторий: траектория выходит за пределы массива вершин")
+
+    @classmethod
+    def open(cls, path: Path) -> TrajectoryFile:
+        """Отобразить файл в память"""
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    @classmethod
+    def fromBytes(cls, data: bytes) -> TrajectoryFile:
+        """Прочитать траектории из буфера без копирования"""
+        return cls(np.frombuffer(data, dtype=np.uint8))
+
+    def vertexCount(self) -> int:
+        """Общее количество вершин"""
+        return len(self.vertices)
+
+    def getName(self, index: int) -> str:
+        """Наименование траектории"""
+        entry = self.table[index]
+        begin = int(entry["name_offset"])
+        return self.__names[begin:begin + int(entry["name_size"])].tobytes().decode()
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, index: int) -> Trajectory:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+
+        entry = self.table[index]
+        begin = int(entry["offset"])
+        vertices = self.vertices[begin:begin + int(entry["count"])]
+
+        return Trajectory(
+            name=self.getName(index),
+            x_positions=vertices[:, 0],
+            y_positions=vertices[:, 1],
+            tool=MarkerTool(int(entry["tool"])),
+            planner_mode=int(entry["planner_mode"])
+        )
+
+    def __iter__(self) -> Iterator[Trajectory]:
+        for index in range(len(self)):
+            yield self[index]
@@ -1,13 +1,8 @@
-import math
-from itertools import chain
-from itertools import pairwise
-from math import cos
-from math import pi
-from math import radians
-from math import sin
 from typing import Final
 from typing import Iterable
 
+import numpy as np
+
 from tools import Range
 
 Vertices = tuple[Iterable[float], Iterable[float]]
@@ -17,6 +12,10 @@ type Vec2D[T] = tuple[T, T]
 Vec2f = Vec2D[float]
 Vec2i = Vec2D[int]
 
+type VertexArray = np.ndarray
+"""Непрерывный массив координат float64"""
+VertexArrays = Vec2D[VertexArray]
+
 
 class VertexGenerator:
     RESOLUTION_RANGE: Final[Range[int]] = Range(1, 1000)
@@ -24,87 +23,82 @@ class VertexGenerator:
     SPIRAL_REPEATS: Final[Range[int]] = Range(1, 50)
 
     @classmethod
-    def inflate(cls, v: Vertices, factor: float) -> Vertices:
+    def inflate(cls, v: Vertices, factor: float) -> VertexArrays:
         """Вздуть вершины"""
-
-        def __transform(__v: Vec2f) -> Vec2f:
-            x, y = __v
-            d = math.hypot(x, y)
-
-            if d == 0:
-                return __v
-
-            return x + x / d * factor, y + y / d * factor
-
-        x, y = tuple(zip(*map(__transform, zip(*v))))
-        return x, y
+        x, y = cls.asArrays(v)
+        d = np.hypot(x, y)
+        d[d == 0] = 1.0
+        return x + x / d * factor, y + y / d * factor
 
     @classmethod
-    def spiral(cls, resolution: int, k: float = 1.0) -> Vertices:
-        k2_pi_p = 2 * k * pi / resolution
-        return (
-            map(lambda a: sin(a * k2_pi_p) * a / resolution, cls.range(resolution)),
-            map(lambda a: cos(a * k2_pi_p) * a / resolution, cls.range(resolution))
-        )
+    def spiral(cls, resolution: int, k: float = 1.0) -> VertexArrays:
+        k2_pi_p = 2 * k * np.pi / resolution
+        a = cls.range(resolution)
+        phase = a * k2_pi_p
+        return np.sin(phase) * a / resolution, np.cos(phase) * a / resolution
 
     @classmethod
-    def circle(cls, angle_deg: int, resolution: int) -> Vertices:
-        k2_pi_p = 2 * angle_deg * pi / (resolution * 360)
-        return (
-            map(lambda a: sin(a * k2_pi_p), cls.range(resolution)),
-            map(lambda a: cos(a * k2_pi_p), cls.range(resolution))
-        )
+    def circle(cls, angle_deg: int, resolution: int) -> VertexArrays:
+        a = cls.range(resolution) * (2 * angle_deg * np.pi / (resolution * 360))
+        return np.sin(a), np.cos(a)
 
     @staticmethod
-    def lineSimple() -> Vertices:
-        return (0, 1), (0, 1)
+    def lineSimple() -> VertexArrays:
+        return np.array((0.0, 1.0)), np.array((0.0, 1.0))
 
     @classmethod
-    def nGon(cls, vertex_count: int, resolution: int) -> Vertices:
-        angle = 360 // vertex_count
-        angles = tuple(map(radians, range(0, 360, angle)))
-        return cls.polygon((map(sin, angles), map(cos, angles)), resolution)
+    def nGon(cls, vertex_count: int, resolution: int) -> VertexArrays:
+        angles = np.radians(np.arange(0, 360, 360 // vertex_count, dtype=np.float64))
+        return cls.polygon((np.sin(angles), np.cos(angles)), resolution)
 
     @classmethod
-    def rect(cls, resolution: int) -> Vertices:
+    def rect(cls, resolution: int) -> VertexArrays:
         return cls.polygon(((1, -1, -1, 1), (1, 1, -1, -1)), resolution)
 
     @classmethod
-    def polygon(cls, vertices: Vertices, resolution: int) -> Vertices:
-        x, y = zip(*(map(lambda _: cls.line(*_), (
-            (*pos, resolution)
-            for pos in pairwise(cls.appendFirst(zip(*vertices)))
-        ))))
-        return chain(*x), chain(*y)
+    def polygon(cls, vertices: Vertices, resolution: int) -> VertexArrays:
+        x, y = cls.appendFirst(cls.asArrays(vertices))
+        t = cls.rangeNorm(resolution)
+        return (
+            cls.mix(x[:-1, np.newaxis], x[1:, np.newaxis], t).ravel(),
+            cls.mix(y[:-1, np.newaxis], y[1:, np.newaxis], t).ravel()
+        )
 
     @classmethod
-    def line[T: Number](cls, begin: Vec2D[T], end: Vec2D[T], resolution: int) -> Vertices:
+    def line[T: Number](cls, begin: Vec2D[T], end: Vec2D[T], resolution: int) -> VertexArrays:
         x0, y0 = begin
         x1, y1 = end
-        return (
-            map(lambda t: cls.mix(x0, x1, t), cls.rangeNorm(resolution)),
-            map(lambda t: cls.mix(y0, y1, t), cls.rangeNorm(resolution))
-        )
+        t = cls.rangeNorm(resolution)
+        return cls.mix(x0, x1, t), cls.mix(y0, y1, t)
 
     @classmethod
-    def rangeNorm(cls, resolution: int) -> Iterable[float]:
-        return map(lambda n: n / resolution, cls.range(resolution))
+    def rangeNorm(cls, resolution: int) -> VertexArray:
+        return cls.range(resolution) / resolution
 
     @staticmethod
-    def range(resolution: int) -> Iterable[int]:
-        return range(resolution + 1)
+    def range(resolution: int) -> VertexArray:
+        return np.arange(resolution + 1, dtype=np.float64)
+
+    @classmethod
+    def asArrays(cls, v: Vertices) -> VertexArrays:
+        """Представить вершины в виде непрерывных массивов float64"""
+        x, y = v
+        return cls.asArray(x), cls.asArray(y)
 
     @staticmethod
-    def appendFirst[T](i: Iterable[T]) -> Iterable[T]:
-        i = iter(i)
-        first = next(i, None)
+    def asArray(i: Iterable[float]) -> VertexArray:
+        """Представить координаты в виде непрерывного массива float64"""
+        if isinstance(i, np.ndarray):
+            return np.ascontiguousarray(i, dtype=np.float64)
 
-        if first is not None:
-            yield first
+        return np.fromiter(i, dtype=np.float64)
 
-        yield from i
-        yield first
+    @staticmethod
+    def appendFirst(v: VertexArrays) -> VertexArrays:
+        """Замкнуть контур, добавив первую вершину в конец"""
+        x, y = v
+        return np.append(x, x[:1]), np.append(y, y[:1])
 
     @staticmethod
-    def mix[T: Number](__from: T, __end: T, t: float) -> T:
+    def mix[T: Number | VertexArray](__from: T, __end: T, t: float | VertexArray) -> T:
         return __end * t + (1.0 - t) * __from
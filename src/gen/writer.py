@@ -1,13 +1,19 @@
 from dataclasses import dataclass
+from dataclasses import field
 from typing import BinaryIO
+from typing import Callable
 from typing import Iterable
 
+from bytelang.bytecode.impl.emitter import ByteCodeEmitter
+from bytelang.bytecode.impl.incremental import ChunkCache
 from bytelang.compiler import ByteLangCompiler
 from bytelang.core.results.compile.abc import CompileResult
 from bytelang.tools.string import FixedStringIO
 from bytelang.utils import LogFlag
+from gen.agents import ByteCodeAgent
 from gen.agents import LowLevelAgent
 from gen.agents import MacroAgent
+from gen.agents import SourceAgent
 from gen.settings import GeneratorSettings
 from gen.trajectory import Trajectory
 
@@ -18,18 +24,57 @@ class CodeWriter:
 
     _settings: GeneratorSettings
     _bytelang: ByteLangCompiler
+    _chunk_cache: ChunkCache = field(default_factory=ChunkCache)
+    """Кэш фрагментов инкрементальной компиляции, общий для повторных экспортов"""
 
-    def run(self, trajectories: Iterable[Trajectory], bytecode_stream: BinaryIO, log_flag: LogFlag = LogFlag.ALL) -> CompileResult:
+    def __getstate__(self) -> dict[str, object]:
+        # Кэш фрагментов не передаётся в процессы пула
+        return self.__dict__ | {"_chunk_cache": ChunkCache()}
+
+    def getSettings(self) -> GeneratorSettings:
+        """Получить настройки генератора"""
+        return self._settings
+
+    def run(self, trajectories: Iterable[Trajectory], bytecode_stream: BinaryIO, log_flag: LogFlag = LogFlag.ALL, on_progress: Callable[[int], None] = None) -> CompileResult:
+        """
+        Записать байт-код напрямую: инструкции упаковываются без промежуточного текста
+        :param on_progress: Вызывается с прогрессом печати (%) по счётчику шагов, исключение прерывает запись
+        """
+        steps_total = self._calcTotalStepCount(trajectories)
+
+        def generate(emitter: ByteCodeEmitter) -> None:
+            self._processAgent(MacroAgent(ByteCodeAgent(emitter), self._settings, steps_total, on_progress), trajectories)
+
+        return self._bytelang.emit(LowLevelAgent.ENVIRONMENT, generate, bytecode_stream, log_flag)
+
+    def preload(self) -> None:
+        """Загрузить окружения заранее - перед передачей записи в другие процессы"""
+        self._bytelang.preload()
+
+    def runSource(self, trajectories: Iterable[Trajectory], bytecode_stream: BinaryIO, log_flag: LogFlag = LogFlag.ALL) -> CompileResult:
+        """Записать исходный текст программы и скомпилировать его (с подробным журналом компиляции)"""
         stream = FixedStringIO()
-        self._processAgent(MacroAgent(LowLevelAgent(stream), self._settings, self._calcTotalStepCount(trajectories)), trajectories)
+        self._processAgent(MacroAgent(SourceAgent(stream), self._settings, self._calcTotalStepCount(trajectories)), trajectories)
         stream.seek(0)
         return self._bytelang.compile(stream, bytecode_stream, log_flag)
 
+    def runIncremental(self, trajectories: Iterable[Trajectory], bytecode_stream: BinaryIO, log_flag: LogFlag = LogFlag.ALL, on_progress: Callable[[int], None] = None) -> CompileResult:
+        """
+        Записать исходный текст программы и скомпилировать его инкрементально: фрагменты неизменённых траекторий берутся из кэша.
+        Прогресс печати записывается между траекториями, поэтому сдвиг или изменение одной траектории не меняет текст остальных
+        :param on_progress: Вызывается с прогрессом печати (%) при записи исходного текста, исключение прерывает запись
+        """
+        stream = FixedStringIO()
+        self._processAgent(MacroAgent(SourceAgent(stream), self._settings, self._calcTotalStepCount(trajectories), on_progress, True), trajectories)
+        stream.seek(0)
+        return self._bytelang.compileIncremental(stream, bytecode_stream, self._chunk_cache, log_flag)
+
     def _processAgent(self, agent: MacroAgent, trajectories: Iterable[Trajectory]):
         agent.prologue()
 
         for trajectory in trajectories:
             trajectory.run(agent, self._settings)
+            agent.updateProgress()
 
         agent.epilogue()
 
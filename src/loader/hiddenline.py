@@ -0,0 +1,301 @@
+"""Удаление невидимых линий сетки"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar
+from typing import Sequence
+
+import numpy as np
+
+from loader.mesh import Mesh
+
+
+@dataclass(frozen=True, kw_only=True)
+class HiddenLineResult:
+    """Результат удаления невидимых линий"""
+
+    strokes: Sequence[np.ndarray]
+    """Непрерывные штрихи - массивы точек (M, 2) в экранных координатах"""
+    edges_total: int
+    """Рёбер видимых граней до удаления дубликатов"""
+    edges_unique: int
+    """Уникальных рёбер"""
+    segments_visible: int
+    """Видимых отрезков после отсечения"""
+
+
+class HiddenLineRemover:
+    """
+    Удаление дублирующихся и перекрытых рёбер.
+    Рёбра видимых граней объединяются через отсортированный индекс (min, max),
+    затем каждое ребро отсекается треугольниками граней, которые ближе к камере.
+    Кандидаты на перекрытие отбираются сеткой корзин в экранных координатах
+    """
+
+    MAX_GRID_SIZE: ClassVar[int] = 512
+    """Максимальное число корзин по оси"""
+
+    DEPTH_EPSILON: ClassVar[float] = 1e-6
+    """Допуск глубины относительно её диапазона"""
+
+    MIN_PIECE: ClassVar[float] = 1e-6
+    """Минимальная длина видимого участка (в долях ребра)"""
+
+    def run(self, screen: np.ndarray, depth: np.ndarray, mesh: Mesh, visible_faces: np.ndarray) -> HiddenLineResult:
+        """
+        :param screen: Экранные координаты вершин сетки (N, 2)
+        :param depth: Глубина вершин (N,), меньше - ближе к камере
+        :param mesh: Сетка
+        :param visible_faces: Маска граней, участвующих в отрисовке и перекрытии (F,)
+        """
+        corners = np.flatnonzero(visible_faces[mesh.face_ids])
+        welded = self.__weld(mesh.vertices)
+        edges, edges_total = self.__uniqueEdges(mesh, welded, corners)
+        triangles = self.__triangulate(mesh, welded, corners)
+
+        edge_ids, t0, t1 = self.__hiddenIntervals(screen, depth, edges, triangles)
+        piece_edges, piece_t0, piece_t1 = self.__visiblePieces(len(edges), edge_ids, t0, t1)
+
+        return HiddenLineResult(
+            strokes=self.__chain(screen, edges, piece_edges, piece_t0, piece_t1),
+            edges_total=edges_total,
+            edges_unique=len(edges),
+            segments_visible=len(piece_edges),
+        )
+
+    @staticmethod
+    def __nextCorners(mesh: Mesh, corners: np.ndarray) -> np.ndarray:
+        """Следующий угол в обходе грани (последний замыкается на первый)"""
+        following = corners + 1
+        last = following == mesh.face_offsets[mesh.face_ids[corners] + 1]
+        following[last] = mesh.face_offsets[mesh.face_ids[corners[last]]]
+        return following
+
+    def __uniqueEdges(self, mesh: Mesh, welded: np.ndarray, corners: np.ndarray) -> tuple[np.ndarray, int]:
+        a = welded[mesh.face_vertex_indices[corners]]
+        b = welded[mesh.face_vertex_indices[self.__nextCorners(mesh, corners)]]
+
+        lo = np.minimum(a, b)
+        hi = np.maximum(a, b)
+        keys = np.unique((lo * len(mesh.vertices) + hi)[lo != hi])
+
+        return np.stack(np.divmod(keys, len(mesh.vertices)), axis=1), len(a)
+
+    @staticmethod
+    def __weld(vertices: np.ndarray) -> np.ndarray:
+        """Канонический индекс каждой вершины: совпадающие по координатам вершины получают общий"""
+        if len(vertices) == 0:
+            return np.empty(0, np.int64)
+
+        _, first, inverse = np.unique(vertices, axis=0, return_index=True, return_inverse=True)
+        return first[inverse.ravel()].astype(np.int64)
+
+    @staticmethod
+    def __triangulate(mesh: Mesh, welded: np.ndarray, corners: np.ndarray) -> np.ndarray:
+        """Веерная триангуляция видимых граней: (T, 3) индексов вершин"""
+        faces = mesh.face_ids[corners]
+        first = mesh.face_offsets[faces]
+        inner = (corners > first) & (corners < mesh.face_offsets[faces + 1] - 1)
+
+        c = corners[inner]
+        return welded[mesh.face_vertex_indices[np.stack((first[inner], c, c + 1), axis=1)]]
+
+    def __gridSize(self, triangle_count: int) -> int:
+        return int(np.clip(np.sqrt(triangle_count), 1, self.MAX_GRID_SIZE))
+
+    @staticmethod
+    def __cellRanges(lo: np.ndarray, hi: np.ndarray, origin: np.ndarray, cell: np.ndarray, grid: int) -> tuple[np.ndarray, np.ndarray]:
+        """Диапазоны корзин [i0, i1] ограничивающих прямоугольников [lo, hi]"""
+        i0 = np.clip(((lo - origin) / cell).astype(np.int64), 0, grid - 1)
+        i1 = np.clip(((hi - origin) / cell).astype(np.int64), 0, grid - 1)
+        return i0, i1
+
+    @staticmethod
+    def __cells(i0: np.ndarray, i1: np.ndarray, grid: int) -> tuple[np.ndarray, np.ndarray]:
+        """Пары (корзина, элемент) для диапазонов корзин [i0, i1]"""
+
+        width = i1[:, 0] - i0[:, 0] + 1
+        counts = width * (i1[:, 1] - i0[:, 1] + 1)
+
+        items = np.repeat(np.arange(len(i0)), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        x = i0[items, 0] + local % width[items]
+        y = i0[items, 1] + local // width[items]
+
+        return y * grid + x, items
+
+    def __candidatePairs(self, screen: np.ndarray, edges: np.ndarray, triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Пары (ребро, треугольник) с пересекающимися корзинами"""
+        if len(edges) == 0 or len(triangles) == 0:
+            return np.empty(0, np.int64), np.empty(0, np.int64)
+
+        grid = self.__gridSize(len(triangles))
+        origin = screen.min(axis=0)
+        cell = np.maximum((screen.max(axis=0) - origin) / grid, 1e-12)
+
+        tri_points = screen[triangles]
+        tri_lo = tri_points.min(axis=1)
+        tri_hi = tri_points.max(axis=1)
+        tri_i0, tri_i1 = self.__cellRanges(tri_lo, tri_hi, origin, cell, grid)
+        tri_cells, tri_items = self.__cells(tri_i0, tri_i1, grid)
+
+        edge_points = screen[edges]
+        edge_lo = edge_points.min(axis=1)
+        edge_hi = edge_points.max(axis=1)
+        edge_i0, edge_i1 = self.__cellRanges(edge_lo, edge_hi, origin, cell, grid)
+        edge_cells, edge_items = self.__cells(edge_i0, edge_i1, grid)
+
+        order = np.argsort(tri_cells, kind="stable")
+        tri_cells = tri_cells[order]
+        tri_items = tri_items[order]
+
+        begin = np.searchsorted(tri_cells, edge_cells, side="left")
+        counts = np.searchsorted(tri_cells, edge_cells, side="right") - begin
+
+        pair_cells = np.repeat(edge_cells, counts)
+        pair_edges = np.repeat(edge_items, counts)
+        pair_triangles = tri_items[np.repeat(begin - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())]
+
+        # Пара учитывается только в первой общей корзине - так она не повторяется
+        first = np.maximum(edge_i0[pair_edges], tri_i0[pair_triangles])
+        keep = pair_cells == first[:, 1] * grid + first[:, 0]
+
+        keep &= (edge_lo[pair_edges] <= tri_hi[pair_triangles]).all(axis=1) & (tri_lo[pair_triangles] <= edge_hi[pair_edges]).all(axis=1)
+
+        # Треугольник своей грани (содержит ребро целиком) ребро не перекрывает
+        corners = triangles[pair_triangles]
+        keep &= ~((corners == edges[pair_edges, 0:1]).any(axis=1) & (corners == edges[pair_edges, 1:2]).any(axis=1))
+
+        return pair_edges[keep], pair_triangles[keep]
+
+    def __hiddenIntervals(self, screen: np.ndarray, depth: np.ndarray, edges: np.ndarray, triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Перекрытые участки рёбер: (ребро, t0, t1)"""
+        pair_edges, pair_triangles = self.__candidatePairs(screen, edges, triangles)
+
+        p0 = screen[edges[pair_edges, 0]]
+        d = screen[edges[pair_edges, 1]] - p0
+
+        a, b, c = (screen[triangles[pair_triangles, i]] for i in range(3))
+        area2 = self.__cross(b - a, c - a)
+        orientation = np.sign(area2)
+
+        t_enter = np.zeros(len(pair_edges))
+        t_exit = np.ones(len(pair_edges))
+        inside = area2 != 0
+
+        # Отсечение Кируса-Бека отрезка выпуклым треугольником
+        for start, end in ((a, b), (b, c), (c, a)):
+            e = end - start
+            f0 = self.__cross(e, p0 - start) * orientation
+            den = self.__cross(e, d) * orientation
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = -f0 / den
+
+            t_enter = np.where(den > 0, np.maximum(t_enter, t), t_enter)
+            t_exit = np.where(den < 0, np.minimum(t_exit, t), t_exit)
+            inside &= (den != 0) | (f0 >= 0)
+
+        inside &= t_exit - t_enter > self.MIN_PIECE
+
+        # Глубина в середине перекрытого участка: ребра и плоскости треугольника
+        t_mid = (t_enter + t_exit) / 2
+        m = p0 + t_mid[:, np.newaxis] * d
+
+        edge_depth = depth[edges[pair_edges, 0]] * (1 - t_mid) + depth[edges[pair_edges, 1]] * t_mid
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wa = self.__cross(b - m, c - m) / area2
+            wb = self.__cross(c - m, a - m) / area2
+            tri_depth = wa * depth[triangles[pair_triangles, 0]] + wb * depth[triangles[pair_triangles, 1]] + (1 - wa - wb) * depth[triangles[pair_triangles, 2]]
+
+        epsilon = self.DEPTH_EPSILON * max(float(np.ptp(depth)) if len(depth) else 0.0, 1e-12)
+        hidden = inside & (tri_depth < edge_depth - epsilon)
+
+        return pair_edges[hidden], t_enter[hidden], t_exit[hidden]
+
+    def __visiblePieces(self, edge_count: int, edge_ids: np.ndarray, t0: np.ndarray, t1: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Видимые участки рёбер - дополнение объединения перекрытых интервалов"""
+        hidden_edges = np.unique(edge_ids)
+        free = np.setdiff1d(np.arange(edge_count), hidden_edges, assume_unique=True)
+
+        order = np.lexsort((t0, edge_ids))
+        edge_ids = edge_ids[order]
+        t0 = t0[order]
+        t1 = t1[order]
+
+        # Накопленный максимум концов интервалов в пределах ребра: t лежит в [0, 1], смещение 2 * ребро разделяет группы
+        reach = np.maximum.accumulate(edge_ids * 2 + t1) - edge_ids * 2
+
+        group_start = np.ones(len(edge_ids), dtype=np.bool_)
+        group_start[1:] = edge_ids[1:] != edge_ids[:-1]
+
+        gap_begin = np.where(group_start, 0.0, np.roll(reach, 1))
+        gaps = t0 - gap_begin > self.MIN_PIECE
+
+        group_end = np.ones(len(edge_ids), dtype=np.bool_)
+        group_end[:-1] = group_start[1:]
+        tails = group_end & (reach < 1 - self.MIN_PIECE)
+
+        return (
+            np.concatenate((free, edge_ids[gaps], edge_ids[tails])),
+            np.concatenate((np.zeros(len(free)), gap_begin[gaps], reach[tails])),
+            np.concatenate((np.ones(len(free)), t0[gaps], np.ones(np.count_nonzero(tails)))),
+        )
+
+    @staticmethod
+    def __chain(screen: np.ndarray, edges: np.ndarray, piece_edges: np.ndarray, t0: np.ndarray, t1: np.ndarray) -> list[np.ndarray]:
+        """Объединить участки с общими концами в непрерывные штрихи"""
+        vertex_count = len(screen)
+        begin_vertex = edges[piece_edges, 0]
+        end_vertex = edges[piece_edges, 1]
+
+        # Конец участка в вершине сетки - общий узел, внутри ребра - собственный
+        begin_node = np.where(t0 == 0, begin_vertex, vertex_count + 2 * np.arange(len(piece_edges)))
+        end_node = np.where(t1 == 1, end_vertex, vertex_count + 2 * np.arange(len(piece_edges)) + 1)
+
+        p0 = screen[begin_vertex]
+        d = screen[end_vertex] - p0
+        nodes = np.empty((vertex_count + 2 * len(piece_edges), 2))
+        nodes[:vertex_count] = screen
+        nodes[vertex_count::2] = p0 + t0[:, np.newaxis] * d
+        nodes[vertex_count + 1::2] = p0 + t1[:, np.newaxis] * d
+
+        adjacency: dict[int, list[tuple[int, int]]] = dict()
+
+        for piece, (u, v) in enumerate(zip(begin_node.tolist(), end_node.tolist())):
+            adjacency.setdefault(u, []).append((piece, v))
+            adjacency.setdefault(v, []).append((piece, u))
+
+        used = bytearray(len(piece_edges))
+        strokes = list[np.ndarray]()
+
+        # Штрихи начинаются с узлов нечётной степени - так их получается меньше
+        starts = sorted(adjacency, key=lambda node: len(adjacency[node]) % 2 == 0)
+
+        for start in starts:
+            links = adjacency[start]
+
+            while links:
+                path = [start]
+                current = start
+
+                while current_links := adjacency[current]:
+                    piece, following = current_links.pop()
+
+                    if used[piece]:
+                        continue
+
+                    used[piece] = True
+                    path.append(following)
+                    current = following
+
+                if len(path) > 1:
+                    strokes.append(nodes[path])
+
+        return strokes
+
+    @staticmethod
+    def __cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+        return u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
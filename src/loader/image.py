@@ -0,0 +1,433 @@
+"""Векторизация изображений: контуры границ в упорядоченные штрихи"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import acos
+from math import inf
+from pathlib import Path
+from typing import Callable
+from typing import ClassVar
+from typing import Hashable
+from typing import Sequence
+
+import cv2
+import numpy as np
+from scipy.spatial import cKDTree
+
+from figure.impl.generative import GenerativeFigure
+from gen.trajectory import Trajectory
+from gen.vertex import VertexArrays
+
+
+@dataclass(frozen=True, kw_only=True)
+class VectorizerSettings:
+    """Настройки векторизации"""
+
+    blur_size: int = 3
+    """Размер ядра размытия перед поиском границ (0 - без размытия): меньше разрывов и шумовых границ"""
+    canny_threshold1: int = 100
+    """Нижний порог детектора Canny"""
+    canny_threshold2: int = 120
+    """Верхний порог детектора Canny"""
+    min_run_points: int = 4
+    """Участки контуров короче этого числа пикселей передаются в цепочки отдельных пикселей"""
+    min_chain_points: int = 2
+    """Цепочки отдельных пикселей короче этого числа отбрасываются (шум)"""
+    chain_gap_px: float = 2.5
+    """Наибольший шаг цепочки отдельных пикселей и разрыв между сшиваемыми штрихами"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class ImageStrokes:
+    """Штрихи изображения в порядке обхода"""
+
+    points: np.ndarray
+    """Вершины всех штрихов подряд (N, 2), координаты в [-1, 1] по большей стороне изображения"""
+    offsets: np.ndarray
+    """Начало каждого штриха в points и конец последнего (S + 1)"""
+
+    def strokeCount(self) -> int:
+        """Число штрихов"""
+        return len(self.offsets) - 1
+
+    def getStroke(self, index: int) -> np.ndarray:
+        """Вершины штриха (K, 2)"""
+        return self.points[self.offsets[index]:self.offsets[index + 1]]
+
+    def asVertices(self) -> VertexArrays:
+        """Все штрихи одной ломаной (переходы между штрихами - отрезки)"""
+        return self.points[:, 0], self.points[:, 1]
+
+
+class DirectionalChainer:
+    """
+    Цепочки отдельных пикселей: следующая точка - соседняя непосещённая с наименьшим
+    расстоянием, взвешенным углом поворота (предпочтение движению прямо).
+    Соседи всех точек находятся KD-деревом одним запросом, цепочка обрывается,
+    когда непосещённых соседей не осталось - следующая начинается с самой левой верхней непосещённой
+    """
+
+    NEIGHBOURS: ClassVar[int] = 12
+    """Число соседей, рассматриваемых на каждом шаге"""
+
+    def __init__(self, max_gap: float) -> None:
+        """
+        :param max_gap: Наибольшее расстояние между соседними точками цепочки
+        """
+        self.max_gap = max_gap
+
+    def run(self, points: np.ndarray) -> list[np.ndarray]:
+        """
+        Построить цепочки
+        :param points: Точки (N, 2)
+        :return: Индексы точек каждой цепочки
+        """
+        count = len(points)
+
+        if count == 0:
+            return []
+
+        points = np.asarray(points, dtype=np.float64)
+        distances, neighbours = cKDTree(points).query(points, k=min(self.NEIGHBOURS + 1, count), distance_upper_bound=self.max_gap)
+
+        # Шаг цепочки - несколько соседей, списки Python здесь быстрее операций numpy над малыми массивами
+        distances = distances.reshape(count, -1).tolist()
+        neighbours = neighbours.reshape(count, -1).tolist()
+        xs = points[:, 0].tolist()
+        ys = points[:, 1].tolist()
+
+        visited = bytearray(count)
+        ret = list[np.ndarray]()
+
+        for start in np.lexsort((points[:, 1], points[:, 0])).tolist():
+            if visited[start]:
+                continue
+
+            visited[start] = True
+            chain = [start]
+            current = start
+            direction_x, direction_y = 1.0, 0.0
+
+            while True:
+                best = -1
+                best_weight = inf
+
+                # Отсутствующие соседи: индекс count, расстояние inf
+                for candidate, length in zip(neighbours[current], distances[current]):
+                    if candidate == count or visited[candidate]:
+                        continue
+
+                    cos = ((xs[candidate] - xs[current]) * direction_x + (ys[candidate] - ys[current]) * direction_y) / length
+                    weight = length * (1 + acos(min(1.0, max(-1.0, cos))))
+
+                    if weight < best_weight:
+                        best = candidate
+                        best_weight = weight
+                        best_length = length
+
+                if best == -1:
+                    break
+
+                direction_x = (xs[best] - xs[current]) / best_length
+                direction_y = (ys[best] - ys[current]) / best_length
+                visited[best] = True
+                chain.append(best)
+                current = best
+
+            ret.append(np.array(chain, dtype=np.int64))
+
+        return ret
+
+
+class ImageVectorizer:
+    """
+    Изображение в штрихи: границы Canny трассируются cv2.findContours.
+    Контур тонкой линии проходит её туда и обратно - повторно пройденные пиксели отбрасываются.
+    Короткие остатки контуров, соседние с уже проведёнными участками, рисуются ими и отбрасываются,
+    остальные пиксели соединяются DirectionalChainer.
+    Штрихи упорядочиваются вдоль кривой Гильберта (жадный обход десятков тысяч штрихов слишком долог),
+    при экспорте порядок траекторий дополнительно улучшает RouteOptimizer
+    """
+
+    LINK_CANDIDATES: ClassVar[int] = 6
+    """Число ближайших концов, рассматриваемых при сшивании"""
+
+    LINK_TANGENT_POINTS: ClassVar[int] = 3
+    """Касательная на конце штриха строится по этому числу последних вершин"""
+
+    LINK_MAX_TURN: ClassVar[float] = np.pi / 3
+    """Наибольший поворот на конце штриха при сшивании (рад)"""
+
+    def __init__(self, settings: VectorizerSettings = VectorizerSettings()) -> None:
+        self.settings = settings
+
+    def load(self, path: Path) -> ImageStrokes:
+        """
+        Векторизовать файл изображения
+        :return: Штрихи. ValueError - файл не удалось прочитать как изображение
+        """
+        image = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+
+        if image is None:
+            raise ValueError(f"Не удалось загрузить изображение: {path}")
+
+        return self.run(image)
+
+    def run(self, image: np.ndarray) -> ImageStrokes:
+        """Векторизовать изображение в оттенках серого (H, W) uint8"""
+        height, width = image.shape[:2]
+
+        if self.settings.blur_size > 1:
+            image = cv2.GaussianBlur(image, (self.settings.blur_size | 1, self.settings.blur_size | 1), 0)
+
+        edges = cv2.Canny(image, self.settings.canny_threshold1, self.settings.canny_threshold2)
+
+        run_points, run_offsets = self._traceRuns(edges)
+        loose = self._loosePoints(edges, run_points)
+        chains = [chain for chain in DirectionalChainer(self.settings.chain_gap_px).run(loose) if len(chain) >= self.settings.min_chain_points]
+
+        if chains:
+            chain_points = loose[np.concatenate(chains)]
+            chain_offsets = np.cumsum([len(chain) for chain in chains]) + len(run_points)
+            run_points = np.concatenate((run_points, chain_points.astype(run_points.dtype)))
+            run_offsets = np.concatenate((run_offsets, chain_offsets))
+
+        points, offsets = self._link(run_points, run_offsets)
+        points, offsets = self._order(points, offsets, max(width, height))
+        points = points.astype(np.float64)
+
+        # Пиксели в [-1, 1] по большей стороне, ось Y вверх
+        half = max(width, height, 2) / 2
+        points[:, 0] = (points[:, 0] - (width - 1) / 2) / half
+        points[:, 1] = ((height - 1) / 2 - points[:, 1]) / half
+
+        return ImageStrokes(points=points, offsets=offsets)
+
+    def _traceRuns(self, edges: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Участки контуров из ещё не пройденных пикселей: вершины подряд (N, 2) и границы участков (S + 1)"""
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
+
+        if not contours:
+            return np.zeros((0, 2), dtype=np.int32), np.zeros(1, dtype=np.int64)
+
+        points = np.concatenate(contours).reshape(-1, 2)
+        lengths = np.array([len(contour) for contour in contours], dtype=np.int64)
+        contour_starts = np.zeros(len(points), dtype=np.bool_)
+        contour_starts[np.cumsum(lengths[:-1])] = True
+        contour_starts[0] = True
+
+        # Пиксель остаётся в участке только при первом появлении среди всех контуров
+        pixel = points[:, 1].astype(np.int64) * edges.shape[1] + points[:, 0]
+        order = np.arange(len(points))
+        first = np.full(edges.size, len(points), dtype=np.int64)
+        np.minimum.at(first, pixel, order)
+        keep = first[pixel] == order
+
+        begins = keep.copy()
+        begins[1:] &= ~keep[:-1] | contour_starts[1:]
+        ends = keep.copy()
+        ends[:-1] &= ~keep[1:] | contour_starts[1:]
+
+        begin_index = np.flatnonzero(begins)
+        end_index = np.flatnonzero(ends) + 1
+        long = end_index - begin_index >= self.settings.min_run_points
+
+        return self._gather(points, begin_index[long], end_index[long] - begin_index[long], np.zeros(np.count_nonzero(long), dtype=np.bool_))
+
+    @staticmethod
+    def _loosePoints(edges: np.ndarray, run_points: np.ndarray) -> np.ndarray:
+        """Пиксели границ вне длинных участков и не соседние с ними"""
+        covered = np.zeros(edges.shape, dtype=np.uint8)
+        covered[run_points[:, 1], run_points[:, 0]] = 1
+
+        # Соседний с участком пиксель перо уже закрашивает
+        covered = cv2.dilate(covered, np.ones((3, 3), dtype=np.uint8))
+
+        y, x = np.nonzero((edges != 0) & (covered == 0))
+        return np.stack((x, y), axis=1)
+
+    def _link(self, points: np.ndarray, offsets: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Сшить штрихи, концы которых ближе chain_gap_px: Canny рвёт тонкие наклонные линии на фрагменты.
+        Связь продолжает касательные обоих концов, у каждого конца не больше одной связи
+        """
+        count = len(offsets) - 1
+
+        if count < 2:
+            return points, offsets
+
+        # Концы штриха s: 2s - начало, 2s + 1 - конец. Касательная направлена из штриха наружу
+        lengths = np.diff(offsets)
+        inner = np.minimum(lengths - 1, self.LINK_TANGENT_POINTS)
+        endpoints = np.empty((count * 2, 2), dtype=np.float64)
+        endpoints[0::2] = points[offsets[:-1]]
+        endpoints[1::2] = points[offsets[1:] - 1]
+        tangents = np.empty((count * 2, 2), dtype=np.float64)
+        tangents[0::2] = endpoints[0::2] - points[offsets[:-1] + inner]
+        tangents[1::2] = endpoints[1::2] - points[offsets[1:] - 1 - inner]
+        tangents /= np.maximum(np.linalg.norm(tangents, axis=1), 1e-9)[:, np.newaxis]
+
+        size = count * 2
+        distances, found = cKDTree(endpoints).query(endpoints, k=self.LINK_CANDIDATES + 1, distance_upper_bound=self.settings.chain_gap_px)
+        found = np.minimum(found, size - 1)
+
+        # Стоимость связи: длина разрыва, увеличенная поворотами на обоих концах
+        vectors = endpoints[found] - endpoints[:, np.newaxis]
+        vectors /= np.maximum(distances, 1e-9)[..., np.newaxis]
+        turn_out = np.arccos(np.clip(np.einsum("ij,ikj->ik", tangents, vectors), -1, 1))
+        turn_in = np.arccos(np.clip(-np.einsum("ikj,ikj->ik", tangents[found], vectors), -1, 1))
+        cost = distances * (1 + turn_out + turn_in)
+
+        # Пара концов учитывается один раз - со стороны штриха с меньшим номером
+        own = np.arange(size)[:, np.newaxis] // 2
+        valid = np.isfinite(distances) & (found > own * 2 + 1) & (turn_out <= self.LINK_MAX_TURN) & (turn_in <= self.LINK_MAX_TURN)
+        first, candidate = np.nonzero(valid)
+        second = found[first, candidate]
+        order = np.argsort(cost[first, candidate], kind="stable")
+
+        # Жадное паросочетание концов: связи от дешёвых к дорогим, каждый конец - не более одной связи
+        partner = [-1] * size
+
+        for i, j in zip(first[order].tolist(), second[order].tolist()):
+            if partner[i] == -1 and partner[j] == -1:
+                partner[i] = j
+                partner[j] = i
+
+        visited = bytearray(count)
+        sequence = list[int]()
+        is_reversed = list[bool]()
+        breaks = list[int]()
+
+        def follow(stroke: int, backward: bool) -> None:
+            while not visited[stroke]:
+                visited[stroke] = True
+                sequence.append(stroke)
+                is_reversed.append(backward)
+
+                linked = partner[stroke * 2 if backward else stroke * 2 + 1]
+
+                if linked == -1:
+                    break
+
+                stroke, backward = linked // 2, linked % 2 == 1
+
+            breaks.append(len(sequence))
+
+        # Сначала цепочки от свободных концов, затем замкнутые кольца
+        for stroke in range(count):
+            if not visited[stroke] and partner[stroke * 2] == -1:
+                follow(stroke, False)
+
+            elif not visited[stroke] and partner[stroke * 2 + 1] == -1:
+                follow(stroke, True)
+
+        for stroke in range(count):
+            if not visited[stroke]:
+                follow(stroke, False)
+
+        sequence = np.array(sequence, dtype=np.int64)
+        linked_points, linked_offsets = self._gather(points, offsets[:-1][sequence], np.diff(offsets)[sequence], np.array(is_reversed, dtype=np.bool_))
+        return linked_points, linked_offsets[np.array((0, *breaks))]
+
+    @classmethod
+    def _order(cls, points: np.ndarray, offsets: np.ndarray, size: int) -> tuple[np.ndarray, np.ndarray]:
+        """Порядок штрихов по кривой Гильберта, направление - к ближнему концу от конца предыдущего"""
+        if len(offsets) < 2:
+            return points, offsets
+
+        begins = points[offsets[:-1]].astype(np.int64)
+        ends = points[offsets[1:] - 1].astype(np.int64)
+        middles = (begins + ends) // 2
+        order = np.argsort(cls._hilbertIndex(middles[:, 0], middles[:, 1], size), kind="stable")
+
+        is_reversed = np.zeros(len(order), dtype=np.bool_)
+        begins_list = begins[order].tolist()
+        ends_list = ends[order].tolist()
+        x, y = begins_list[0]
+
+        for i, ((begin_x, begin_y), (end_x, end_y)) in enumerate(zip(begins_list, ends_list)):
+            if (end_x - x) ** 2 + (end_y - y) ** 2 < (begin_x - x) ** 2 + (begin_y - y) ** 2:
+                is_reversed[i] = True
+                x, y = begin_x, begin_y
+
+            else:
+                x, y = end_x, end_y
+
+        return cls._gather(points, offsets[:-1][order], np.diff(offsets)[order], is_reversed)
+
+    @staticmethod
+    def _gather(points: np.ndarray, begins: np.ndarray, lengths: np.ndarray, is_reversed: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Собрать участки points[begin:begin + length] подряд (развёрнутые - в обратном порядке)"""
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        step = np.where(is_reversed, -1, 1)
+        first = np.where(is_reversed, begins + lengths - 1, begins)
+        position = np.arange(offsets[-1]) - np.repeat(offsets[:-1], lengths)
+        return points[np.repeat(first, lengths) + np.repeat(step, lengths) * position], offsets
+
+    @staticmethod
+    def _hilbertIndex(x: np.ndarray, y: np.ndarray, size: int) -> np.ndarray:
+        """Номера точек на кривой Гильберта, покрывающей квадрат со стороной не меньше size"""
+        side = 1 << max(1, int(size - 1).bit_length())
+        x = x.copy()
+        y = y.copy()
+        ret = np.zeros(len(x), dtype=np.int64)
+        s = side // 2
+
+        while s > 0:
+            rx = (x & s) > 0
+            ry = (y & s) > 0
+            ret += s * s * ((3 * rx) ^ ry)
+
+            # Поворот четверти
+            flip = ~ry & rx
+            x[flip] = side - 1 - x[flip]
+            y[flip] = side - 1 - y[flip]
+            swap = ~ry
+            x[swap], y[swap] = y[swap], x[swap]
+            s //= 2
+
+        return ret
+
+
+class ImageFigure(GenerativeFigure):
+    """Фигура из штрихов изображения, при экспорте каждый штрих - отдельная траектория"""
+
+    def __init__(self, label: str, on_delete: Callable, on_clone: Callable, strokes: ImageStrokes) -> None:
+        super().__init__(label, on_delete, on_clone)
+        self._strokes = strokes
+
+    def _getCloneInstance(self, name: str, on_delete: Callable, on_clone: Callable) -> ImageFigure:
+        return ImageFigure(name, on_delete, on_clone, self._strokes)
+
+    def _generateVertices(self) -> VertexArrays:
+        return self._strokes.asVertices()
+
+    def _getGeometryKey(self) -> Hashable:
+        return ()
+
+    def toTrajectories(self) -> Sequence[Trajectory]:
+        if not self._export_checkbox.getValue():
+            return ()
+
+        ret = list[Trajectory]()
+
+        for i in range(self._strokes.strokeCount()):
+            stroke = self._strokes.getStroke(i)
+            x, y = self._applyTransform((stroke[:, 0], stroke[:, 1]))
+
+            if len(x) > 1:
+                ret.append(self._makeTrajectory(f"{self._name} : {len(ret)}", x, y))
+
+        return ret
+
+
+class ImageLoader:
+
+    def __init__(self, settings: VectorizerSettings = VectorizerSettings()) -> None:
+        self._vectorizer = ImageVectorizer(settings)
+
+    def load(self, path: Path, on_delete: Callable, on_clone: Callable) -> Sequence[ImageFigure]:
+        """Векторизовать изображение. ValueError - файл не удалось прочитать"""
+        return ImageFigure(path.stem, on_delete, on_clone, self._vectorizer.load(path)),
@@ -0,0 +1,129 @@
+"""Полигональная сетка в массивах NumPy"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Callable
+
+import numpy as np
+
+from gen.spatial import NearestUnvisitedIndex
+
+NO_INDEX = -1
+"""Индекс отсутствующего элемента (например, нормали у грани вида v/t)"""
+
+
+@dataclass(frozen=True, kw_only=True)
+class Mesh:
+    """
+    Сетка: вершины и нормали - массивы Nx3 float64,
+    грани хранятся в формате CSR (смещения и плоский массив индексов)
+    """
+
+    vertices: np.ndarray
+    """Вершины (N, 3) float64"""
+    normals: np.ndarray
+    """Нормали (M, 3) float64"""
+    face_offsets: np.ndarray
+    """Смещения граней (F + 1,) int64: индексы грани i лежат в [face_offsets[i], face_offsets[i + 1])"""
+    face_vertex_indices: np.ndarray
+    """Индексы вершин граней (K,) int32"""
+    face_normal_indices: np.ndarray
+    """Индексы нормалей граней (K,) int32, NO_INDEX если нормаль не задана"""
+
+    def faceCount(self) -> int:
+        """Количество граней"""
+        return len(self.face_offsets) - 1
+
+    @cached_property
+    def face_sizes(self) -> np.ndarray:
+        """Количество вершин каждой грани (F,)"""
+        return np.diff(self.face_offsets)
+
+    @cached_property
+    def face_ids(self) -> np.ndarray:
+        """Номер грани для каждого элемента face_vertex_indices (K,)"""
+        return np.repeat(np.arange(self.faceCount()), self.face_sizes)
+
+    @cached_property
+    def face_centroids(self) -> np.ndarray:
+        """Центры граней (F, 3)"""
+        return self._reduceFaces(self.vertices[self.face_vertex_indices]) / self.face_sizes[:, np.newaxis]
+
+    @cached_property
+    def face_normals(self) -> np.ndarray:
+        """
+        Нормали граней (F, 3): среднее нормалей вершин грани из vn,
+        если они не заданы - нормаль по обходу вершин (метод Ньюэлла)
+        """
+        has_normals = np.logical_and.reduceat(self.face_normal_indices != NO_INDEX, self.face_offsets[:-1]) if self.faceCount() else np.ones(0, np.bool_)
+
+        if has_normals.all():
+            return self._reduceFaces(self.normals[self.face_normal_indices]) / self.face_sizes[:, np.newaxis]
+
+        ret = self._newellNormals()
+
+        if has_normals.any():
+            normals = self.normals[np.where(self.face_normal_indices == NO_INDEX, 0, self.face_normal_indices)]
+            averaged = self._reduceFaces(normals) / self.face_sizes[:, np.newaxis]
+            ret[has_normals] = averaged[has_normals]
+
+        return ret
+
+    def sortFaces(self, on_progress: Callable[[float], None] = None) -> Mesh:
+        """
+        Упорядочить грани жадным обходом: следующая - ближайшая по центру из оставшихся
+        :param on_progress: Вызывается с долей обработанных граней примерно на каждый процент
+        """
+        centroids = self.face_centroids
+        count = len(centroids)
+
+        order = np.empty(count, dtype=np.int64)
+        index = NearestUnvisitedIndex(centroids)
+        current = 0
+        progress_step = max(1, count // 100)
+
+        for step in range(count):
+            if on_progress is not None and step % progress_step == 0:
+                on_progress(step / count)
+
+            order[step] = current
+            index.visit(current)
+
+            if (following := index.nearest(centroids[current])) is not None:
+                current = following
+
+        return self.reordered(order)
+
+    def reordered(self, order: np.ndarray) -> Mesh:
+        """Получить сетку с гранями в заданном порядке"""
+        sizes = self.face_sizes[order]
+        offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        # Индексы элементов CSR в новом порядке
+        items = np.repeat(self.face_offsets[order] - offsets[:-1], sizes) + np.arange(offsets[-1])
+
+        return Mesh(
+            vertices=self.vertices,
+            normals=self.normals,
+            face_offsets=offsets,
+            face_vertex_indices=self.face_vertex_indices[items],
+            face_normal_indices=self.face_normal_indices[items],
+        )
+
+    def _reduceFaces(self, values: np.ndarray) -> np.ndarray:
+        """Сумма значений по граням"""
+        if self.faceCount() == 0:
+            return np.zeros((0, *values.shape[1:]), dtype=values.dtype)
+
+        return np.add.reduceat(values, self.face_offsets[:-1], axis=0)
+
+    def _newellNormals(self) -> np.ndarray:
+        current = self.vertices[self.face_vertex_indices]
+
+        following = np.arange(1, len(self.face_vertex_indices) + 1)
+        following[self.face_offsets[1:] - 1] = self.face_offsets[:-1]
+        following = current[following]
+
+        return self._reduceFaces(np.cross(current, following))
@@ -0,0 +1,131 @@
+"""
+Фоновый импорт OBJ: разбор и упорядочивание граней выполняются в пуле процессов.
+Модуль не импортирует DearPyGui - он загружается процессами пула
+"""
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import CancelledError
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.managers import SyncManager
+from pathlib import Path
+from typing import Any
+from typing import ClassVar
+from typing import Optional
+from typing import Sequence
+
+from loader.mesh import Mesh
+from loader.objparser import ObjParser
+from tools import BackgroundTask
+
+type ObjMeshes = Sequence[tuple[str, Mesh]]
+
+
+class ObjImportTask(BackgroundTask):
+    """Импорт одного файла"""
+
+    def __init__(self, path: Path, future: Future[ObjMeshes], progress: Any, cancel_event: Any) -> None:
+        self.path = path
+        """Импортируемый файл"""
+        self._future = future
+        self._progress = progress
+        self._cancel_event = cancel_event
+
+    def getTitle(self) -> str:
+        return f"Импорт {self.path.name}"
+
+    def getProgress(self) -> float:
+        if self._future.done():
+            return 1.0
+
+        try:
+            return self._progress.value
+
+        except (OSError, EOFError):
+            # Менеджер уже остановлен
+            return 0.0
+
+    def isDone(self) -> bool:
+        return self._future.done()
+
+    def cancel(self) -> None:
+        if not self._future.cancel():
+            self._cancel_event.set()
+
+    def getResult(self) -> ObjMeshes:
+        """
+        Сетки файла (с упорядоченными гранями)
+        :return: Пары (имя объекта, сетка). CancelledError - импорт отменён, OSError/ValueError - ошибка чтения
+        """
+        return self._future.result()
+
+
+class ObjImporter:
+    """Параллельный импорт файлов OBJ"""
+
+    PARSE_WEIGHT: ClassVar[float] = 0.2
+    """Доля разбора файла в прогрессе импорта (остальное - упорядочивание граней)"""
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """
+        :param max_workers: Число процессов. None - по числу процессоров
+        """
+        self._max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager: Optional[SyncManager] = None
+
+    def submit(self, paths: Sequence[Path]) -> Sequence[ObjImportTask]:
+        """Запустить импорт файлов, каждый файл - отдельная задача пула"""
+        if self._executor is None:
+            # spawn: главный процесс многопоточный (DearPyGui, фоновый пересчёт фигур), fork небезопасен
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._executor = ProcessPoolExecutor(self._max_workers, mp_context=context)
+
+        ret = list[ObjImportTask]()
+
+        for path in paths:
+            progress = self._manager.Value("d", 0.0)
+            cancel_event = self._manager.Event()
+            future = self._executor.submit(_importFile, path, progress, cancel_event, self.PARSE_WEIGHT)
+            ret.append(ObjImportTask(path, future, progress, cancel_event))
+
+        return ret
+
+    def shutdown(self) -> None:
+        """Остановить процессы, незапущенные задачи отменяются"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+
+def _importFile(path: Path, progress: Any, cancel_event: Any, parse_weight: float) -> ObjMeshes:
+    def check() -> None:
+        if cancel_event.is_set():
+            raise CancelledError(f"Импорт {path} отменён")
+
+    with open(path) as f:
+        meshes = ObjParser().run(f, path.stem)
+
+    check()
+    progress.value = parse_weight
+
+    faces_total = max(1, sum(mesh.faceCount() for _, mesh in meshes))
+    faces_done = 0
+    ret = list[tuple[str, Mesh]]()
+
+    for name, mesh in meshes:
+        def onProgress(part: float, done: int = faces_done, count: int = mesh.faceCount()) -> None:
+            check()
+            progress.value = parse_weight + (1 - parse_weight) * (done + part * count) / faces_total
+
+        ret.append((name, mesh.sortFaces(onProgress)))
+        faces_done += mesh.faceCount()
+
+    progress.value = 1.0
+    return ret
@@ -0,0 +1,304 @@
+"""Разбор OBJ файла"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import ClassVar
+from typing import Optional
+from typing import Sequence
+from typing import TextIO
+
+import numpy as np
+
+from loader.mesh import Mesh
+from loader.mesh import NO_INDEX
+
+
+@dataclass
+class _LineBlock:
+    """Накопленные строки одного типа"""
+
+    lines: list[str] = field(default_factory=list)
+    """Данные строк (без тега)"""
+    numbers: list[int] = field(default_factory=list)
+    """Номера строк в файле"""
+
+    def clear(self) -> None:
+        self.lines.clear()
+        self.numbers.clear()
+
+
+@dataclass
+class _ObjectFaces:
+    """Разобранные грани одного объекта OBJ"""
+
+    name: str
+    """Наименование объекта"""
+    block: _LineBlock = field(default_factory=_LineBlock)
+    """Ещё не разобранные строки 'f'"""
+    relative: dict[int, tuple[int, int]] = field(default_factory=dict)
+    """Грани блока с отрицательными индексами: номер строки в блоке -> (вершин, нормалей) объявлено до неё"""
+    sizes: list[np.ndarray] = field(default_factory=list)
+    """Число вершин граней по блокам"""
+    vertex_indices: list[np.ndarray] = field(default_factory=list)
+    """Индексы вершин по блокам (от 0)"""
+    normal_indices: list[np.ndarray] = field(default_factory=list)
+    """Индексы нормалей по блокам (от 0, NO_INDEX - не задана)"""
+    line_numbers: list[np.ndarray] = field(default_factory=list)
+    """Номера строк граней по блокам"""
+
+
+class ObjParser:
+    """
+    Разбор OBJ файла в массивы.
+    Строки собираются по типу блоками до BLOCK_LINES, каждый блок разбирается пакетно и освобождается,
+    поэтому в памяти не хранятся строки всего файла.
+    Ошибки формата - ValueError с номером строки
+    """
+
+    BLOCK_LINES: ClassVar[int] = 1 << 16
+    """Строк одного типа, разбираемых за раз"""
+
+    _FACE_VN: ClassVar[re.Pattern[str]] = re.compile(r"-?\d+//-?\d+(?: -?\d+//-?\d+)*")
+    """Все элементы граней блока в форме v//n"""
+    _FACE_VTN: ClassVar[re.Pattern[str]] = re.compile(r"-?\d+/-?\d+/-?\d+(?: -?\d+/-?\d+/-?\d+)*")
+    """Все элементы граней блока в форме v/t/n"""
+    _FACE_VT: ClassVar[re.Pattern[str]] = re.compile(r"-?\d+/-?\d+(?: -?\d+/-?\d+)*")
+    """Все элементы граней блока в форме v/t"""
+
+    def run(self, stream: TextIO, default_name: str) -> Sequence[tuple[str, Mesh]]:
+        """
+        Разобрать поток OBJ
+        :param stream: Источник
+        :param default_name: Имя объекта для граней, объявленных до первого 'o'
+        :return: Пары (имя объекта, сетка). Объекты без граней пропускаются
+        """
+        vertex_block = _LineBlock()
+        normal_block = _LineBlock()
+        vertices = list[np.ndarray]()
+        normals = list[np.ndarray]()
+        vertices_count = 0
+        normals_count = 0
+        objects = list[_ObjectFaces]()
+        current: Optional[_ObjectFaces] = None
+        block_lines = self.BLOCK_LINES
+
+        for number, line in enumerate(stream, 1):
+            parts = line.split(None, 1)
+
+            if len(parts) != 2:
+                continue
+
+            tag, data = parts
+
+            match tag:
+                case 'v':
+                    vertex_block.lines.append(data)
+                    vertex_block.numbers.append(number)
+                    vertices_count += 1
+
+                    if len(vertex_block.lines) >= block_lines:
+                        vertices.append(self._parseVectors(stream, vertex_block))
+
+                case 'vn':
+                    normal_block.lines.append(data)
+                    normal_block.numbers.append(number)
+                    normals_count += 1
+
+                    if len(normal_block.lines) >= block_lines:
+                        normals.append(self._parseVectors(stream, normal_block))
+
+                case 'f':
+                    if current is None:
+                        current = _ObjectFaces(default_name)
+                        objects.append(current)
+
+                    face_block = current.block
+
+                    if '-' in data:
+                        current.relative[len(face_block.lines)] = vertices_count, normals_count
+
+                    face_block.lines.append(data)
+                    face_block.numbers.append(number)
+
+                    if len(face_block.lines) >= block_lines:
+                        self._parseFaces(stream, current)
+
+                case 'o':
+                    if current is not None:
+                        self._parseFaces(stream, current)
+
+                    current = _ObjectFaces(data.strip())
+                    objects.append(current)
+
+        if current is not None:
+            self._parseFaces(stream, current)
+
+        vertices.append(self._parseVectors(stream, vertex_block))
+        normals.append(self._parseVectors(stream, normal_block))
+        vertices_array = np.concatenate(vertices)
+        normals_array = np.concatenate(normals)
+
+        return tuple(
+            (o.name, self._makeMesh(stream, o, vertices_array, normals_array))
+            for o in objects
+            if o.sizes
+        )
+
+    @staticmethod
+    def _err(stream: TextIO, msg: str) -> ValueError:
+        return ValueError(f"Err : {ObjParser.__name__} : ( '{getattr(stream, 'name', stream)}' ) : {msg}")
+
+    def _parseVectors(self, stream: TextIO, block: _LineBlock) -> np.ndarray:
+        """Разобрать блок строк 'v' или 'vn' и очистить его"""
+        try:
+            flat = np.array(" ".join(block.lines).split(), dtype=np.float64)
+
+            if flat.size == len(block.lines) * 3:
+                ret = flat.reshape(-1, 3)
+
+            else:
+                # Встречаются дополнительные компоненты (w, цвет вершины)
+                rows = [line.split()[:3] for line in block.lines]
+
+                if any(len(row) != 3 for row in rows):
+                    raise ValueError("expected 3 components")
+
+                ret = np.array(rows, dtype=np.float64)
+
+        except ValueError as e:
+            number = self._findInvalidLine(block, lambda line: len(np.array(line.split()[:3], dtype=np.float64)) == 3)
+            raise self._err(stream, f"line {number}: invalid vector: {e}")
+
+        block.clear()
+        return ret.reshape(-1, 3)
+
+    def _parseFaces(self, stream: TextIO, faces: _ObjectFaces) -> None:
+        """Разобрать накопленный блок строк 'f' объекта и очистить его"""
+        block = faces.block
+
+        if not block.lines:
+            return
+
+        tokens = list[str]()
+        sizes = np.empty(len(block.lines), dtype=np.int64)
+
+        for i, line in enumerate(block.lines):
+            line_tokens = line.split()
+            sizes[i] = len(line_tokens)
+            tokens += line_tokens
+
+        try:
+            v, n = self._parseFaceIndices(tokens)
+
+        except ValueError as e:
+            number = self._findInvalidLine(block, lambda line: self._parseFaceIndices(line.split()) is not None)
+            raise self._err(stream, f"line {number}: invalid face: {e}")
+
+        # Отрицательный индекс отсчитывается от последней объявленной к этому моменту вершины
+        v_base = np.zeros_like(v)
+        n_base = np.zeros_like(n)
+
+        if faces.relative:
+            offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+            np.cumsum(sizes, out=offsets[1:])
+
+            for face, (v_declared, n_declared) in faces.relative.items():
+                v_base[offsets[face]:offsets[face + 1]] = v_declared
+                n_base[offsets[face]:offsets[face + 1]] = n_declared
+
+        faces.sizes.append(sizes)
+        faces.vertex_indices.append(np.where(v < 0, v + v_base, v - 1))
+        faces.normal_indices.append(np.where(n < 0, n + n_base, np.where(n == 0, NO_INDEX, n - 1)))
+        faces.line_numbers.append(np.array(block.numbers, dtype=np.int64))
+
+        block.clear()
+        faces.relative.clear()
+
+    @staticmethod
+    def _parseFaceIndices(tokens: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Сырые индексы вершин и нормалей (как в файле, 0 - нормаль не задана)"""
+        total = len(tokens)
+        text = " ".join(tokens)
+
+        if "/" not in text:
+            v = np.array(tokens, dtype=np.int64)
+            return v, np.zeros_like(v)
+
+        # Пакетный разбор - только если все элементы блока записаны в одной форме
+        if ObjParser._FACE_VN.fullmatch(text):
+            vn = np.array(text.replace("//", " ").split(), dtype=np.int64).reshape(-1, 2)
+            return vn[:, 0], vn[:, 1]
+
+        if ObjParser._FACE_VTN.fullmatch(text):
+            vtn = np.array(text.replace("/", " ").split(), dtype=np.int64).reshape(-1, 3)
+            return vtn[:, 0], vtn[:, 2]
+
+        if ObjParser._FACE_VT.fullmatch(text):
+            vt = np.array(text.replace("/", " ").split(), dtype=np.int64).reshape(-1, 2)
+            return vt[:, 0], np.zeros(total, dtype=np.int64)
+
+        # Формы записи смешаны в пределах блока
+        v = np.empty(total, dtype=np.int64)
+        n = np.zeros(total, dtype=np.int64)
+
+        for i, token in enumerate(tokens):
+            v_part, _, rest = token.partition("/")
+            _, _, n_part = rest.partition("/")
+            v[i] = int(v_part)
+
+            if n_part:
+                n[i] = int(n_part)
+
+        return v, n
+
+    @staticmethod
+    def _findInvalidLine(block: _LineBlock, check: Callable[[str], bool]) -> int:
+        """Номер первой строки блока, которая не разбирается отдельно (0 - не найдена)"""
+        for line, number in zip(block.lines, block.numbers):
+            try:
+                if not check(line):
+                    return number
+
+            except ValueError:
+                return number
+
+        return 0
+
+    def _makeMesh(self, stream: TextIO, faces: _ObjectFaces, vertices: np.ndarray, normals: np.ndarray) -> Mesh:
+        sizes = np.concatenate(faces.sizes)
+        v = np.concatenate(faces.vertex_indices)
+        n = np.concatenate(faces.normal_indices)
+
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+
+        def check(indices: np.ndarray, mask: np.ndarray, count: int, what: str) -> None:
+            invalid = mask & ((indices < 0) | (indices >= count))
+
+            if invalid.any():
+                face = np.searchsorted(offsets, invalid.argmax(), side="right") - 1
+                number = np.concatenate(faces.line_numbers)[face]
+                raise self._err(stream, f"line {number}: {what} index out of range in '{faces.name}'")
+
+        check(v, np.ones(len(v), dtype=np.bool_), len(vertices), "vertex")
+
+        has_normal = n != NO_INDEX
+        check(n, has_normal, len(normals), "normal")
+
+        # Объект хранит только используемые им вершины и нормали
+        used_vertices, face_vertex_indices = np.unique(v, return_inverse=True)
+        used_normals, local_normals = np.unique(n[has_normal], return_inverse=True)
+
+        face_normal_indices = np.full(len(n), NO_INDEX, dtype=np.int32)
+        face_normal_indices[has_normal] = local_normals
+
+        return Mesh(
+            vertices=vertices[used_vertices],
+            normals=normals[used_normals],
+            face_offsets=offsets,
+            face_vertex_indices=face_vertex_indices.astype(np.int32),
+            face_normal_indices=face_normal_indices,
+        )
@@ -0,0 +1,153 @@
+"""Проекция полигональной сетки на плоскость"""
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from math import cos
+from math import radians
+from math import sin
+from typing import ClassVar
+
+import numpy as np
+
+from gen.vertex import Vec2f
+from gen.vertex import Vec2i
+from gen.vertex import VertexArrays
+from loader.hiddenline import HiddenLineRemover
+from loader.hiddenline import HiddenLineResult
+from loader.mesh import Mesh
+
+type Points3D = np.ndarray
+"""Массив точек (N, 3) float64"""
+
+
+def rotationMatrix(angle_x: float, angle_y: float) -> np.ndarray:
+    """Матрица поворота 3x3: сначала вокруг оси Y, затем вокруг оси X (углы в градусах)"""
+    rx, ry = np.radians((angle_x, angle_y))
+    cx, sx = np.cos(rx), np.sin(rx)
+    cy, sy = np.cos(ry), np.sin(ry)
+
+    rotation_x = np.array((
+        (1, 0, 0),
+        (0, cx, -sx),
+        (0, sx, cx),
+    ))
+
+    rotation_y = np.array((
+        (cy, 0, sy),
+        (0, 1, 0),
+        (-sy, 0, cy),
+    ))
+
+    return rotation_x @ rotation_y
+
+
+class Projector(ABC):
+    """Проектор"""
+
+    @abstractmethod
+    def apply(self, points: Points3D) -> VertexArrays:
+        """Спроецировать точки на дисплей"""
+
+    @abstractmethod
+    def depth(self, points: Points3D) -> np.ndarray:
+        """Глубина точек: меньше - ближе к камере"""
+
+
+class IsometricProjector(Projector):
+    COS_30: ClassVar[float] = cos(radians(30))
+    SIN_30: ClassVar[float] = sin(radians(30))
+    VIEW_AXIS: ClassVar[np.ndarray] = np.array((1.0, -1.0, 1.0))
+    """Направление взгляда (от камеры)"""
+
+    def apply(self, points: Points3D) -> VertexArrays:
+        x, y, z = points.T
+        return (
+            (x - z) * self.COS_30,
+            (x + z) * self.SIN_30 + y
+        )
+
+    def depth(self, points: Points3D) -> np.ndarray:
+        return points @ self.VIEW_AXIS
+
+
+@dataclass
+class PerspectiveProjector(Projector):
+    def __init__(self, focal: float = 0.5, epsilon: float = 1e-9):
+        self.focal = focal
+        self.epsilon = epsilon  # Минимальное значение для избежания деления на 0
+
+    def apply(self, points: Points3D) -> VertexArrays:
+        x, y, z = points.T
+        safe_z = np.where(np.abs(z) > self.epsilon, z, np.where(z >= 0, self.epsilon, -self.epsilon))
+
+        return (
+            self.focal * x / safe_z,
+            self.focal * y / safe_z
+        )
+
+    def depth(self, points: Points3D) -> np.ndarray:
+        return points[:, 2]
+
+
+@dataclass(frozen=True, kw_only=True)
+class MeshView:
+    """Вид сетки: поворот, смещение, проекция и отсечение невидимых граней"""
+
+    CAMERA_VECTOR: ClassVar[np.ndarray] = np.array((-1.0, 1.0, -1.0))
+    """Направление на камеру для отсечения невидимых граней"""
+
+    mesh: Mesh
+    """Сетка"""
+    rotation: Vec2i = (0, 0)
+    """Поворот вокруг осей X и Y в градусах"""
+    offset: Vec2f = (0, 0)
+    """Смещение сетки по X и Y"""
+    projector: Projector
+    """Проектор"""
+    face_culling: bool = True
+    """Отсекать грани, повёрнутые от камеры"""
+
+    def getRotationMatrix(self) -> np.ndarray:
+        return rotationMatrix(*self.rotation)
+
+    def getVisibleFaces(self, rotation: np.ndarray) -> np.ndarray:
+        """Маска видимых граней (F,)"""
+        mesh = self.mesh
+
+        if not self.face_culling:
+            return np.ones(mesh.faceCount(), dtype=np.bool_)
+
+        # Нормаль в пространстве камеры: n' = R n, поэтому (R n) . c = n . (R^T c)
+        return mesh.face_normals @ (rotation.T @ self.CAMERA_VECTOR) >= 0
+
+    def getVisibleCorners(self, rotation: np.ndarray) -> np.ndarray:
+        """Индексы вершин видимых граней в порядке обхода"""
+        mesh = self.mesh
+        return mesh.face_vertex_indices[self.getVisibleFaces(rotation)[mesh.face_ids]]
+
+    def getMeshPoints(self, rotation: np.ndarray) -> Points3D:
+        """Вершины сетки в пространстве камеры"""
+        offset_x, offset_y = self.offset
+        return self.mesh.vertices @ rotation.T + np.array((offset_x, offset_y, 0))
+
+    def project(self) -> VertexArrays:
+        """Контуры видимых граней в координатах проекции"""
+        rotation = self.getRotationMatrix()
+        corners = self.getVisibleCorners(rotation)
+
+        x, y = self.projector.apply(self.getMeshPoints(rotation))
+        return x[corners], y[corners]
+
+    def removeHiddenLines(self, remover: HiddenLineRemover) -> HiddenLineResult:
+        """Видимые штрихи сетки в координатах проекции"""
+        rotation = self.getRotationMatrix()
+        points = self.getMeshPoints(rotation)
+
+        return remover.run(
+            np.stack(self.projector.apply(points), axis=1),
+            self.projector.depth(points),
+            self.mesh,
+            self.getVisibleFaces(rotation)
+        )
@@ -0,0 +1,105 @@
+"""
+Экспорт сцены в байт-код без графического интерфейса: сцена -> траектории -> оптимизация -> байт-код
+Вместо сцены можно указать сохранённые траектории (.vtr) - этап генерации пропускается
+Запуск: PYTHONPATH=src python -m scene scene.json [-o OUTPUT] [-r RESOURCES] [-t TRAJECTORIES] [-s] [-i]
+"""
+import argparse
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+from bytelang.compiler import ByteLangCompiler
+from bytelang.utils import LogFlag
+from gen.agents import LowLevelAgent
+from gen.pipeline import ExportPipeline
+from gen.pipeline import StageTimer
+from gen.settings import GeneratorSettings
+from gen.simulator import KinematicSimulator
+from gen.trajectoryfile import TrajectoryFile
+from gen.trajectoryfile import TrajectoryFormat
+from gen.trajectoryfile import TrajectoryWriter
+from gen.writer import CodeWriter
+from scene.loader import SceneLoader
+
+BYTECODE_EXTENSION = "blc"
+
+
+def _parseArgs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m scene", description="Экспорт сцены в байт-код")
+    parser.add_argument("scene", type=Path, help=f"файл сцены (JSON или YAML) или траекторий (.{TrajectoryFormat.EXTENSION})")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="файл байт-кода (по умолчанию - рядом со сценой)")
+    parser.add_argument("-r", "--resources", type=Path, default=Path("res/bytelang"), help="каталог контента bytelang")
+    parser.add_argument("-t", "--trajectories", type=Path, default=None, help=f"сохранить траектории сцены (.{TrajectoryFormat.EXTENSION})")
+    parser.add_argument("--cache", type=Path, default=None, help="каталог дискового кэша реестров")
+    parser.add_argument("-s", "--simulate", action="store_true", help="оценить время печати по полученному байт-коду")
+    parser.add_argument("-i", "--incremental", action="store_true", help="записать через исходный текст с инкрементальной компиляцией")
+    parser.add_argument("-v", "--verbose", action="store_true", help="выводить полный журнал компиляции")
+    return parser.parse_args()
+
+
+def _main() -> int:
+    args = _parseArgs()
+    output_path = args.output or args.scene.with_suffix(f".{BYTECODE_EXTENSION}")
+    timer = StageTimer()
+
+    try:
+        with timer.measure("setup"):
+            compiler = ByteLangCompiler.simpleSetup(args.resources, args.cache)
+
+        if args.scene.suffix == f".{TrajectoryFormat.EXTENSION}":
+            with timer.measure("load"):
+                trajectories = TrajectoryFile.open(args.scene)
+
+            settings = GeneratorSettings.makeDefault()
+            figures_count = 0
+
+        else:
+            with timer.measure("load"):
+                scene = SceneLoader().load(args.scene)
+
+            with timer.measure("generate"):
+                trajectories = scene.getTrajectories()
+
+            settings = scene.settings
+            figures_count = len(scene.figures)
+
+        if args.incremental:
+            settings = replace(settings, incremental_compile=True)
+
+        if args.trajectories is not None:
+            with timer.measure("save"):
+                TrajectoryWriter().save(trajectories, args.trajectories)
+
+        log_flags = LogFlag.ALL if args.verbose else LogFlag.PROGRAM_SIZE | LogFlag.COMPILATION_TIME
+        result = ExportPipeline(CodeWriter(settings, compiler)).runToFile(trajectories, output_path, log_flags, timer)
+
+        simulation = None
+
+        if args.simulate and result.compile_result.isOK():
+            with timer.measure("simulate"):
+                program = compiler.decode(LowLevelAgent.ENVIRONMENT, output_path.read_bytes())
+                simulation = KinematicSimulator().run(program)
+
+    except (OSError, ValueError) as e:
+        print(f"FAIL {args.scene}: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Scene : {figures_count} figures, {len(trajectories)} trajectories, {sum(t.vertexCount() for t in trajectories)} vertices")
+    print(result.simplification)
+    print(result.route)
+    print(result.compile_result.getMessage())
+
+    if simulation is not None:
+        print(simulation)
+
+    print(timer)
+
+    if not result.compile_result.isOK():
+        return 1
+
+    print(f"OK   {args.scene} -> {output_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main())
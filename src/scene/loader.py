@@ -0,0 +1,245 @@
+"""
+Загрузка сцены из файла JSON или YAML
+
+Пример сцены:
+
+    {
+        "settings": {"route_time_budget_ms": 200, "simplification_method": "RAMER_DOUGLAS_PEUCKER"},
+        "figures": [
+            {"type": "polygon", "name": "Шестиугольник", "size": [300, 300], "position": [-200, 0], "vertex_count": 6},
+            {"type": "circle", "name": "Дуга", "resolution": 64, "angle": 180, "rotation": 90, "tool": 2},
+            {"type": "polyline", "name": "Зигзаг", "x": [0, 1, 2, 3], "y": [0, 1, 0, 1]},
+            {"type": "obj", "path": "res/obj/cube.obj", "rotation_3d": [20, 35], "hidden_line_removal": true}
+        ]
+    }
+
+Общие поля фигуры: name, size, position, rotation, inflate, tool, planner_mode, export.
+Относительные пути файлов OBJ отсчитываются от каталога сцены
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import fields
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import ClassVar
+from typing import Sequence
+
+from figure.transform import FigureTransform
+from gen.enums import MarkerTool
+from gen.enums import PlannerMode
+from gen.enums import SimplificationMethod
+from gen.movementprofile import MovementProfile
+from gen.settings import GeneratorSettings
+from gen.vertex import VertexGenerator
+from loader.mesh import Mesh
+from loader.objparser import ObjParser
+from loader.projection import IsometricProjector
+from loader.projection import MeshView
+from loader.projection import PerspectiveProjector
+from scene.model import CircleSceneFigure
+from scene.model import LineSceneFigure
+from scene.model import ObjSceneFigure
+from scene.model import PolygonSceneFigure
+from scene.model import PolylineSceneFigure
+from scene.model import RectSceneFigure
+from scene.model import Scene
+from scene.model import SceneFigure
+from scene.model import SpiralSceneFigure
+from tools import Range
+
+type _Data = dict[str, Any]
+
+
+class SceneLoader:
+    """Загрузчик сцены"""
+
+    YAML_EXTENSIONS: ClassVar[tuple[str, ...]] = (".yaml", ".yml")
+    """Расширения файлов YAML (остальные читаются как JSON)"""
+
+    PLANNER_MODE_RANGE: ClassVar[Range[int]] = Range(0, 2)
+    """Индекс профиля перемещения фигуры"""
+
+    def __init__(self) -> None:
+        self._obj_parser = ObjParser()
+        self._figure_parsers: dict[str, Callable[[_Data, str, Path], Sequence[SceneFigure]]] = {
+            "rect": self._parseRect,
+            "circle": self._parseCircle,
+            "spiral": self._parseSpiral,
+            "polygon": self._parsePolygon,
+            "line": self._parseLine,
+            "polyline": self._parsePolyline,
+            "obj": self._parseObj,
+        }
+
+    def load(self, path: Path) -> Scene:
+        """Загрузить сцену из файла"""
+        with open(path, encoding="utf-8") as f:
+            if path.suffix.lower() in self.YAML_EXTENSIONS:
+                try:
+                    import yaml
+
+                except ImportError:
+                    raise ValueError(f"{path}: для сцен YAML требуется пакет PyYAML")
+
+                data = yaml.safe_load(f)
+
+            else:
+                data = json.load(f)
+
+        return self.parse(data, path.parent)
+
+    def parse(self, data: _Data, base_path: Path) -> Scene:
+        """Разобрать сцену из словаря"""
+        if not isinstance(data, dict):
+            raise ValueError("Сцена должна быть объектом с полями 'settings' и 'figures'")
+
+        figures = list[SceneFigure]()
+
+        for index, figure_data in enumerate(data.get("figures", ())):
+            try:
+                figures.extend(self._parseFigure(figure_data, index, base_path))
+
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"Фигура {index}: {e!r}") from e
+
+        return Scene(figures=tuple(figures), settings=self._parseSettings(data.get("settings", dict())))
+
+    def _parseSettings(self, data: _Data) -> GeneratorSettings:
+        settings = GeneratorSettings.makeDefault()
+        known = {f.name for f in fields(GeneratorSettings)}
+
+        if unknown := data.keys() - known:
+            raise ValueError(f"Неизвестные настройки: {', '.join(sorted(unknown))}")
+
+        values = dict[str, Any]()
+
+        for name, value in data.items():
+            current = getattr(settings, name)
+
+            if isinstance(current, MovementProfile):
+                if "mode" in value:
+                    value = value | {"mode": PlannerMode[value["mode"]]}
+
+                values[name] = replace(current, **value)
+
+            elif isinstance(current, SimplificationMethod):
+                values[name] = SimplificationMethod[value]
+
+            elif isinstance(current, tuple):
+                values[name] = tuple(value)
+
+            else:
+                values[name] = value
+
+        return replace(settings, **values)
+
+    def _parseFigure(self, data: _Data, index: int, base_path: Path) -> Sequence[SceneFigure]:
+        figure_type = data["type"]
+
+        if (parser := self._figure_parsers.get(figure_type)) is None:
+            raise ValueError(f"Неизвестный тип фигуры: '{figure_type}'")
+
+        return parser(data, data.get("name", f"{figure_type.capitalize()}: {index}"), base_path)
+
+    @staticmethod
+    def _getCommon(data: _Data, name: str) -> _Data:
+        """Общие поля фигуры"""
+        planner_mode = data.get("planner_mode", 2)
+
+        if not SceneLoader.PLANNER_MODE_RANGE.min <= planner_mode <= SceneLoader.PLANNER_MODE_RANGE.max:
+            raise ValueError(f"Режим планировщика вне диапазона {SceneLoader.PLANNER_MODE_RANGE.asTuple()}: {planner_mode}")
+
+        return dict(
+            name=name,
+            transform=FigureTransform(
+                size=tuple(data.get("size", (100, 100))),
+                position=tuple(data.get("position", (0, 0))),
+                rotation=data.get("rotation", 0),
+                inflate=data.get("inflate", 0),
+            ),
+            tool=MarkerTool(data.get("tool", MarkerTool.LEFT)),
+            planner_mode=planner_mode,
+            export=data.get("export", True),
+        )
+
+    @staticmethod
+    def _getRanged(data: _Data, name: str, default: int, value_range: Range[int]) -> int:
+        value = data.get(name, default)
+
+        if not value_range.min <= value <= value_range.max:
+            raise ValueError(f"{name} вне диапазона {value_range.asTuple()}: {value}")
+
+        return value
+
+    def _getResolution(self, data: _Data) -> int:
+        return self._getRanged(data, "resolution", 1, VertexGenerator.RESOLUTION_RANGE)
+
+    def _parseRect(self, data: _Data, name: str, _: Path) -> Sequence[SceneFigure]:
+        return RectSceneFigure(**self._getCommon(data, name), resolution=self._getResolution(data)),
+
+    def _parseCircle(self, data: _Data, name: str, _: Path) -> Sequence[SceneFigure]:
+        return CircleSceneFigure(**self._getCommon(data, name), resolution=self._getResolution(data), angle=self._getRanged(data, "angle", 360, Range(1, 360))),
+
+    def _parseSpiral(self, data: _Data, name: str, _: Path) -> Sequence[SceneFigure]:
+        return SpiralSceneFigure(**self._getCommon(data, name), resolution=self._getResolution(data), repeats=self._getRanged(data, "repeats", 1, VertexGenerator.SPIRAL_REPEATS)),
+
+    def _parsePolygon(self, data: _Data, name: str, _: Path) -> Sequence[SceneFigure]:
+        return PolygonSceneFigure(
+            **self._getCommon(data, name),
+            resolution=self._getResolution(data),
+            vertex_count=self._getRanged(data, "vertex_count", 6, VertexGenerator.POLYGON_VERTEX_COUNT_RANGE)
+        ),
+
+    def _parseLine(self, data: _Data, name: str, _: Path) -> Sequence[SceneFigure]:
+        return LineSceneFigure(**self._getCommon(data, name)),
+
+    def _parsePolyline(self, data: _Data, name: str, _: Path) -> Sequence[SceneFigure]:
+        x, y = VertexGenerator.asArrays((data["x"], data["y"]))
+
+        if len(x) != len(y) or len(x) == 0:
+            raise ValueError(f"Координаты ломаной должны быть непустыми и одной длины: {len(x)} x {len(y)}")
+
+        return PolylineSceneFigure(**self._getCommon(data, name), vertices=(x, y)),
+
+    def _parseObj(self, data: _Data, name: str, base_path: Path) -> Sequence[SceneFigure]:
+        path = base_path / data["path"]
+
+        with open(path) as f:
+            meshes: Sequence[tuple[str, Mesh]] = self._obj_parser.run(f, path.stem)
+
+        if (selected := data.get("object")) is not None:
+            meshes = tuple((name, mesh) for name, mesh in meshes if name == selected)
+
+            if not meshes:
+                raise ValueError(f"{path}: нет объекта '{selected}'")
+
+        common = self._getCommon(data, name)
+        offset_x, offset_y = data.get("offset_3d", (0, 0))
+        projector = PerspectiveProjector(data.get("focal", 0.5)) if data.get("perspective", False) else IsometricProjector()
+
+        return tuple(
+            ObjSceneFigure(
+                **(common | {"name": self._getObjName(data, name, object_name, len(meshes))}),
+                view=MeshView(
+                    mesh=mesh.sortFaces(),
+                    rotation=tuple(data.get("rotation_3d", (0, 0))),
+                    offset=(offset_x / 100, offset_y / 100),
+                    projector=projector,
+                    face_culling=data.get("face_culling", True),
+                ),
+                hidden_line_removal=data.get("hidden_line_removal", False),
+            )
+            for object_name, mesh in meshes
+        )
+
+    @staticmethod
+    def _getObjName(data: _Data, name: str, object_name: str, objects_count: int) -> str:
+        """Без явного имени фигуры используются имена объектов файла"""
+        if "name" not in data:
+            return object_name
+
+        return name if objects_count == 1 else f"{name} : {object_name}"
+
@@ -0,0 +1,165 @@
+"""Модель сцены без графического интерфейса"""
+from __future__ import annotations
+
+from abc import ABC
+from abc import abstractmethod
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Sequence
+
+import numpy as np
+
+from figure.transform import FigureTransform
+from gen.enums import MarkerTool
+from gen.settings import GeneratorSettings
+from gen.trajectory import Trajectory
+from gen.vertex import VertexArrays
+from gen.vertex import VertexGenerator
+from gen.vertex import Vertices
+from loader.hiddenline import HiddenLineRemover
+from loader.projection import MeshView
+
+
+@dataclass(frozen=True, kw_only=True)
+class SceneFigure(ABC):
+    """Фигура сцены: генерация и трансформация те же, что у фигур холста"""
+
+    name: str
+    """Наименование фигуры"""
+    transform: FigureTransform = FigureTransform()
+    """Трансформация в координаты холста"""
+    tool: MarkerTool = MarkerTool.LEFT
+    """Инструмент печати"""
+    planner_mode: int = 2
+    """Режим планировщика (индекс профиля перемещения)"""
+    export: bool = True
+    """Для печати"""
+
+    @abstractmethod
+    def generateVertices(self) -> Vertices:
+        """Сгенерировать фигуру"""
+
+    def getTransformedVertices(self) -> tuple[np.ndarray, np.ndarray]:
+        """Получить трансформированные вершины"""
+        return self.transform.apply(VertexGenerator.asArrays(self.generateVertices()))
+
+    def toTrajectories(self) -> Sequence[Trajectory]:
+        """Конвертировать фигуру в траектории"""
+        if not self.export:
+            return ()
+
+        x, y = self.getTransformedVertices()
+        return self._makeTrajectory(self.name, x, y),
+
+    def _makeTrajectory(self, name: str, x: np.ndarray, y: np.ndarray) -> Trajectory:
+        return Trajectory(name=name, x_positions=x, y_positions=y, tool=self.tool, planner_mode=self.planner_mode)
+
+
+@dataclass(frozen=True, kw_only=True)
+class RectSceneFigure(SceneFigure):
+    """Прямоугольник"""
+
+    resolution: int = 1
+    """Разрешение"""
+
+    def generateVertices(self) -> Vertices:
+        return VertexGenerator.rect(self.resolution)
+
+
+@dataclass(frozen=True, kw_only=True)
+class CircleSceneFigure(SceneFigure):
+    """Круг или дуга"""
+
+    resolution: int = 1
+    """Разрешение"""
+    angle: int = 360
+    """Угол дуги в градусах"""
+
+    def generateVertices(self) -> Vertices:
+        return VertexGenerator.circle(self.angle, self.resolution)
+
+
+@dataclass(frozen=True, kw_only=True)
+class SpiralSceneFigure(SceneFigure):
+    """Спираль"""
+
+    resolution: int = 1
+    """Разрешение"""
+    repeats: int = 1
+    """Количество витков"""
+
+    def generateVertices(self) -> Vertices:
+        return VertexGenerator.spiral(self.resolution, self.repeats)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PolygonSceneFigure(SceneFigure):
+    """Правильный многоугольник"""
+
+    resolution: int = 1
+    """Разрешение"""
+    vertex_count: int = 6
+    """Количество вершин"""
+
+    def generateVertices(self) -> Vertices:
+        return VertexGenerator.nGon(self.vertex_count, self.resolution)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LineSceneFigure(SceneFigure):
+    """Отрезок"""
+
+    def generateVertices(self) -> Vertices:
+        return VertexGenerator.lineSimple()
+
+
+@dataclass(frozen=True, kw_only=True)
+class PolylineSceneFigure(SceneFigure):
+    """Ломаная из вершин, заданных в файле сцены"""
+
+    vertices: VertexArrays
+    """Вершины до трансформации"""
+
+    def generateVertices(self) -> Vertices:
+        return self.vertices
+
+
+@dataclass(frozen=True, kw_only=True)
+class ObjSceneFigure(SceneFigure):
+    """Объект OBJ"""
+
+    view: MeshView
+    """Вид сетки"""
+    hidden_line_removal: bool = False
+    """Удаление невидимых линий"""
+
+    def generateVertices(self) -> Vertices:
+        return self.view.project()
+
+    def toTrajectories(self) -> Sequence[Trajectory]:
+        if not self.hidden_line_removal or not self.export:
+            return super().toTrajectories()
+
+        ret = list[Trajectory]()
+
+        for stroke in self.view.removeHiddenLines(HiddenLineRemover()).strokes:
+            x, y = self.transform.apply((stroke[:, 0], stroke[:, 1]))
+
+            if len(x) > 1:
+                ret.append(self._makeTrajectory(f"{self.name} : {len(ret)}", x, y))
+
+        return ret
+
+
+@dataclass(frozen=True, kw_only=True)
+class Scene:
+    """Сцена: фигуры в порядке добавления и настройки генератора"""
+
+    figures: Sequence[SceneFigure] = ()
+    """Фигуры"""
+    settings: GeneratorSettings = field(default_factory=GeneratorSettings.makeDefault)
+    """Настройки генератора"""
+
+    def getTrajectories(self) -> list[Trajectory]:
+        """Получить все траектории"""
+        return [trajectory for figure in self.figures for trajectory in figure.toTrajectories()]
@@ -1,3 +1,5 @@
+from abc import ABC
+from abc import abstractmethod
 from dataclasses import dataclass
 
 
@@ -17,3 +19,23 @@ class Range[T]:
     def clamp(self, value: T) -> T:
         """Получить значение ограниченное диапазоном"""
         return min(self.max, max(self.min, value))
+
+
+class BackgroundTask(ABC):
+    """Фоновая задача, состояние которой опрашивается из главного потока"""
+
+    @abstractmethod
+    def getTitle(self) -> str:
+        """Наименование задачи"""
+
+    @abstractmethod
+    def getProgress(self) -> float:
+        """Доля выполненной работы [0, 1]"""
+
+    @abstractmethod
+    def isDone(self) -> bool:
+        """Задача завершена (успешно, с ошибкой или отменена)"""
+
+    @abstractmethod
+    def cancel(self) -> None:
+        """Запросить отмену"""
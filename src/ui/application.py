@@ -26,5 +26,16 @@ class Application(ABC):
 
         dpg.setup_dearpygui()
         dpg.show_viewport()
-        dpg.start_dearpygui()
+
+        while dpg.is_dearpygui_running():
+            self.onFrame()
+            dpg.render_dearpygui_frame()
+
+        self.shutdown()
         dpg.destroy_context()
+
+    def onFrame(self) -> None:
+        """Вызывается перед отрисовкой каждого кадра (опрос фоновых задач)"""
+
+    def shutdown(self) -> None:
+        """Вызывается после закрытия окна"""
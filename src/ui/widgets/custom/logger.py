@@ -1,32 +1,130 @@
-from io import StringIO
+from collections import deque
+from itertools import islice
+from typing import ClassVar
+from typing import Optional
+
+from dearpygui import dearpygui as dpg
 
 from ui.widgets.abc import ItemID
-from ui.widgets.abc import Placeable
 from ui.widgets.dpg.impl import Button
 from ui.widgets.dpg.impl import ChildWindow
+from ui.widgets.dpg.impl import Group
+from ui.widgets.dpg.impl import Spacer
 from ui.widgets.dpg.impl import Text
 
 
-class LoggerWidget(StringIO, Placeable):
+class LoggerWidget(Group):
+    """
+    Журнал с ограниченным числом строк.
+    Запись только помечает журнал изменённым - окно обновляется не чаще раза за кадр,
+    при этом в Text передаются лишь видимые строки, остальная высота заполняется отступами
+    """
+
+    DEFAULT_MAX_LINES: ClassVar[int] = 100_000
+    """Число хранимых строк по умолчанию (старые строки вытесняются)"""
+
+    OVERSCAN_LINES: ClassVar[int] = 32
+    """Строк, выводимых сверх видимых сверху и снизу"""
+
+    DEFAULT_LINE_HEIGHT: ClassVar[int] = 13
+    """Высота строки до первого измерения шрифта"""
 
-    def __init__(self) -> None:
+    DEFAULT_VISIBLE_LINES: ClassVar[int] = 64
+    """Видимых строк, пока окно не отрисовано"""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES) -> None:
         super().__init__()
-        self._text = Text()
+        self._lines = deque[str](maxlen=max_lines)
+        self._dropped_count = 0
+        self._is_dirty = False
+        self._is_following = True
+        self._line_height: Optional[int] = None
+        self._shown_range = (0, 0)
+
+        self._status = Text()
         self._window = ChildWindow()
+        self._top = Spacer()
+        self._text = Text()
+        self._bottom = Spacer()
 
     def placeRaw(self, parent_id: ItemID) -> None:
-        Button("Clear", self.clearLogs).placeRaw(parent_id)
-        self._window.placeRaw(parent_id)
-        self._window.add(self._text)
+        super().placeRaw(parent_id)
+        Group(horizontal=True).place(self).add(Button("Clear", self.clearLogs)).add(self._status)
+        self._window.place(self)
+        self._window.add(self._top).add(self._text).add(self._bottom)
+
+        # Строка состояния вне прокрутки: видима каждый кадр, пока виден журнал
+        with dpg.item_handler_registry() as handlers:
+            dpg.add_item_visible_handler(callback=lambda: self._onFrame())
+
+        dpg.bind_item_handler_registry(self._status.getItemID(), handlers)
+        self.refresh()
 
     def clearLogs(self) -> None:
         """Очистить лог"""
-        self.truncate(0)
-        self.seek(0)
-        self._text.setValue("")
-
-    def write(self, message: str):
-        """Записать и отобразить"""
-        ret = super().write(f">>> {message}\n")
-        self._text.setValue(self.getvalue())
-        return ret
+        self._lines.clear()
+        self._dropped_count = 0
+        self._is_following = True
+        self._is_dirty = True
+
+    def write(self, message: str) -> int:
+        """Записать (отображение обновится в следующем кадре)"""
+        lines = f">>> {message}".split("\n")
+        self._dropped_count += max(0, len(self._lines) + len(lines) - self._lines.maxlen)
+        self._lines.extend(lines)
+        self._is_dirty = True
+        return len(message)
+
+    def getvalue(self) -> str:
+        """Хранимый текст журнала"""
+        return "\n".join(self._lines)
+
+    def refresh(self) -> None:
+        """Обновить окно немедленно"""
+        self._is_dirty = True
+        self._onFrame()
+
+    def _onFrame(self) -> None:
+        window_id = self._window.getItemID()
+        line_height = self._getLineHeight()
+
+        scroll = dpg.get_y_scroll(window_id)
+        _, height = dpg.get_item_rect_size(window_id)
+        visible = height // line_height + 1 if height > 0 else self.DEFAULT_VISIBLE_LINES
+
+        if self._is_dirty and self._is_following:
+            first_visible = max(0, len(self._lines) - visible)
+
+        else:
+            first_visible = int(scroll // line_height)
+            self._is_following = scroll >= dpg.get_y_scroll_max(window_id) - line_height
+
+        begin = max(0, first_visible - self.OVERSCAN_LINES)
+        end = min(len(self._lines), first_visible + visible + self.OVERSCAN_LINES)
+
+        if not self._is_dirty and (begin, end) == self._shown_range:
+            return
+
+        self._shown_range = begin, end
+        self._top.setHeight(begin * line_height)
+        self._text.setValue("\n".join(islice(self._lines, begin, end)))
+        self._bottom.setHeight((len(self._lines) - end) * line_height)
+
+        if self._is_dirty:
+            self._status.setValue(f"Lines: {len(self._lines)}" + (f" (dropped: {self._dropped_count})" if self._dropped_count else ""))
+
+            if self._is_following:
+                dpg.set_y_scroll(window_id, len(self._lines) * line_height)
+
+        self._is_dirty = False
+
+    def _getLineHeight(self) -> int:
+        if self._line_height is not None:
+            return self._line_height
+
+        # Размер текста известен только после загрузки шрифта (первый кадр)
+        if (size := dpg.get_text_size("Ag")) is None or size[1] <= 0:
+            return self.DEFAULT_LINE_HEIGHT
+
+        self._line_height = int(size[1])
+        return self._line_height
@@ -0,0 +1,61 @@
+from typing import Callable
+
+from tools import BackgroundTask
+from ui.widgets.dpg.impl import Button
+from ui.widgets.dpg.impl import Group
+from ui.widgets.dpg.impl import ProgressBar
+from ui.widgets.dpg.impl import Text
+
+
+class _TaskRow(Group):
+    """Строка задачи: наименование, прогресс и отмена"""
+
+    def __init__(self, task: BackgroundTask) -> None:
+        super().__init__(horizontal=True)
+        self.task = task
+        self.progress = ProgressBar()
+
+
+class TaskListWidget(Group):
+    """
+    Список фоновых задач.
+    Состояние опрашивается в refresh (раз за кадр), завершённые задачи передаются обработчику и убираются из списка
+    """
+
+    def __init__(self, on_done: Callable[[BackgroundTask], None]) -> None:
+        super().__init__()
+        self._on_done = on_done
+        self._rows = list[_TaskRow]()
+
+    def addTask(self, task: BackgroundTask) -> None:
+        """Показать задачу"""
+        row = _TaskRow(task)
+        row.place(self)
+        row.add(Text(task.getTitle())).add(row.progress).add(Button("Отмена", task.cancel))
+        self._rows.append(row)
+
+    def isEmpty(self) -> bool:
+        """Нет выполняющихся задач"""
+        return not self._rows
+
+    def cancelAll(self) -> None:
+        """Запросить отмену всех задач"""
+        for row in self._rows:
+            row.task.cancel()
+
+    def refresh(self) -> None:
+        """Обновить прогресс, обработать завершённые задачи"""
+        running = list[_TaskRow]()
+
+        for row in self._rows:
+            if row.task.isDone():
+                row.delete()
+                self._on_done(row.task)
+
+            else:
+                progress = row.task.getProgress()
+                row.progress.setValue(progress)
+                row.progress.setOverlay(f"{progress:.0%}")
+                running.append(row)
+
+        self._rows = running
@@ -92,6 +92,25 @@ class SliderInt[T: (float, int)](Placeable, RangedDPGItem[T]):
         del self.__max_value
 
 
+class Combo(VariableDPGItem[str], Placeable):
+
+    def __init__(self, label: str, items: Sequence[str], on_change: Callable[[str], None] = None, *, width: int = 100, default_value: str = None) -> None:
+        super().__init__()
+        self.__callback = None if on_change is None else lambda: on_change(self.getValue())
+        self.__label = label
+        self.__items = items
+        self.__width = width
+        self.__default_value = items[0] if default_value is None else default_value
+
+    def placeRaw(self, parent_id: ItemID) -> None:
+        self.setItemID(dpg.add_combo(self.__items, label=self.__label, callback=self.__callback, width=self.__width, parent=parent_id, default_value=self.__default_value))
+        del self.__callback
+        del self.__label
+        del self.__items
+        del self.__width
+        del self.__default_value
+
+
 class Button(DPGItem, Placeable):
 
     def __init__(self, label: str, on_click: Callable[[], None]) -> None:
@@ -156,7 +175,7 @@ class ChildWindow(Container, DPGItem, Placeable):
         self.__kwargs = kwargs
 
     def placeRaw(self, parent_id: ItemID) -> None:
-        self.setItemID(dpg.add_child_window(**self.__kwargs))
+        self.setItemID(dpg.add_child_window(parent=parent_id, **self.__kwargs))
         del self.__kwargs
 
     def add(self, item: Placeable) -> Container:
@@ -241,6 +260,40 @@ class Separator(DPGItem, Placeable):
         super().__init__()
 
 
+class ProgressBar(VariableDPGItem[float], Placeable):
+    """Индикатор выполнения [0, 1]"""
+
+    def __init__(self, *, width: int = 150, overlay: str = "") -> None:
+        super().__init__()
+        self.__width = width
+        self.__overlay = overlay
+
+    def placeRaw(self, parent_id: ItemID) -> None:
+        self.setItemID(dpg.add_progress_bar(width=self.__width, overlay=self.__overlay, parent=parent_id))
+        del self.__width
+        del self.__overlay
+
+    def setOverlay(self, overlay: str) -> None:
+        """Установить надпись"""
+        self.setConfiguration(overlay=overlay)
+
+
+class Spacer(DPGItem, Placeable):
+    """Пустое место заданной высоты"""
+
+    def __init__(self, height: int = 0) -> None:
+        super().__init__()
+        self.__height = height
+
+    def placeRaw(self, parent_id: ItemID) -> None:
+        self.setItemID(dpg.add_spacer(height=self.__height, parent=parent_id))
+        del self.__height
+
+    def setHeight(self, height: int) -> None:
+        """Установить высоту"""
+        self.setConfiguration(height=height)
+
+
 class InputInt(RangedDPGItem[int], Placeable):
 
     def __init__(
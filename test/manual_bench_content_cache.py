@@ -0,0 +1,55 @@
+"""
+Дисковый кэш реестров: время simpleSetup и загрузки окружения в новом процессе, без кэша и с кэшем.
+Размер пакета увеличивается сгенерированными инструкциями (индекс инструкции u8 - не более 256)
+Запуск: PYTHONPATH=src python test/manual_bench_content_cache.py
+"""
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+RUNS = 15
+
+_CHILD = """
+import os
+import sys
+import time
+
+from bytelang.compiler import ByteLangCompiler
+
+start = time.perf_counter()
+compiler = ByteLangCompiler.simpleSetup(sys.argv[1], cache_folder=sys.argv[2] or None)
+compiler.emit("vart_esp32", lambda emitter: emitter.call("quit"), open(os.devnull, "wb"), 0)
+print(time.perf_counter() - start)
+"""
+
+
+def _measure(bytelang_path: Path, cache_folder: str) -> float:
+    """Медиана времени настройки компилятора в новом процессе, мкс"""
+    times = [
+        float(subprocess.run((sys.executable, "-c", _CHILD, str(bytelang_path), cache_folder), capture_output=True, text=True, check=True).stdout)
+        for _ in range(RUNS)
+    ]
+    return statistics.median(times) * 1e6
+
+
+def main() -> None:
+    for extra_instructions in (0, 100, 240):
+        with tempfile.TemporaryDirectory() as folder:
+            bytelang_path = Path(folder) / "bytelang"
+            cache_folder = Path(folder) / "cache"
+            shutil.copytree("res/bytelang", bytelang_path)
+
+            with open(bytelang_path / "packages" / "vart.blp", "a") as f:
+                f.write("".join(f"\ngenerated_{i} u8 i16 u16* f32\n" for i in range(extra_instructions)))
+
+            parse = _measure(bytelang_path, "")
+            _measure(bytelang_path, str(cache_folder))
+            cached = _measure(bytelang_path, str(cache_folder))
+            print(f"{extra_instructions:>5} extra instructions   parse {parse:>8.0f} us   cache {cached:>8.0f} us   x{parse / cached:>5.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Разбор байт-кода, дизассемблирование с обратной компиляцией и оценка времени печати
+Запуск: PYTHONPATH=src python test/manual_bench_decoder.py
+"""
+import io
+import time
+
+from bytelang.bytecode.impl.decoder import Disassembler
+from bytelang.compiler import ByteLangCompiler
+from gen.agents import LowLevelAgent
+from gen.simulator import KinematicSimulator
+from gen.writer import CodeWriter
+from manual_bench_incremental_compile import SETTINGS
+from manual_bench_incremental_compile import _makeTrajectories
+
+
+def main() -> None:
+    compiler = ByteLangCompiler.simpleSetup("res/bytelang")
+    writer = CodeWriter(SETTINGS, compiler)
+
+    for count, vertices in ((100, 100), (500, 200), (1000, 1000)):
+        output = io.BytesIO()
+        writer.run(_makeTrajectories(count, vertices), output, 0)
+        bytecode = output.getvalue()
+
+        start = time.perf_counter()
+        program = compiler.decode(LowLevelAgent.ENVIRONMENT, bytecode)
+        decode_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        simulation = KinematicSimulator().run(program)
+        simulate_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        source = "\n".join(Disassembler().run(program))
+        disassemble_elapsed = time.perf_counter() - start
+
+        recompiled = io.BytesIO()
+        result = compiler.compileStream(io.StringIO(source), recompiled, 0)
+
+        if not result.isOK() or recompiled.getvalue() != bytecode:
+            raise AssertionError("disassembled source does not compile to the same bytecode")
+
+        print(
+            f"{count} x {vertices}: {len(bytecode)} bytes, {len(program)} instructions   "
+            f"decode {decode_elapsed * 1000:>7.1f} ms   simulate {simulate_elapsed * 1000:>6.1f} ms   "
+            f"disassemble {disassemble_elapsed * 1000:>7.1f} ms   estimate {simulation.duration_s:.0f} s"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Векторизация изображения 2000x2000: контуры + цепочки по KD-дереву против прототипа O(n²)
+Запуск: PYTHONPATH=src python test/manual_bench_image.py
+"""
+import time
+
+import cv2
+import numpy as np
+
+from loader.image import DirectionalChainer
+from loader.image import ImageVectorizer
+
+SIZE = 2000
+"""Сторона изображения"""
+
+PROTOTYPE_POINTS = 4000
+"""Число точек для прототипа (полный перебор на каждом шаге)"""
+
+
+def _makeDrawing(size: int, seed: int = 0) -> np.ndarray:
+    """Штриховой рисунок: окружности, отрезки, текст и шум"""
+    rng = np.random.default_rng(seed)
+    image = np.full((size, size), 255, dtype=np.uint8)
+
+    for _ in range(300):
+        center = tuple(int(v) for v in rng.integers(0, size, 2))
+        cv2.circle(image, center, int(rng.integers(5, size // 4)), 0, int(rng.integers(1, 4)))
+
+    for _ in range(300):
+        a, b = (tuple(int(v) for v in rng.integers(0, size, 2)) for _ in range(2))
+        cv2.line(image, a, b, 0, int(rng.integers(1, 4)))
+
+    for row in range(0, size, 100):
+        cv2.putText(image, "VART Studio 0123456789", (10, row + 60), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 2)
+
+    noise = rng.random((size, size)) < 0.001
+    image[noise] = 0
+    return image
+
+
+def _prototypeOrder(points: np.ndarray) -> None:
+    """Прежняя реализация: взвешенное расстояние до всех оставшихся точек на каждом шаге"""
+    remaining = [tuple(p) for p in points]
+    current = min(remaining)
+    remaining.remove(current)
+    direction = np.array((1, 0))
+
+    while remaining:
+        array = np.array(remaining)
+        vectors = array - np.array(current)
+        lengths = np.linalg.norm(vectors, axis=1)
+        angles = np.arccos(np.clip(vectors @ (direction / np.linalg.norm(direction)) / lengths, -1, 1))
+        best = int(np.argmin(lengths * (1 + angles)))
+        nearest = remaining[best]
+        direction = np.array((nearest[0] - current[0], nearest[1] - current[1]))
+        current = nearest
+        remaining.remove(current)
+
+
+def _main() -> None:
+    image = _makeDrawing(SIZE)
+    vectorizer = ImageVectorizer()
+
+    begin = time.perf_counter()
+    strokes = vectorizer.run(image)
+    elapsed = time.perf_counter() - begin
+
+    edges = cv2.Canny(image, vectorizer.settings.canny_threshold1, vectorizer.settings.canny_threshold2)
+    print(f"{SIZE}x{SIZE} : edges {np.count_nonzero(edges)} px -> {strokes.strokeCount()} strokes, {len(strokes.points)} vertices : {elapsed * 1000:.0f} ms")
+
+    points = np.stack(np.nonzero(edges)[::-1], axis=1)[:PROTOTYPE_POINTS]
+
+    begin = time.perf_counter()
+    _prototypeOrder(points)
+    prototype = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    DirectionalChainer(vectorizer.settings.chain_gap_px).run(points)
+    chainer = time.perf_counter() - begin
+
+    print(f"{len(points)} points : prototype {prototype * 1000:.0f} ms chainer {chainer * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    _main()
@@ -0,0 +1,99 @@
+"""
+Инкрементальная компиляция: повторный экспорт без изменений и с изменением одной траектории
+Запуск: PYTHONPATH=src python test/manual_bench_incremental_compile.py
+"""
+import io
+import time
+from dataclasses import replace
+from typing import Callable
+
+import numpy as np
+
+from bytelang.bytecode.impl.incremental import ChunkCache
+from bytelang.compiler import ByteLangCompiler
+from bytelang.core.results.compile.abc import CompileResult
+from gen.agents import MacroAgent
+from gen.agents import SourceAgent
+from gen.enums import MarkerTool
+from gen.enums import PlannerMode
+from gen.movementprofile import MovementProfile
+from gen.settings import GeneratorSettings
+from gen.trajectory import Trajectory
+
+SETTINGS = GeneratorSettings(
+    MovementProfile(name="Перемещение", mode=PlannerMode.ACCEL, speed=200, accel=75),
+    MovementProfile(name="Продолжительный отрезок", mode=PlannerMode.ACCEL, speed=150, accel=50),
+    MovementProfile(name="Кривая (Короткий отрезок)", mode=PlannerMode.SPEED, speed=20, accel=0),
+    MovementProfile(name="Малые отрезки", mode=PlannerMode.POSITION, speed=0, accel=0),
+    tool_change_begin_timeout_ms=1000,
+    tool_change_end_timeout_ms=1000,
+    epilogue_stop_duration_ms=1000,
+    epilogue_end_position=(0, 0)
+)
+
+
+def _makeTrajectories(count: int, vertices: int, seed: int = 0) -> list[Trajectory]:
+    rng = np.random.default_rng(seed)
+    return [
+        Trajectory(f"{i}", *rng.integers(-10_000, 10_000, (2, vertices)), MarkerTool(1 + i % 2), i % 3)
+        for i in range(count)
+    ]
+
+
+def _makeSource(trajectories: list[Trajectory]) -> str:
+    stream = io.StringIO()
+    agent = MacroAgent(SourceAgent(stream), SETTINGS, sum(t.vertexCount() for t in trajectories), None, True)
+    agent.prologue()
+
+    for trajectory in trajectories:
+        trajectory.run(agent, SETTINGS)
+        agent.updateProgress()
+
+    agent.epilogue()
+    return stream.getvalue()
+
+
+def _measure(compile_method: Callable[[io.StringIO, io.BytesIO], CompileResult], source: str) -> tuple[float, bytes, CompileResult]:
+    output = io.BytesIO()
+    start = time.perf_counter()
+    result = compile_method(io.StringIO(source), output)
+    elapsed = time.perf_counter() - start
+
+    if not result.isOK():
+        raise AssertionError(result.getMessage())
+
+    return elapsed, output.getvalue(), result
+
+
+def main() -> None:
+    compiler = ByteLangCompiler.simpleSetup("res/bytelang")
+
+    for count, vertices in ((100, 100), (500, 200), (1000, 1000)):
+        cache = ChunkCache()
+        trajectories = _makeTrajectories(count, vertices)
+
+        # Сдвиг одной траектории: число шагов и прогресс остальных фрагментов не меняются
+        moved = list(trajectories)
+        moved[count // 2] = replace(moved[count // 2], x_positions=np.asarray(moved[count // 2].x_positions) + 10)
+
+        # Лишняя вершина: меняется прогресс, записанный между траекториями, но не текст остальных траекторий
+        resized = list(trajectories)
+        resized[count // 2] = replace(resized[count // 2], x_positions=(*resized[count // 2].x_positions, 0), y_positions=(*resized[count // 2].y_positions, 0))
+
+        print(f"{count} trajectories x {vertices} vertices")
+
+        for title, source in (("cold", _makeSource(trajectories)), ("unchanged", _makeSource(trajectories)), ("one moved", _makeSource(moved)), ("one resized", _makeSource(resized))):
+            full_elapsed, full_bytecode, _ = _measure(lambda s, o: compiler.compileStream(s, o, 0), source)
+            elapsed, bytecode, result = _measure(lambda s, o: compiler.compileIncremental(s, o, cache, 0), source)
+
+            if bytecode != full_bytecode:
+                raise AssertionError(f"{title}: bytecode differs from full compilation")
+
+            print(
+                f"  {title:<12} incremental {elapsed * 1000:>9.1f} ms   full {full_elapsed * 1000:>9.1f} ms   "
+                f"x{full_elapsed / elapsed:>6.1f}   chunks {result.chunks_compiled}/{result.chunks_total}"
+            )
+
+
+if __name__ == '__main__':
+    main()
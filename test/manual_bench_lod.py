@@ -0,0 +1,122 @@
+"""
+Время обновления фигуры при перетаскивании (трансформация + прореживание + передача в DearPyGui) без прореживания и с ним.
+Окно не создаётся - измеряется работа кадра на стороне Python, выполняемая при каждом перемещении точки
+Запуск: PYTHONPATH=src python test/manual_bench_lod.py
+"""
+import time
+
+import numpy as np
+from dearpygui import dearpygui as dpg
+
+from figure.abc import Canvas
+from figure.impl.transformable import TransformableFigure
+from figure.lod import LevelOfDetail
+from figure.lod import LineDecimator
+
+FRAME_BUDGET_MS = 1000 / 60
+UNITS_PER_PIXEL = (1, 2, 4, 8)
+DRAGS = 20
+
+
+class _NoiseFigure(TransformableFigure):
+
+    def _getCloneInstance(self, name, on_delete, on_clone):
+        raise NotImplementedError
+
+
+def _makeVertices(count: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    # Плотная кривая с шумом - как проекция детализированной сетки OBJ
+    rng = np.random.default_rng(seed)
+    t = np.linspace(0, 40 * np.pi, count)
+    radius = 0.5 * (1 + 0.2 * np.sin(t * 0.37)) + rng.normal(0, 0.002, count)
+    return radius * np.cos(t) / 2, radius * np.sin(t) / 2
+
+
+def _measureDrag(figure: TransformableFigure) -> float:
+    start = time.perf_counter()
+
+    for i in range(DRAGS):
+        figure.setPosition((i, i))
+        figure.updateNow()
+
+    return (time.perf_counter() - start) / DRAGS * 1000
+
+
+def _keptIndices(x: np.ndarray, y: np.ndarray, kept_x: np.ndarray, kept_y: np.ndarray) -> np.ndarray:
+    # Прореженная ломаная - подпоследовательность исходной
+    ret = np.empty(len(kept_x), dtype=np.int64)
+    j = 0
+
+    for i in range(len(x)):
+        if j < len(kept_x) and x[i] == kept_x[j] and y[i] == kept_y[j]:
+            ret[j] = i
+            j += 1
+
+    assert j == len(kept_x), "decimated vertices are not a subsequence"
+    return ret
+
+
+def _maxDeviationPx(x: np.ndarray, y: np.ndarray, decimator: LineDecimator, units_per_pixel: float) -> float:
+    """Наибольшее расстояние (пиксели) от исходной вершины до заменившего её отрезка прореженной ломаной"""
+    kept = _keptIndices(x, y, *decimator.run(x, y, units_per_pixel))
+    segment = np.searchsorted(kept, np.arange(len(x)), side="right") - 1
+    segment = np.minimum(segment, len(kept) - 2)
+
+    ax, ay = x[kept[segment]], y[kept[segment]]
+    dx, dy = x[kept[segment + 1]] - ax, y[kept[segment + 1]] - ay
+    length = np.maximum(dx * dx + dy * dy, 1e-300)
+    t = np.clip(((x - ax) * dx + (y - ay) * dy) / length, 0, 1)
+    distance = np.hypot(x - (ax + t * dx), y - (ay + t * dy))
+    return float(distance.max() / units_per_pixel)
+
+
+def _checkDeviation() -> None:
+    settings = LevelOfDetail(min_vertices=0)
+    decimator = LineDecimator(settings)
+    bound_px = 2 * np.sqrt(2) * settings.tolerance_px
+
+    # Выброс и возврат: вершина возврата обязана сохраниться
+    spike = np.array([0, 1000, 0, 0, 5], dtype=np.float64), np.array([0, 0, 0.1, 1000, 1000], dtype=np.float64)
+    cases = [("spike", *spike, 1)]
+
+    x, y = _makeVertices(100_000)
+    cases += [(f"noise {u} u/px", x * 1000, y * 1000, u) for u in UNITS_PER_PIXEL]
+
+    print(f"max deviation (bound {bound_px:.2f} px)")
+
+    for title, x, y, units_per_pixel in cases:
+        deviation = _maxDeviationPx(x, y, decimator, units_per_pixel)
+        print(f"  {title:<14} {deviation:>7.3f} px {'ok' if deviation <= bound_px else 'EXCEEDED'}")
+        assert deviation <= bound_px
+
+
+def main() -> None:
+    _checkDeviation()
+
+    dpg.create_context()
+    canvas = Canvas()
+
+    with dpg.window():
+        canvas.place()
+
+    for count in (10_000, 100_000, 500_000):
+        figure = _NoiseFigure(_makeVertices(count), "bench", lambda _: None, lambda _: None)
+        canvas.addFigure(figure)
+        figure.setSize((1000, 1000))
+
+        print(f"{count} vertices (frame budget {FRAME_BUDGET_MS:.1f} ms)")
+
+        for units_per_pixel in (0, *UNITS_PER_PIXEL):
+            canvas.setUnitsPerPixel(units_per_pixel)
+            elapsed = _measureDrag(figure)
+            sent = len(dpg.get_value(figure.getItemID())[0])
+            title = "full" if units_per_pixel == 0 else f"{units_per_pixel} u/px"
+            print(f"  {title:<8} update {elapsed:>7.2f} ms   vertices sent {sent:>7}")
+
+        figure.delete()
+
+    dpg.destroy_context()
+
+
+if __name__ == '__main__':
+    main()
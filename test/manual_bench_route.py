@@ -0,0 +1,47 @@
+"""
+Оптимизация маршрута: холостой путь до и после на случайных наборах траекторий
+Запуск: PYTHONPATH=src python test/manual_bench_route.py
+"""
+import numpy as np
+
+from gen.enums import MarkerTool
+from gen.route import RouteOptimizer
+from gen.trajectory import Trajectory
+
+
+def _makeTrajectories(count: int, seed: int = 0) -> list[Trajectory]:
+    """Случайные открытые ломаные и замкнутые окружности"""
+    rng = np.random.default_rng(seed)
+    ret = list[Trajectory]()
+
+    for i in range(count):
+        center = rng.uniform(-1000, 1000, 2)
+
+        if i % 3 == 0:
+            angles = np.linspace(0, 2 * np.pi, 40)
+            x = (center[0] + 20 * np.cos(angles)).astype(np.int32)
+            y = (center[1] + 20 * np.sin(angles)).astype(np.int32)
+            x[-1], y[-1] = x[0], y[0]
+        else:
+            x, y = (rng.uniform(-20, 20, (10, 2)).cumsum(axis=0) + center).T.astype(np.int32)
+
+        ret.append(Trajectory(f"{i}", x, y, MarkerTool.LEFT, 0))
+
+    return ret
+
+
+def main() -> None:
+    for count in (10, 100, 1_000, 10_000):
+        trajectories = _makeTrajectories(count)
+
+        for budget in (0.1, 1.0):
+            result = RouteOptimizer(budget).run(trajectories, (0, 0))
+
+            if sorted(t.name for t in result.trajectories) != sorted(t.name for t in trajectories):
+                raise AssertionError(f"{count}: trajectories lost")
+
+            print(f"{count:>6} trajectories   budget {budget:>4.1f} s   {result}")
+
+
+if __name__ == '__main__':
+    main()
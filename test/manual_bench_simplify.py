@@ -0,0 +1,39 @@
+"""
+Упрощение ломаных: число вершин и время на путях до 100k точек
+Запуск: PYTHONPATH=src python test/manual_bench_simplify.py
+"""
+import time
+
+import numpy as np
+
+from gen.simplify import CollinearSimplifier
+from gen.simplify import RamerDouglasPeuckerSimplifier
+from gen.simplify import VisvalingamWhyattSimplifier
+
+
+def _makePaths(count: int) -> dict[str, np.ndarray]:
+    """Окружность, спираль и случайное блуждание в целых координатах"""
+    angles = np.linspace(0, 2 * np.pi, count)
+    turns = np.linspace(0, 40 * np.pi, count)
+    rng = np.random.default_rng(0)
+
+    return {
+        "circle": np.stack((1000 * np.cos(angles), 1000 * np.sin(angles)), axis=1).astype(np.int32),
+        "spiral": np.stack((turns * 30 * np.cos(turns), turns * 30 * np.sin(turns)), axis=1).astype(np.int32),
+        "walk": rng.normal(0, 3, (count, 2)).cumsum(axis=0).astype(np.int32),
+    }
+
+
+def main() -> None:
+    for count in (1_000, 10_000, 100_000):
+        for name, path in _makePaths(count).items():
+            for simplifier in (CollinearSimplifier(), RamerDouglasPeuckerSimplifier(1), VisvalingamWhyattSimplifier(1)):
+                start = time.perf_counter()
+                keep = simplifier.apply(path)
+                elapsed = time.perf_counter() - start
+
+                print(f"{count:>7} {name:<7} {type(simplifier).__name__:<32} kept {np.count_nonzero(keep):>7}   {elapsed * 1000:>8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Масштабирование сортировки граней: полный перебор O(n²) и KD-дерево.
+Отдельно - запросы из тупика: вокруг точки запроса только посещённые точки
+Запуск: PYTHONPATH=src python test/manual_bench_sort_faces.py
+"""
+import time
+
+import numpy as np
+
+from gen.spatial import NearestUnvisitedIndex
+from loader.mesh import Mesh
+from loader.mesh import NO_INDEX
+
+BRUTE_FORCE_LIMIT = 10_000
+"""Полный перебор дольше этого размера не запускается"""
+
+
+def _bruteForceOrder(centroids: np.ndarray) -> np.ndarray:
+    """Прежняя реализация: на каждом шаге расстояния до всех центров"""
+    count = len(centroids)
+    order = np.empty(count, dtype=np.int64)
+    used = np.zeros(count, dtype=np.bool_)
+    current = 0
+
+    for step in range(count):
+        order[step] = current
+        used[current] = True
+        distances = np.linalg.norm(centroids - centroids[current], axis=1)
+        distances[used] = np.inf
+        current = int(np.argmin(distances))
+
+    return order
+
+
+def _makeMesh(face_count: int, seed: int = 0) -> Mesh:
+    """Случайный набор треугольников на поверхности тора"""
+    rng = np.random.default_rng(seed)
+    u, v = rng.uniform(0, 2 * np.pi, (2, face_count))
+    centers = np.stack(((2 + np.cos(v)) * np.cos(u), (2 + np.cos(v)) * np.sin(u), np.sin(v)), axis=1)
+    vertices = (centers[:, np.newaxis, :] + rng.normal(0, 0.01, (face_count, 3, 3))).reshape(-1, 3)
+
+    return Mesh(
+        vertices=vertices,
+        normals=np.zeros((0, 3)),
+        face_offsets=np.arange(0, 3 * face_count + 1, 3, dtype=np.int64),
+        face_vertex_indices=np.arange(3 * face_count, dtype=np.int32),
+        face_normal_indices=np.full(3 * face_count, NO_INDEX, dtype=np.int32),
+    )
+
+
+def main() -> None:
+    for face_count in (1_000, 10_000, 100_000):
+        mesh = _makeMesh(face_count)
+        centroids = mesh.face_centroids
+
+        start = time.perf_counter()
+        sorted_mesh = mesh.sortFaces()
+        t_tree = time.perf_counter() - start
+
+        line = f"{face_count:>8} faces   kd-tree {t_tree:>8.3f} s"
+
+        if face_count <= BRUTE_FORCE_LIMIT:
+            start = time.perf_counter()
+            expected = _bruteForceOrder(centroids)
+            t_brute = time.perf_counter() - start
+
+            if not np.array_equal(sorted_mesh.face_centroids, centroids[expected]):
+                raise AssertionError(f"{face_count}: order differs from brute force")
+
+            line += f"   brute force {t_brute:>8.3f} s   x{t_brute / t_tree:>6.1f}"
+
+        print(line)
+
+    _benchDeadEnds()
+
+
+def _benchDeadEnds(visited_count: int = 40_000, free_count: int = 50_000, queries: int = 2_000) -> None:
+    """Повторные запросы из центра посещённой области: без перестроения каждый просматривает все посещённые точки"""
+    rng = np.random.default_rng(0)
+    points = np.concatenate((rng.random((visited_count, 2)), rng.random((free_count, 2)) + 10))
+    index = NearestUnvisitedIndex(points)
+    index.visitMany(np.arange(visited_count))
+    center = np.full(2, 0.5)
+
+    start = time.perf_counter()
+
+    for _ in range(queries):
+        index.visit(index.nearest(center))
+
+    print(f"{queries:>8} dead-end queries {time.perf_counter() - start:>8.3f} s")
+
+
+if __name__ == '__main__':
+    main()
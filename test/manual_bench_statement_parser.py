@@ -0,0 +1,102 @@
+"""
+Пропускная способность StatementParser (строк в секунду) на сгенерированных исходниках
+Запуск: PYTHONPATH=src python test/manual_bench_statement_parser.py
+"""
+import re
+import time
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+
+from bytelang.bytecode.abc import Regex
+from bytelang.bytecode.abc import Statement
+from bytelang.bytecode.abc import StatementType
+from bytelang.bytecode.abc import UniversalArgument
+from bytelang.core.handlers.errors import ErrorHandler
+from bytelang.core.parsers.abc import Parser
+from bytelang.core.parsers.impl.statement import StatementParser
+from bytelang.tools.string import FixedStringIO
+
+LEGACY_LIMIT = 100_000
+"""Прежняя реализация дольше этого размера не запускается"""
+
+
+class LegacyStatementParser(Parser[Statement]):
+    """Прежняя реализация: до семи нескомпилированных шаблонов на каждую лексему"""
+
+    MATCHERS: tuple[tuple[str, Callable[[str], UniversalArgument]], ...] = (
+        (Regex.INTEGER, lambda s: UniversalArgument.fromInteger(int(s, 10))),
+        (Regex.BIN_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 2))),
+        (Regex.OCT_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 8))),
+        (Regex.HEX_VALUE, lambda s: UniversalArgument.fromInteger(int(s, 16))),
+        (Regex.EXPONENT, lambda s: UniversalArgument.fromExponent(float(s))),
+        (Regex.CHAR, lambda s: UniversalArgument.fromExponent(ord(s[1]))),
+        (Regex.IDENTIFIER, lambda s: UniversalArgument.fromName(s)),
+    )
+
+    def _parseLine(self, index: int, line: str) -> Optional[Statement]:
+        first, *lexemes = line.split()
+        args = tuple(self._matchArg(lexeme) for lexeme in lexemes)
+
+        for statement_type in StatementType:
+            if m := re.fullmatch(statement_type.value, first):
+                w = re.search(Regex.NAME, m.string)
+                return Statement(type=statement_type, line=line, index=index, head=w.string[w.start():w.end()], arguments=args)
+
+    def _matchArg(self, lexeme: str) -> Optional[UniversalArgument]:
+        for pattern, handler in self.MATCHERS:
+            if re.match(pattern, lexeme):
+                return handler(lexeme)
+
+
+def _makeSource(lines: int, seed: int = 0) -> str:
+    """Программа в духе генератора: в основном set_position, изредка смена профиля и заметки"""
+    rng = np.random.default_rng(seed)
+    x, y = rng.integers(-2000, 2000, (2, lines))
+    kind = rng.integers(0, 20, lines)
+
+    ret = [".env vart_esp32"]
+
+    for i in range(lines - 1):
+        match kind[i]:
+            case 0:
+                ret.append(f"# Note: Progress: {i}")
+            case 1:
+                ret.append(f"set_speed {x[i] & 0xFF}")
+            case 2:
+                ret.append(f"set_active_tool 0x{i & 1:02X}")
+            case 3:
+                ret.append("delay_ms 1_000")
+            case _:
+                ret.append(f"set_position {x[i]} {y[i]}")
+
+    return "\n".join(ret)
+
+
+def _measure(parser: Parser, source: str) -> tuple[float, tuple[Statement, ...]]:
+    start = time.perf_counter()
+    statements = tuple(parser.run(FixedStringIO(source)))
+    return time.perf_counter() - start, statements
+
+
+def main() -> None:
+    for lines in (1_000, 10_000, 100_000, 1_000_000):
+        source = _makeSource(lines)
+
+        elapsed, statements = _measure(StatementParser(ErrorHandler()), source)
+        line = f"{lines:>9} lines   tokenizer {lines / elapsed:>12,.0f} lines/s"
+
+        if lines <= LEGACY_LIMIT:
+            legacy_elapsed, legacy_statements = _measure(LegacyStatementParser(), source)
+
+            if legacy_statements != statements:
+                raise AssertionError(f"{lines}: statements differ from legacy parser")
+
+            line += f"   legacy {lines / legacy_elapsed:>12,.0f} lines/s   x{legacy_elapsed / elapsed:>5.1f}"
+
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
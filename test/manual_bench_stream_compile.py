@@ -0,0 +1,90 @@
+"""
+Потоковая компиляция против пакетной: время и пиковая память на сгенерированных исходниках
+Запуск: PYTHONPATH=src python test/manual_bench_stream_compile.py
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+
+from bytelang.compiler import ByteLangCompiler
+from bytelang.core.results.compile.abc import CompileResult
+
+BATCH_LIMIT = 1_000_000
+"""Пакетная компиляция дольше этого размера не запускается"""
+
+TRACE_LIMIT = 100_000
+"""Память измеряется до этого размера - трассировка замедляет компиляцию в разы"""
+
+
+def _writeSource(path: str, lines: int, seed: int = 0) -> None:
+    """Программа в духе генератора траекторий, записывается частями"""
+    rng = np.random.default_rng(seed)
+
+    with open(path, "w") as f:
+        f.write(".env vart_esp32\n")
+
+        for _ in range(lines // 1000):
+            x, y = rng.integers(-10_000, 10_000, (2, 1000))
+            f.write("# Note: Trajectory : chunk Begin\nset_speed 100\n")
+            f.write("".join(f"set_position {a} {b}\n" for a, b in zip(x, y)))
+
+        f.write("quit\n")
+
+
+def _run(compile_method: Callable, source_path: str, output_path: str) -> tuple[float, CompileResult]:
+    start = time.perf_counter()
+
+    with open(source_path) as source, open(output_path, "wb") as output:
+        result = compile_method(source, output, 0)
+
+    return time.perf_counter() - start, result
+
+
+def _measure(compile_method: Callable, source_path: str, output_path: str, lines: int) -> str:
+    elapsed, result = _run(compile_method, source_path, output_path)
+
+    if not result.isOK():
+        raise AssertionError(result.getMessage())
+
+    ret = f"{elapsed:>7.2f} s {lines / elapsed:>9,.0f} lines/s"
+
+    if lines <= TRACE_LIMIT:
+        tracemalloc.start()
+        _run(compile_method, source_path, output_path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        ret += f" peak {peak / (1 << 20):>7.2f} MiB"
+
+    return ret
+
+
+def main() -> None:
+    compiler = ByteLangCompiler.simpleSetup("res/bytelang")
+
+    with tempfile.TemporaryDirectory() as folder:
+        source_path = os.path.join(folder, "source.bls")
+        stream_path = os.path.join(folder, "stream.blc")
+        batch_path = os.path.join(folder, "batch.blc")
+
+        for lines in (10_000, 100_000, 1_000_000, 4_000_000):
+            _writeSource(source_path, lines)
+            source_mb = os.path.getsize(source_path) / (1 << 20)
+
+            line = f"{lines:>10} lines {source_mb:>7.1f} MiB   stream {_measure(compiler.compileStream, source_path, stream_path, lines)}"
+
+            if lines <= BATCH_LIMIT:
+                line += f"   batch {_measure(compiler.compile, source_path, batch_path, lines)}"
+
+                with open(stream_path, "rb") as a, open(batch_path, "rb") as b:
+                    if a.read() != b.read():
+                        raise AssertionError(f"{lines}: bytecode differs from batch compilation")
+
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Перетаскивание ползунка поворота модели OBJ: несколько изменений за кадр.
+Сравнивается время главного потока на кадр при немедленном пересчёте и с планировщиком обновлений
+Запуск: PYTHONPATH=src python test/manual_bench_update_scheduler.py [res/obj/wolf.obj]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from dearpygui import dearpygui as dpg
+
+from figure.abc import Canvas
+from loader.obj import ObjFigure
+from loader.obj import ObjLoader
+
+FRAMES = 120
+CHANGES_PER_FRAME = 4
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def _drag(figure: ObjFigure, canvas: Canvas, scheduled: bool) -> np.ndarray:
+    frame_times = np.zeros(FRAMES)
+
+    for frame in range(FRAMES):
+        start = time.perf_counter()
+
+        for change in range(CHANGES_PER_FRAME):
+            figure._rotation_XY.setValue((frame * CHANGES_PER_FRAME + change, 30))
+
+            if scheduled:
+                figure.update()
+
+            else:
+                figure.updateNow()
+
+        if scheduled:
+            canvas.scheduler.flush()
+
+        frame_times[frame] = (time.perf_counter() - start) * 1000
+
+        # Оставшееся время кадра - отрисовка, в это время работает фоновый поток
+        time.sleep(max(0.0, FRAME_BUDGET_MS - frame_times[frame]) / 1000)
+
+    canvas.scheduler.wait()
+    return frame_times
+
+
+def main() -> None:
+    path = Path(sys.argv[1] if len(sys.argv) > 1 else "res/obj/wolf.obj")
+
+    dpg.create_context()
+    canvas = Canvas()
+
+    with dpg.window():
+        canvas.place()
+
+    figure = ObjLoader().load(path, lambda _: None, lambda _: None)[0]
+    canvas.addFigure(figure)
+    canvas.scheduler.wait()
+
+    print(f"{path.name}: {FRAMES} frames x {CHANGES_PER_FRAME} changes (frame budget {FRAME_BUDGET_MS:.1f} ms)")
+
+    for title, scheduled in (("immediate", False), ("scheduled", True)):
+        frame_times = _drag(figure, canvas, scheduled)
+        print(
+            f"  {title:<10} main thread per frame: mean {frame_times.mean():>7.2f} ms   max {frame_times.max():>7.2f} ms   "
+            f"over budget {int((frame_times > FRAME_BUDGET_MS).sum())}/{FRAMES}"
+        )
+
+    canvas.scheduler.shutdown()
+    dpg.destroy_context()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Сравнение скорости генераторов вершин: прежняя реализация (map/lambda/chain) и NumPy
+Запуск: PYTHONPATH=src python test/manual_bench_vertex.py
+"""
+import math
+import timeit
+from itertools import chain
+from itertools import pairwise
+from math import cos
+from math import pi
+from math import radians
+from math import sin
+
+import numpy as np
+
+from gen.vertex import VertexGenerator
+
+
+class LegacyVertexGenerator:
+    """Прежняя реализация на итераторах для сравнения"""
+
+    @classmethod
+    def inflate(cls, v, factor):
+        def __transform(__v):
+            x, y = __v
+            d = math.hypot(x, y)
+
+            if d == 0:
+                return __v
+
+            return x + x / d * factor, y + y / d * factor
+
+        return tuple(zip(*map(__transform, zip(*v))))
+
+    @classmethod
+    def spiral(cls, resolution, k=1.0):
+        k2_pi_p = 2 * k * pi / resolution
+        return (
+            map(lambda a: sin(a * k2_pi_p) * a / resolution, range(resolution + 1)),
+            map(lambda a: cos(a * k2_pi_p) * a / resolution, range(resolution + 1))
+        )
+
+    @classmethod
+    def circle(cls, angle_deg, resolution):
+        k2_pi_p = 2 * angle_deg * pi / (resolution * 360)
+        return (
+            map(lambda a: sin(a * k2_pi_p), range(resolution + 1)),
+            map(lambda a: cos(a * k2_pi_p), range(resolution + 1))
+        )
+
+    @classmethod
+    def nGon(cls, vertex_count, resolution):
+        angles = tuple(map(radians, range(0, 360, 360 // vertex_count)))
+        return cls.polygon((map(sin, angles), map(cos, angles)), resolution)
+
+    @classmethod
+    def rect(cls, resolution):
+        return cls.polygon(((1, -1, -1, 1), (1, 1, -1, -1)), resolution)
+
+    @classmethod
+    def polygon(cls, vertices, resolution):
+        points = tuple(zip(*vertices))
+        points = points + points[:1]
+        x, y = zip(*(cls.line(begin, end, resolution) for begin, end in pairwise(points)))
+        return chain(*x), chain(*y)
+
+    @classmethod
+    def line(cls, begin, end, resolution):
+        x0, y0 = begin
+        x1, y1 = end
+        return (
+            map(lambda n: x1 * (n / resolution) + (1.0 - n / resolution) * x0, range(resolution + 1)),
+            map(lambda n: y1 * (n / resolution) + (1.0 - n / resolution) * y0, range(resolution + 1))
+        )
+
+
+def _materialize(v):
+    x, y = v
+    return tuple(x), tuple(y)
+
+
+def _check(name, legacy, current) -> None:
+    lx, ly = _materialize(legacy)
+    cx, cy = current
+
+    if not (np.allclose(lx, cx, rtol=0, atol=1e-12) and np.allclose(ly, cy, rtol=0, atol=1e-12)):
+        raise AssertionError(f"{name}: vertices differ")
+
+
+def _bench(name, legacy, current, number: int) -> None:
+    _check(name, legacy(), current())
+
+    t_legacy = timeit.timeit(lambda: _materialize(legacy()), number=number) / number
+    t_current = timeit.timeit(current, number=number) / number
+
+    print(f"{name:<24} legacy {t_legacy * 1e6:>10.1f} us   numpy {t_current * 1e6:>8.1f} us   x{t_legacy / t_current:>6.1f}")
+
+
+def main() -> None:
+    res = VertexGenerator.RESOLUTION_RANGE.max
+    n = 20
+
+    angles = tuple(map(radians, range(0, 360, 360 // n)))
+    corners = tuple(map(sin, angles)), tuple(map(cos, angles))
+    source = _materialize(LegacyVertexGenerator.nGon(n, res))
+
+    cases = (
+        ("spiral", lambda: LegacyVertexGenerator.spiral(res, 10), lambda: VertexGenerator.spiral(res, 10)),
+        ("circle", lambda: LegacyVertexGenerator.circle(360, res), lambda: VertexGenerator.circle(360, res)),
+        ("line", lambda: LegacyVertexGenerator.line((0, 0), (1, 1), res), lambda: VertexGenerator.line((0, 0), (1, 1), res)),
+        ("rect", lambda: LegacyVertexGenerator.rect(res), lambda: VertexGenerator.rect(res)),
+        (f"nGon({n})", lambda: LegacyVertexGenerator.nGon(n, res), lambda: VertexGenerator.nGon(n, res)),
+        ("polygon", lambda: LegacyVertexGenerator.polygon(corners, res), lambda: VertexGenerator.polygon(corners, res)),
+        ("inflate", lambda: LegacyVertexGenerator.inflate(source, 0.25), lambda: VertexGenerator.inflate(source, 0.25)),
+    )
+
+    print(f"resolution = {res}")
+
+    for name, legacy, current in cases:
+        _bench(name, legacy, current, 20)
+
+
+if __name__ == '__main__':
+    main()